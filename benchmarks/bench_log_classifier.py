@@ -0,0 +1,98 @@
+# benchmarks/bench_log_classifier.py
+"""Durchsatz des Log-Klassifizierers in Zeilen/Sekunde.
+
+Aufruf:  python -m benchmarks.bench_log_classifier [pfad/zu/latest.log] [--repeat N]
+
+Ohne Pfad wird ein synthetisches Log erzeugt, das wie auf einem vollen Server
+größtenteils aus Nicht-Chat-Zeilen besteht. Zum Vergleich wird die alte
+Variante (Liste von re.search pro Zeile) mitgemessen.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.log_events import classify  # noqa: E402
+
+
+def synthetic_log(n: int) -> list[str]:
+    rnd = random.Random(42)
+    names = [f"Player{i}" for i in range(50)]
+    templates = [
+        (60, "[12:00:00] [Server thread/INFO]: [Not Secure] Villager EntityVillager['Villager'/{i}] died, message: 'x'"),
+        (80, "[12:00:00] [Worker-Main-{i}/INFO]: Preparing spawn area: {i}%"),
+        (60, "[12:00:00] [Server thread/WARN]: {name} moved too quickly! -1.0,0.0,2.0"),
+        (40, "[12:00:00] [Server thread/INFO]: Saving chunks for level 'ServerLevel[world]'/minecraft:overworld"),
+        (10, "[12:00:00] [Server thread/INFO]: <{name}> hello everyone {i}"),
+        (3, "[12:00:00] [Server thread/INFO]: {name} joined the game"),
+        (3, "[12:00:00] [Server thread/INFO]: {name} left the game"),
+        (2, "[12:00:00] [Server thread/INFO]: {name} was slain by Zombie"),
+        (2, "[12:00:00] [Server thread/INFO]: {name} has made the advancement [Stone Age]"),
+    ]
+    weights = [w for w, _ in templates]
+    lines = []
+    for i in range(n):
+        _, tpl = rnd.choices(templates, weights=weights)[0]
+        lines.append(tpl.format(i=i, name=rnd.choice(names)))
+    return lines
+
+
+def legacy_classify(line: str):
+    """Die frühere Logik aus ChatMirror.read_stdout (Muster pro Zeile neu aufgebaut)."""
+    chat_match = re.search(r"\[.*\]: <([^>]+)> (.*)", line)
+    if chat_match:
+        return "chat"
+    death_patterns = [
+        r"was slain by", r"fell from", r"fell off", r"fell out of the world",
+        r"tried to swim in lava", r"was blown up", r"was killed by", r"burned to death",
+        r"drowned", r".+ died", r"was burned to a crisp while fighting"
+    ]
+    if any(re.search(pat, line) for pat in death_patterns):
+        return "death"
+    if re.search(r": ([A-Za-z0-9_]+) joined the game", line):
+        return "join"
+    if re.search(r": ([A-Za-z0-9_]+) left the game", line):
+        return "leave"
+    if re.search(r"has made the advancement \[(.+)\]", line):
+        return "advancement"
+    return None
+
+
+def bench(fn, lines: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            fn(line)
+        best = min(best, time.perf_counter() - start)
+    return len(lines) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", nargs="?", help="Mitgeschnittenes latest.log")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--lines", type=int, default=200_000, help="Zeilen im synthetischen Log")
+    args = parser.parse_args()
+
+    if args.log:
+        lines = Path(args.log).read_text(encoding="utf-8", errors="ignore").splitlines()
+        source = args.log
+    else:
+        lines = synthetic_log(args.lines)
+        source = "synthetisch"
+
+    matched = sum(1 for line in lines if classify(line))
+    print(f"Quelle: {source}, {len(lines):,} Zeilen, {matched:,} Ereignisse")
+    new = bench(classify, lines, args.repeat)
+    old = bench(legacy_classify, lines, args.repeat)
+    print(f"classify():           {new:,.0f} Zeilen/s")
+    print(f"alte re.search-Kette: {old:,.0f} Zeilen/s  (Faktor {new / old:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
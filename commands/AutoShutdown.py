@@ -1,17 +1,22 @@
 import os
 import asyncio
+import json
 import logging
+import shlex
 import time
 from dataclasses import dataclass
 from typing import Optional
 
-import paramiko
-from mcstatus.server import JavaServer
+import asyncssh
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from utils.ssh_pool import ssh_pool
+from utils.event_bus import event_bus, PlayerCountChanged, MirrorStateChanged
+from utils.mc_ping import mc_ping
+
 logger = logging.getLogger("AutoShutdown")
 handler = logging.StreamHandler()
 formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
@@ -30,6 +35,26 @@ class EnvConfig:
     ssh_user: str
     empty_timeout_seconds: int = 900
     check_interval_seconds: int = 10
+    # Polling-Abstand, solange der Chat-Mirror Spielerzahl-Änderungen per Event-Bus liefert
+    fallback_interval_seconds: int = 300
+    # Obergrenze, bis zu der das Polling ohne Log-Stream bei leerem, unverändertem Server gestreckt wird
+    max_poll_interval_seconds: int = 300
+    # Abstand (Sekunden) zwischen den Pings mehrerer Server, die im selben Durchlauf fällig sind
+    probe_stagger_seconds: float = 0.5
+    servers_file: str = os.path.join(os.getenv("BOT_DATA_DIR", "data"), "autoshutdown.json")
+
+
+@dataclass
+class ShutdownTarget:
+    """Ein überwachter Server: ``action`` "host" fährt den Rechner herunter, "docker" stoppt nur den Container."""
+    name: str
+    host: str
+    ssh_host: str
+    ssh_user: str = "minecraft"
+    mc_port: int = 25565
+    action: str = "host"
+    container: str = ""
+    empty_timeout_seconds: Optional[int] = None
 
 
 def load_env_config() -> EnvConfig:
@@ -43,20 +68,106 @@ def load_env_config() -> EnvConfig:
         ssh_user=os.getenv("MC_SERVER_USER", "minecraft"),
         empty_timeout_seconds=int(os.getenv("EMPTY_TIMEOUT", "1800")),
         check_interval_seconds=int(os.getenv("CHECK_INTERVAL", "10")),
+        fallback_interval_seconds=int(os.getenv("CHECK_FALLBACK_INTERVAL", "300")),
+        max_poll_interval_seconds=int(os.getenv("CHECK_MAX_INTERVAL", "300")),
+        probe_stagger_seconds=float(os.getenv("CHECK_STAGGER", "0.5")),
+        servers_file=os.getenv("AUTOSD_SERVERS_FILE", os.path.join(os.getenv("BOT_DATA_DIR", "data"), "autoshutdown.json")),
     )
 
 
+def load_targets(cfg: EnvConfig) -> list[ShutdownTarget]:
+    """Lädt die überwachten Server aus einer JSON-Datei (Liste von Objekten mit ShutdownTarget-Feldern).
+
+    Ohne Datei wird wie bisher genau ein Server aus RCON_HOST/SERVER_IP überwacht.
+    """
+    default = [ShutdownTarget(name="minecraft1", host=cfg.rcon_host, ssh_host=cfg.server_ip, ssh_user=cfg.ssh_user)]
+    if not os.path.exists(cfg.servers_file):
+        return default
+    try:
+        with open(cfg.servers_file, encoding="utf-8") as f:
+            targets = [ShutdownTarget(**entry) for entry in json.load(f)]
+    except (OSError, ValueError, TypeError) as e:
+        logger.error(f"AutoShutdown-Server aus {cfg.servers_file} konnten nicht geladen werden: {e}")
+        return default
+    return targets or default
+
+
+def format_hms(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+class ServerWatch:
+    """Zustand eines überwachten Servers: Timer, letzte Spielerzahl, Polling-Takt."""
+
+    def __init__(self, target: ShutdownTarget, cfg: EnvConfig):
+        self.target = target
+        self.cfg = cfg
+        self.enabled = True
+        self.empty_timeout_seconds = target.empty_timeout_seconds or cfg.empty_timeout_seconds
+        self.deadline: Optional[float] = None
+        self.last_count: Optional[int] = None
+        self.shutdown_in_progress = False
+        # True, solange ein Log-Stream für diesen Server verbunden ist
+        self.push_active = False
+        # Aktueller Polling-Abstand ohne Log-Stream (wächst, solange der Server leer und unverändert ist)
+        self.poll_interval = float(cfg.check_interval_seconds)
+        self.next_poll_at = 0.0
+        self.probes = 0
+
+    @property
+    def name(self) -> str:
+        return self.target.name
+
+    def matches(self, event) -> bool:
+        return event.server == self.target.name or event.host in (self.target.host, self.target.ssh_host)
+
+    def next_poll_in(self) -> float:
+        """Sekunden bis zum nächsten Status-Poll: selten bei aktivem Push, sonst adaptiv."""
+        interval = self.cfg.fallback_interval_seconds if self.push_active and not self.shutdown_in_progress \
+            else self.poll_interval
+        if self.deadline is not None:
+            # Zum Ablauf des Timers aufwachen und den Stand per Poll bestätigen
+            interval = min(interval, max(0.0, self.deadline - time.time()))
+        return interval
+
+    def reschedule(self):
+        self.next_poll_at = time.time() + self.next_poll_in()
+
+    def reset_interval(self):
+        self.poll_interval = float(self.cfg.check_interval_seconds)
+
+    def back_off(self, factor: float = 2.0):
+        self.poll_interval = min(self.poll_interval * factor, self.cfg.max_poll_interval_seconds)
+
+    async def probe(self) -> Optional[int]:
+        """Spielerzahl per Status-Ping (Fallback: Query) oder None, wenn der Server nicht erreichbar ist."""
+        self.probes += 1
+        player_count = await mc_ping.player_count(self.target.host, self.target.mc_port)
+        if player_count is None:
+            logger.warning(f"Minecraft unreachable ({self.name}).")
+        return player_count
+
+    def shutdown_command(self) -> str:
+        if self.target.action == "docker":
+            return f"docker stop {shlex.quote(self.target.container or self.target.name)}"
+        return "sudo shutdown -h now"
+
+    def mode(self) -> str:
+        if self.shutdown_in_progress:
+            return "wartet auf Neustart"
+        if self.push_active:
+            return "Log-Stream"
+        return f"Polling {int(self.poll_interval)}s"
+
+
 class AutoShutdownCog(commands.Cog):
     def __init__(self, bot: commands.Bot, cfg: EnvConfig):
         self.bot = bot
         self.cfg = cfg
         self.enabled = True
-        self.empty_timeout_seconds = cfg.empty_timeout_seconds
-        self._shutdown_deadline: Optional[float] = None
+        self.watches = [ServerWatch(target, cfg) for target in load_targets(cfg)]
         self._monitor_task: Optional[asyncio.Task] = None
-        self._last_known_player_count: Optional[int] = None
-        self._shutdown_in_progress = False
-        self.mc = JavaServer.lookup(f"{cfg.rcon_host}:25565")
+        self._events = event_bus.subscribe(PlayerCountChanged, MirrorStateChanged, maxsize=32 * len(self.watches))
         bot.loop.create_task(self._start_bg())
 
     async def _start_bg(self):
@@ -64,33 +175,50 @@ class AutoShutdownCog(commands.Cog):
         if not self._monitor_task or self._monitor_task.done():
             self._monitor_task = asyncio.create_task(self._monitor_loop())
 
-    async def _send_channel_message(self, message: str):
+    async def _send_channel_message(self, message: str, watch: Optional[ServerWatch] = None):
         guild = self.bot.get_guild(self.cfg.guild_id)
         if not guild:
             return
         channel = discord.utils.get(guild.text_channels, name=self.cfg.channel_name)
         if channel:
+            if watch is not None and len(self.watches) > 1:
+                message = f"**{watch.name}:** {message}"
             await channel.send(message)
 
+    def _selected(self, server: Optional[str]) -> list[ServerWatch]:
+        if not server:
+            return self.watches
+        return [w for w in self.watches if w.name == server]
+
     @app_commands.command(name="autosd", description="Auto-Shutdown verwalten.")
-    @app_commands.describe(action="Aktion wählen")
+    @app_commands.describe(action="Aktion wählen", server="Nur diesen Server (ohne Angabe: alle)")
     @app_commands.choices(action=[
         app_commands.Choice(name="Enable", value="enable"),
         app_commands.Choice(name="Disable", value="disable"),
         app_commands.Choice(name="Status", value="status"),
         app_commands.Choice(name="Set", value="set")
     ])
-    async def autosd(self, interaction: discord.Interaction, action: app_commands.Choice[str], seconds: Optional[int] = None):
+    async def autosd(self, interaction: discord.Interaction, action: app_commands.Choice[str],
+                     seconds: Optional[int] = None, server: Optional[str] = None):
         action_value = action.value.lower()
+        selected = self._selected(server)
+        if not selected:
+            await interaction.response.send_message(f"Unbekannter Server `{server}`.")
+            return
 
         if action_value == "enable":
-            self.enabled = True
+            self.enabled = self.enabled or server is None
+            for w in selected:
+                w.enabled = True
             await interaction.response.send_message("AutoShutdown aktiviert. 🟩")
             return
 
         if action_value == "disable":
-            self.enabled = False
-            self._shutdown_deadline = None
+            if server is None:
+                self.enabled = False
+            for w in selected:
+                w.enabled = False
+                w.deadline = None
             await interaction.response.send_message("AutoShutdown deaktiviert. 🟥")
             return
 
@@ -98,107 +226,169 @@ class AutoShutdownCog(commands.Cog):
             if not self.enabled:
                 await interaction.response.send_message("AutoShutdown deaktiviert.")
                 return
-            if self._shutdown_deadline is None:
-                await interaction.response.send_message(f"Aktiv, kein Timer. Timer Zeit: `{self.empty_timeout_seconds}`s ⏱️")
-                return
-            remaining = max(0, int(self._shutdown_deadline - time.time()))
-            hours = remaining // 3600
-            minutes = (remaining % 3600) // 60
-            seconds = remaining % 60
-            await interaction.response.send_message(f"Timer läuft: `{hours:02d}:{minutes:02d}:{seconds:02d} `⌛")
+            rows = [("Server", "Spieler", "Timer", "Timeout", "Aktion", "Modus", "Pings")]
+            for w in selected:
+                if not w.enabled:
+                    timer = "aus"
+                elif w.deadline is None:
+                    timer = "-"
+                else:
+                    timer = format_hms(max(0, int(w.deadline - time.time())))
+                players = "?" if w.last_count is None else str(w.last_count)
+                action_label = f"docker {w.target.container or w.name}" if w.target.action == "docker" else "shutdown"
+                rows.append((w.name, players, timer, format_hms(w.empty_timeout_seconds), action_label, w.mode(), str(w.probes)))
+            widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+            table = "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows)
+            await interaction.response.send_message(f"```\n{table}\n```")
             return
 
         if action_value == "set":
             if seconds is None or seconds < 0:
                 await interaction.response.send_message("Ungültige Zeit.")
                 return
-            self.empty_timeout_seconds = seconds
-            hours = seconds // 3600
-            minutes = (seconds % 3600) // 60
-            sec = seconds % 60
-            await interaction.response.send_message(f"Timeout gesetzt: {hours:02d}:{minutes:02d}:{sec:02d}")
+            for w in selected:
+                w.empty_timeout_seconds = seconds
+            await interaction.response.send_message(f"Timeout gesetzt: {format_hms(seconds)}")
             return
 
         await interaction.response.send_message("Ungültige Aktion.")
 
+    @autosd.autocomplete("server")
+    async def server_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [app_commands.Choice(name=w.name, value=w.name)
+                for w in self.watches if current.lower() in w.name.lower()][:25]
+
+    # ------------------------- Scheduler -------------------------
     async def _monitor_loop(self):
         backoff = 5
         while True:
             try:
-                if self._shutdown_in_progress:
-                    # Server ist gerade heruntergefahren, ping loop bis wieder online
-                    while True:
-                        try:
-                            await asyncio.sleep(30)
-                            status = await asyncio.get_running_loop().run_in_executor(None, self.mc.status)
-                            if status.players is not None:
-                                self._shutdown_in_progress = False
-                                remaining = self.empty_timeout_seconds
-                                hours = remaining // 3600
-                                minutes = (remaining % 3600) // 60
-                                seconds = remaining % 60
-                                await self._send_channel_message(f"Shutdown-Timer gestartet: `{hours:02d}:{minutes:02d}:{seconds:02d}` bis Server-Shutdown ⌛")
-                                break
-                        except:
-                            continue
+                timeout = max(0.0, min(w.next_poll_at for w in self.watches) - time.time())
+                event = await self._events.get(timeout=timeout)
+                if event is None:
+                    await self._tick()
                 else:
-                    await self._cycle()
+                    watch = self._watch_for(event)
+                    if watch is not None:
+                        await self._handle_event(watch, event)
+                        watch.reschedule()
                 backoff = 5
             except Exception as e:
                 logger.exception(e)
                 await asyncio.sleep(backoff)
                 backoff = min(backoff * 2, 300)
 
-            await asyncio.sleep(self.cfg.check_interval_seconds)
+    def _watch_for(self, event) -> Optional[ServerWatch]:
+        by_name = [w for w in self.watches if w.name == event.server]
+        candidates = by_name or [w for w in self.watches if w.matches(event)]
+        # Mehrere Container auf einem Host: ohne passenden Namen ist das Ereignis nicht zuzuordnen
+        return candidates[0] if len(candidates) == 1 else None
 
-    async def _cycle(self):
-        loop = asyncio.get_running_loop()
-        player_count = None
-        try:
-            status = await loop.run_in_executor(None, self.mc.status)
-            player_count = status.players.online
-        except:
+    async def _tick(self):
+        """Pingt alle fälligen Server gleichzeitig, aber um ``probe_stagger_seconds`` versetzt."""
+        now = time.time()
+        due = [w for w in self.watches if w.next_poll_at <= now]
+        stagger = self.cfg.probe_stagger_seconds
+
+        async def run(watch: ServerWatch, delay: float):
+            if delay:
+                await asyncio.sleep(delay)
             try:
-                q = await loop.run_in_executor(None, self.mc.query)
-                player_count = len(q.players)
-            except:
-                logger.warning("Minecraft unreachable.")
+                await self._cycle(watch)
+            except Exception as e:
+                logger.exception(e)
+            watch.reschedule()
+
+        await asyncio.gather(*(run(w, i * stagger) for i, w in enumerate(due)))
+
+    async def _handle_event(self, watch: ServerWatch, event):
+        if isinstance(event, MirrorStateChanged):
+            watch.push_active = event.connected
+            # Beim Herunterfahren gilt das 30s-Intervall als Basis für den Backoff
+            if not watch.shutdown_in_progress:
+                watch.reset_interval()
+            logger.info(f"Spielerzahl für {watch.name} per Log-Stream: {'aktiv' if event.connected else 'inaktiv'}")
+            if watch.shutdown_in_progress and event.connected:
+                await self._server_back(watch)
+            return
+        if watch.shutdown_in_progress:
+            # Leave-Ereignisse beim Herunterfahren zählen nicht; erst eine frische Liste oder ein Join
+            if not (event.authoritative or event.online):
                 return
+            await self._server_back(watch)
+        await self._apply_player_count(watch, event.online)
+
+    async def _server_back(self, watch: ServerWatch):
+        watch.shutdown_in_progress = False
+        watch.reset_interval()
+        await self._send_channel_message(
+            f"Shutdown-Timer gestartet: `{format_hms(watch.empty_timeout_seconds)}` bis Server-Shutdown ⌛", watch)
+
+    async def _cycle(self, watch: ServerWatch):
+        if watch.shutdown_in_progress:
+            # Server ist gerade heruntergefahren: mit wachsendem Abstand pingen, bis er wieder online ist
+            if await watch.probe() is None:
+                watch.back_off(1.5)
+            else:
+                await self._server_back(watch)
+            return
+
+        player_count = await watch.probe()
+
+        # Leer oder unerreichbar und unverändert: Polling strecken, sonst zurück auf den Grundtakt
+        if player_count in (0, None) and player_count == watch.last_count:
+            watch.back_off()
+        else:
+            watch.reset_interval()
+
+        if player_count is None:
+            watch.last_count = None
+            return
+        await self._apply_player_count(watch, player_count, confirmed=True)
 
-        if self.enabled:
+    async def _apply_player_count(self, watch: ServerWatch, player_count: int, confirmed: bool = False):
+        """Wertet eine Spielerzahl aus; Zahlen aus Log-Ereignissen werden vor Timer-Start und Shutdown per Ping bestätigt."""
+        if self.enabled and watch.enabled:
+            if player_count == 0 and not confirmed and (watch.deadline is None or time.time() >= watch.deadline):
+                player_count = await watch.probe()
+                if player_count is None:
+                    return
             if player_count == 0:
-                if self._shutdown_deadline is None:
-                    self._shutdown_deadline = time.time() + self.empty_timeout_seconds
-                    remaining = self.empty_timeout_seconds
-                    hours = remaining // 3600
-                    minutes = (remaining % 3600) // 60
-                    seconds = remaining % 60
-                    await self._send_channel_message(f"Shutdown-Timer gestartet: `{hours:02d}:{minutes:02d}:{seconds:02d}` bis Server-Shutdown")
+                if watch.deadline is None:
+                    timeout = self._timeout_for(watch)
+                    watch.deadline = time.time() + timeout
+                    await self._send_channel_message(
+                        f"Shutdown-Timer gestartet: `{format_hms(timeout)}` bis Server-Shutdown", watch)
                 else:
-                    if time.time() >= self._shutdown_deadline:
-                        self._shutdown_in_progress = True
-                        await self._shutdown_server()
-                        self._shutdown_deadline = None
+                    if time.time() >= watch.deadline:
+                        watch.shutdown_in_progress = True
+                        watch.poll_interval = 30.0
+                        await self._shutdown_server(watch)
+                        watch.deadline = None
             else:
-                if self._shutdown_deadline is not None:
-                    await self._send_channel_message(f"Shutdown-Timer gestoppt durch Spielerbeigetritt (`{player_count}` Spieler online)")
-                self._shutdown_deadline = None
+                if watch.deadline is not None:
+                    await self._send_channel_message(f"Shutdown-Timer gestoppt durch Spielerbeigetritt (`{player_count}` Spieler online)", watch)
+                watch.deadline = None
 
-        self._last_known_player_count = player_count
+        watch.last_count = player_count
 
-    async def _shutdown_server(self):
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._ssh_shutdown)
+    def _timeout_for(self, watch: ServerWatch) -> int:
+        """Timeout bis zum Shutdown; der Pre-Wake-Cog verkürzt ihn in historisch toten Zeitfenstern."""
+        prewake = self.bot.get_cog("PreWake")
+        if prewake is None or watch.target.action != "host":
+            return watch.empty_timeout_seconds
+        return prewake.timeout_for(watch.target.ssh_host, watch.empty_timeout_seconds)
 
-    def _ssh_shutdown(self):
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    async def _shutdown_server(self, watch: ServerWatch):
+        target = watch.target
         try:
-            client.connect(hostname=self.cfg.server_ip, username=self.cfg.ssh_user, timeout=10)
-            stdin, stdout, stderr = client.exec_command("sudo shutdown -h now")
-            stdout.channel.recv_exit_status()
+            await ssh_pool.run(target.ssh_host, target.ssh_user, watch.shutdown_command(), check=False, timeout=30)
+        except (asyncssh.Error, OSError, asyncio.TimeoutError) as e:
+            # Der Host trennt die Verbindung beim Herunterfahren oft selbst
+            logger.warning(f"SSH shutdown ({watch.name}): {e}")
         finally:
-            client.close()
+            if target.action != "docker":
+                ssh_pool.invalidate(target.ssh_host, target.ssh_user)
 
 
 async def setup(bot: commands.Bot):
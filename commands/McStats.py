@@ -3,10 +3,21 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
+import asyncssh
 import json
 import shlex
 import os
+import time
+from typing import Optional
 from dotenv import load_dotenv
+from utils.stats_index import StatsIndex
+from utils.stats_bulk import bulk_command, iter_tar_stream
+from utils.ssh_pool import ssh_pool
+from utils.leaderboard import Leaderboard
+from utils.stat_metrics import REGISTRY
+from utils.player_index import player_index
+from utils.stats_history import StatsHistory, PERIODS
+from utils import remote_agg
 
 # ------------------------- Load environment variables -------------------------
 load_dotenv()
@@ -16,6 +27,23 @@ MC_HOST = os.getenv("SERVER_IP", "127.0.0.1")
 MC_SSH_USER = os.getenv("MC_SERVER_USER", "minecraft")
 STATS_PATH = os.getenv("MC_STATS_PATH", f"/home/Minecraft/minecraft1/data/world/stats/")
 USERCACHE_PATH = os.getenv("MC_USERCACHE_PATH", f"/home/Minecraft/minecraft1/data/usercache.json")
+# Wie alt (Sekunden) der lokale Stats-Index höchstens sein darf, bevor /stats und /top neu syncen
+STATS_MAX_AGE = int(os.getenv("MC_STATS_MAX_AGE", "300"))
+# Ab so vielen geänderten Dateien wird das ganze Stats-Verzeichnis in einem tar-Stream geholt
+STATS_BULK_THRESHOLD = int(os.getenv("MC_STATS_BULK_THRESHOLD", "20"))
+STATS_BULK_COMPRESS = os.getenv("MC_STATS_BULK_COMPRESS", "1") == "1"
+# Metriken direkt auf dem Minecraft-Host berechnen und nur die Vektoren übertragen
+STATS_REMOTE_AGG = os.getenv("MC_STATS_REMOTE_AGG", "0") == "1"
+# Abstand (Sekunden) zwischen zwei Stats-Snapshots für /stats und /top mit Zeitraum
+HISTORY_INTERVAL = int(os.getenv("MC_HISTORY_INTERVAL", "3600"))
+
+PERIOD_CHOICES = [
+    app_commands.Choice(name="Gesamt", value="all"),
+    app_commands.Choice(name="Letzter Tag", value="day"),
+    app_commands.Choice(name="Letzte Woche", value="week"),
+    app_commands.Choice(name="Letzter Monat", value="month"),
+]
+PERIOD_LABELS = {c.value: c.name for c in PERIOD_CHOICES}
 
 
 # ------------------------- Cog -------------------------
@@ -27,250 +55,349 @@ class MCStats(commands.Cog):
         self.STATS_PATH = STATS_PATH
         self.USERCACHE_PATH = USERCACHE_PATH
 
-        self.valid_stats = [
-            "distance_traveled", "block_broken", "block_placed", "damage_done",
-            "damage_taken", "deaths", "player_kills", "entity_kills", "playtime"
-        ]
+        self.stats_index = StatsIndex()
+        self.STATS_MAX_AGE = STATS_MAX_AGE
+        self._sync_lock = asyncio.Lock()
+        self.players = player_index
+
+        self.leaderboard = Leaderboard()
+        self.valid_stats = REGISTRY.names
+
+        # Remote-Aggregation: Rohwert-Vektoren pro UUID, None = bot-seitige Auswertung über den Index
+        self.remote_agg = STATS_REMOTE_AGG
+        self.remote_rows = None
+        self._remote_at = 0.0
+        self._remote_gen = 0
+        # Vorübergehende Fehler der Remote-Aggregation: bis dahin bot-seitig auswerten
+        self._remote_failures = 0
+        self._remote_retry_at = 0.0
+
+        self.history = StatsHistory(REGISTRY.names)
+        self._period_boards: dict[str, Leaderboard] = {}
+        self.history_task = self.bot.loop.create_task(self.history_loop())
 
     # ------------------------- Safe SSH JSON loader -------------------------
     async def ssh_cat_json(self, path):
         """
-        Fetch JSON from Minecraft server over SSH safely.
-        Uses -T to disable TTY allocation and BatchMode=yes to prevent hanging.
+        Fetch JSON from Minecraft server over the shared SSH pool.
+        Each call only opens a new channel on the pooled connection.
         """
-        cmd = (
-        f"ssh -o BatchMode=yes -T -n "
-        f"-o StrictHostKeyChecking=no "
-        f"-o UserKnownHostsFile=/dev/null "
-        f"{self.MC_SSH_USER}@{self.MC_HOST} cat {shlex.quote(path)}"
-        )
-        print(f"[DEBUG SSH] Running: {cmd}")  # debug print
-
-        proc = await asyncio.create_subprocess_shell(
-            cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-
-        output_lines = []
-
         try:
-            async for line_bytes in proc.stdout:
-                line = line_bytes.decode(errors="ignore").strip()
-                if line:
-                    output_lines.append(line)
-
-            async for err_bytes in proc.stderr:
-                err = err_bytes.decode(errors="ignore").strip()
-                if err:
-                    print(f"[SSH ERROR] {err}")
-
-            await proc.wait()
-
-        except Exception as e:
+            result = await ssh_pool.run(self.MC_HOST, self.MC_SSH_USER, f"cat {shlex.quote(path)}", idempotent=True)
+        except (asyncssh.Error, OSError) as e:
             print(f"[SSH Exception] {e}")
             return None
 
-        if not output_lines:
+        if result.stderr:
+            print(f"[SSH ERROR] {result.stderr.strip()}")
+        if not result.stdout or not result.stdout.strip():
             return None
 
         try:
-            return json.loads("\n".join(output_lines))
+            return json.loads(result.stdout)
         except Exception as e:
             print(f"[JSON ERROR] {e}")
             return None
 
+    async def ssh_lines(self, remote_cmd):
+        """Run a command on the Minecraft server and return its non-empty stdout lines."""
+        try:
+            result = await ssh_pool.run(self.MC_HOST, self.MC_SSH_USER, remote_cmd, idempotent=True)
+        except (asyncssh.Error, OSError) as e:
+            print(f"[SSH Exception] {e}")
+            return []
+
+        if result.stderr:
+            print(f"[SSH ERROR] {result.stderr.strip()}")
+
+        return [line.strip() for line in (result.stdout or "").splitlines() if line.strip()]
+
+    # ------------------------- Stats-Index -------------------------
+    async def list_remote_stats(self):
+        """Listet alle Stats-Dateien plus die usercache mit mtime und Größe in einem einzigen SSH-Aufruf.
+
+        Die usercache steht unter dem Schlüssel ``usercache`` im Ergebnis.
+        """
+        lines = await self.ssh_lines(
+            f"find {shlex.quote(self.STATS_PATH)} -maxdepth 1 -name '*.json' -printf '%f\\t%T@\\t%s\\n'; "
+            f"find {shlex.quote(self.USERCACHE_PATH)} -maxdepth 0 -printf 'usercache.json\\t%T@\\t%s\\n'"
+        )
+        listing = {}
+        for line in lines:
+            parts = line.split("\t")
+            if len(parts) != 3:
+                continue
+            name, mtime, size = parts
+            try:
+                listing[name[:-len(".json")]] = (float(mtime), int(size))
+            except ValueError:
+                continue
+        return listing
+
+    async def sync_index(self, force=False):
+        """Holt nur die Stats-Dateien, deren mtime oder Größe sich seit dem letzten Sync geändert hat."""
+        async with self._sync_lock:
+            if not force and self.stats_index.age() < self.STATS_MAX_AGE:
+                return
+
+            started = time.time()
+            listing = await self.list_remote_stats()
+            usercache_meta = listing.pop("usercache", None)
+            if not listing:
+                # Leeres Listing = SSH-Fehler oder Server offline → alten Index behalten
+                print("[WARN] Stats-Listing leer, behalte bestehenden Index.")
+                return
+
+            changed, removed = self.stats_index.diff(listing)
+            if len(changed) >= STATS_BULK_THRESHOLD:
+                await self.bulk_fetch(listing, set(changed), usercache_meta)
+            else:
+                await self.refresh_players(usercache_meta)
+                for uuid in changed:
+                    data = await self.fetch_stats(uuid)
+                    if data is None:
+                        continue
+                    mtime, size = listing[uuid]
+                    self.stats_index.upsert(uuid, mtime, size, data)
+
+            self.stats_index.remove(removed)
+            self.stats_index.mark_synced(started)
+            print(f"[INFO] Stats-Index synchronisiert: {len(changed)} geändert, {len(removed)} entfernt, "
+                  f"{len(listing)} gesamt ({time.time() - started:.1f}s)")
+
+    async def bulk_fetch(self, listing, wanted, usercache_meta=None):
+        """Holt alle Stats-Dateien plus usercache.json über einen einzigen SSH-Channel als tar-Stream.
+
+        Die Einträge werden verarbeitet, sobald sie vollständig angekommen sind.
+        """
+        remote_cmd = bulk_command(self.STATS_PATH, self.USERCACHE_PATH, compress=STATS_BULK_COMPRESS)
+        received = 0
+        async with ssh_pool.process(self.MC_HOST, self.MC_SSH_USER, remote_cmd, idempotent=True) as proc:
+            async for name, raw in iter_tar_stream(proc.stdout, compressed=STATS_BULK_COMPRESS):
+                try:
+                    data = json.loads(raw)
+                except ValueError as e:
+                    print(f"[JSON ERROR] {name}: {e}")
+                    continue
+
+                if name == "usercache.json":
+                    self.players.load(data, usercache_meta)
+                    continue
+
+                uuid = os.path.basename(name)[:-len(".json")]
+                if name.startswith("stats/") and uuid in wanted:
+                    mtime, size = listing[uuid]
+                    self.stats_index.upsert(uuid, mtime, size, data)
+                    received += 1
+
+            stderr = await proc.stderr.read()
+            if stderr:
+                print(f"[SSH ERROR] {stderr.decode(errors='ignore').strip()}")
+
+        print(f"[INFO] Bulk-Transfer: {received}/{len(wanted)} Stats-Dateien in einem Stream empfangen")
+
+    # ------------------------- Remote-Aggregation -------------------------
+    async def sync_stats(self, force=False):
+        """Aktualisiert die Stats-Daten – per Remote-Aggregation, falls aktiv, sonst über den Index."""
+        if self.remote_agg and time.time() >= self._remote_retry_at:
+            async with self._sync_lock:
+                if not force and time.time() - self._remote_at < self.STATS_MAX_AGE and self.remote_rows is not None:
+                    return
+                done = await self.remote_aggregate()
+            if done:
+                return
+        await self.sync_index(force=force)
+
+    async def remote_aggregate(self):
+        """Lässt das Aggregations-Skript neben world/stats laufen und übernimmt nur die Metrik-Vektoren.
+
+        Gibt False zurück, wenn die Aggregation nicht klappt: ohne python3 auf dem Host wird
+        dauerhaft auf bot-seitige Auswertung umgeschaltet, sonst mit Backoff erneut versucht.
+        """
+        started = time.time()
+        cmd = remote_agg.build_command(self.STATS_PATH, REGISTRY.spec(), self.USERCACHE_PATH)
+        try:
+            result = await ssh_pool.run(self.MC_HOST, self.MC_SSH_USER, cmd, idempotent=True)
+        except (asyncssh.Error, OSError) as e:
+            print(f"[SSH Exception] {e}")
+            return False
+
+        if result.exit_status == remote_agg.NO_INTERPRETER:
+            print("[WARN] Remote-Aggregation nicht verfügbar (kein python3), nutze bot-seitige Auswertung.")
+            self.remote_agg = False
+            self.remote_rows = None
+            return False
+
+        parsed = remote_agg.parse_output(result.stdout or "", len(REGISTRY.names))
+        if parsed is None:
+            # Abgeschnittene Ausgabe, Skriptfehler o. Ä.: nur diesmal zurückfallen, später erneut versuchen
+            self._remote_failures += 1
+            retry_in = min(60 * 2 ** (self._remote_failures - 1), 3600)
+            self._remote_retry_at = time.time() + retry_in
+            print(f"[WARN] Remote-Aggregation fehlgeschlagen (Exit {result.exit_status}), "
+                  f"nutze bot-seitige Auswertung, neuer Versuch in {retry_in}s.")
+            if result.stderr:
+                print(f"[SSH ERROR] {result.stderr.strip()}")
+            self.remote_rows = None
+            return False
+
+        self._remote_failures = 0
+        rows, usercache_meta = parsed
+        self.remote_rows = rows
+        self._remote_gen += 1
+        self._remote_at = started
+        await self.refresh_players(usercache_meta)
+        print(f"[INFO] Remote-Aggregation: {len(rows)} Spieler, {len(result.stdout):,} Bytes "
+              f"({time.time() - started:.1f}s)")
+        return True
+
+    def build_leaderboard(self):
+        if self.remote_rows is not None:
+            generation = ("remote", self._remote_gen)
+            if self.leaderboard.generation != generation:
+                self.leaderboard.load_rows(list(self.remote_rows), list(self.remote_rows.values()), generation)
+        else:
+            self.leaderboard.build(self.stats_index.all(), self.stats_index.generation)
+
     # ------------------------- UUID & Stats -------------------------
-    async def get_uuid(self, player_name):
+    async def refresh_players(self, meta=None):
+        """Lädt die usercache nur neu, wenn sich mtime oder Größe geändert haben.
+
+        Ohne ``meta`` wird die Remote-Datei vorher per find geprüft (ein Round-Trip).
+        """
+        if meta is None:
+            lines = await self.ssh_lines(
+                f"find {shlex.quote(self.USERCACHE_PATH)} -maxdepth 0 -printf '%T@\\t%s\\n'"
+            )
+            try:
+                mtime, size = lines[0].split("\t")
+                meta = (float(mtime), int(size))
+            except (IndexError, ValueError):
+                return
+
+        if not self.players.needs_refresh(meta):
+            return
+
         users = await self.ssh_cat_json(self.USERCACHE_PATH)
-        if not users:
-            return None
-        for user in users:
-            if user["name"].lower() == player_name.lower():
-                return user["uuid"]
-        return None
+        if users is not None:
+            self.players.load(users, meta)
+
+    async def get_uuid(self, player_name):
+        uuid = self.players.uuid_for(player_name)
+        if uuid is None:
+            # Nur bei einem Fehltreffer wird geprüft, ob die usercache inzwischen neuer ist
+            await self.refresh_players()
+            uuid = self.players.uuid_for(player_name)
+        return uuid
 
     async def fetch_stats(self, uuid):
         path = os.path.join(self.STATS_PATH, f"{uuid}.json")
         return await self.ssh_cat_json(path)
 
+    # ------------------------- Historie -------------------------
+    async def history_loop(self):
+        """Speichert regelmäßig die Deltas aller Spieler-Metriken."""
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            try:
+                await self.sync_stats(force=True)
+                self.build_leaderboard()
+                written = self.history.snapshot(self.leaderboard.raw_rows)
+                self.history.compact()
+                print(f"[INFO] Stats-Snapshot gespeichert ({written} Spieler mit Änderungen)")
+            except Exception as e:
+                print(f"[ERROR] Stats-Snapshot fehlgeschlagen: {e}")
+            await asyncio.sleep(HISTORY_INTERVAL)
+
+    def leaderboard_values(self, uuid):
+        self.build_leaderboard()
+        return self.leaderboard.values(uuid)
+
+    def board_for(self, period="all"):
+        """Leaderboard für einen Zeitraum; "all" sind die Gesamtwerte aus dem Index."""
+        self.build_leaderboard()
+        if period == "all":
+            return self.leaderboard
+
+        # Gleitendes Fenster: höchstens einmal pro Minute neu berechnen
+        key = (self.history.version, self.leaderboard.generation, int(time.time() // 60))
+        board = self._period_boards.setdefault(period, Leaderboard())
+        if board.generation != key:
+            deltas = self.history.range_sum(time.time() - PERIODS[period], self.leaderboard.raw_rows)
+            board.load_rows(list(deltas), [list(v) for v in deltas.values()], key)
+        return board
+
     # ------------------------- /stats command -------------------------
     @app_commands.command(name="stats", description="Zeigt Minecraft Stats eines Spielers")
-    async def stats(self, interaction: discord.Interaction, player: str):
+    @app_commands.describe(refresh="Stats-Index sofort synchronisieren, auch wenn er noch aktuell ist",
+                           period="Zeitraum")
+    @app_commands.choices(period=PERIOD_CHOICES)
+    async def stats(self, interaction: discord.Interaction, player: str, refresh: bool = False,
+                    period: Optional[app_commands.Choice[str]] = None):
         await interaction.response.defer()
         try:
-            print(f"[DEBUG] Getting UUID for {player}")
             uuid = await self.get_uuid(player)
-            print(f"[DEBUG] UUID: {uuid}")
 
             if not uuid:
                 return await interaction.followup.send(f"Spieler `{player}` nicht gefunden.")
 
-            data = await self.fetch_stats(uuid)
-            print(f"[DEBUG] Stats data: {data}")
-
-            if not data or "stats" not in data:
+            await self.sync_stats(force=refresh)
+            if self.leaderboard_values(uuid) is None:
                 return await interaction.followup.send(f"Keine Stats für `{player}` gefunden.")
 
-            stats = data["stats"]
-            embed = discord.Embed(title=f"Stats von {player}", color=discord.Color.green())
-            custom = stats.get("minecraft:custom", {})
-
-            # Distance travelled
-            distance_keys = [
-                "walk_one_cm", "walk_under_water_one_cm", "walk_on_water_one_cm",
-                "swim_one_cm", "fly_one_cm", "aviate_one_cm",
-                "climb_one_cm", "crouch_one_cm", "sprint_one_cm",
-                "fall_one_cm", "horse_one_cm", "pig_one_cm",
-                "boat_one_cm", "minecart_one_cm", "strider_one_cm",
-                "happy_ghast_one_cm"
-            ]
-            total_distance_cm = sum(custom.get(f"minecraft:{k}", 0) for k in distance_keys)
-            distance_km = round(total_distance_cm / 100000, 2)
-            embed.add_field(name="Distance Traveled", value=f"{distance_km:,} km  ✈️", inline=True)
-
-            mined = stats.get("minecraft:mined", {})
-            embed.add_field(name="Blocks Broken", value=f"{sum(mined.values()):,} ⛏️", inline=True)
-
-            used = stats.get("minecraft:used", {})
-            embed.add_field(name="Blocks Placed", value=f"{sum(used.values()):,} 🦺", inline=True)
+            period_value = period.value if period else "all"
+            v = self.board_for(period_value).values(uuid) or dict.fromkeys(REGISTRY.names, 0.0)
+            title = f"Stats von {player}"
+            if period_value != "all":
+                title += f" ({PERIOD_LABELS[period_value]})"
+            embed = discord.Embed(title=title, color=discord.Color.green())
 
-            # Damage
-            def round_half(x): return round(x*2)/2
-            damage_done = round_half(custom.get("minecraft:damage_dealt", 0)/20)
-            damage_taken = round_half(custom.get("minecraft:damage_taken", 0)/20)
-
-            embed.add_field(name="Damage Done", value=f"{damage_done:.1f} 🗡️", inline=True)
-            embed.add_field(name="Damage Taken", value=f"{damage_taken:.1f} 💔", inline=True)
-
-            embed.add_field(name="Deaths", value=f"{custom.get('minecraft:deaths', 0):,}🪦", inline=True)
-            embed.add_field(name="Player Kills", value=f"{custom.get('minecraft:player_kills', 0):,} ⚔️", inline=True)
-
-            killed = stats.get("minecraft:killed", {})
-            entity_kills = sum(v for k, v in killed.items() if k != "minecraft:player")
-            embed.add_field(name="Entity Kills", value=f"{entity_kills:,}", inline=True)
-
-            playtime_hours = round(custom.get("minecraft:play_time", 0)/20/60/60, 2)
-            embed.add_field(name="Playtime", value=f"{playtime_hours:,} h ⌛", inline=True)
+            for metric in REGISTRY.metrics:
+                unit = f" {metric.unit}" if metric.unit else ""
+                embed.add_field(name=metric.label, value=f"{metric.format(v[metric.name])}{unit} {metric.emoji}".rstrip(),
+                                inline=True)
 
             await interaction.followup.send(embed=embed)
 
         except Exception as e:
             await interaction.followup.send(f"Fehler beim Abrufen der Stats: `{e}`")
 
+    @stats.autocomplete("player")
+    async def player_autocomplete(self, interaction: discord.Interaction, current: str):
+        # Nur aus dem lokalen Index, kein SSH im Autocomplete-Pfad
+        return [app_commands.Choice(name=n, value=n) for n in self.players.complete(current)]
+
     # ------------------------- /top command -------------------------
     @app_commands.command(name="top", description="Zeigt Top Spieler für eine Kategorie")
-    @app_commands.describe(number="Anzahl der Spieler", stat_type="Statistiktyp")
+    @app_commands.describe(number="Anzahl der Spieler", stat_type="Statistiktyp",
+                           refresh="Stats-Index sofort synchronisieren, auch wenn er noch aktuell ist",
+                           period="Zeitraum")
     @app_commands.choices(
-        stat_type=[app_commands.Choice(name=s.replace("_", " ").title(), value=s) 
-                for s in [
-                    "distance_traveled", "block_broken", "block_placed",
-                    "damage_done", "damage_taken", "deaths", "player_kills",
-                    "entity_kills", "playtime"
-                ]]
+        stat_type=[app_commands.Choice(name=m.label, value=m.name) for m in REGISTRY.metrics],
+        period=PERIOD_CHOICES
     )
-    async def top(self, interaction: discord.Interaction, number: int, stat_type: app_commands.Choice[str]):
+    async def top(self, interaction: discord.Interaction, number: int, stat_type: app_commands.Choice[str],
+                  refresh: bool = False, period: Optional[app_commands.Choice[str]] = None):
         await interaction.response.defer()
         try:
             stat_type_lower = stat_type.value
 
-            # Liste der Dateien über SSH
-            cmd = (
-                f"ssh -o BatchMode=yes -T -n "
-                f"-o StrictHostKeyChecking=no "
-                f"-o UserKnownHostsFile=/dev/null "
-                f"{self.MC_SSH_USER}@{self.MC_HOST} ls {shlex.quote(self.STATS_PATH)}"
-            )
-
-            proc = await asyncio.create_subprocess_shell(
-                cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-
-            files = []
-            async for line_bytes in proc.stdout:
-                line = line_bytes.decode(errors="ignore").strip()
-                if line:
-                    files.append(line)
-            async for err_bytes in proc.stderr:
-                err = err_bytes.decode(errors="ignore").strip()
-                if err:
-                    print(f"[SSH ERROR] {err}")
-
-            await proc.wait()
-            files = [f for f in files if f.endswith(".json")]
-
-            users = await self.ssh_cat_json(self.USERCACHE_PATH)
-            uuid_to_name = {u["uuid"]: u["name"] for u in users} if users else {}
-
-            player_stats = []
-
-            for f in files:
-                uuid = f.replace(".json", "")
-                data = await self.fetch_stats(uuid)
-                if not data or "stats" not in data:
-                    continue
+            await self.sync_stats(force=refresh)
 
-                stats = data["stats"]
-                custom = stats.get("minecraft:custom", {})
-                mined = stats.get("minecraft:mined", {})
-                used = stats.get("minecraft:used", {})
-                killed = stats.get("minecraft:killed", {})
-
-                value = 0
-                if stat_type_lower == "distance_traveled":
-                    distance_keys = [
-                        "walk_one_cm", "walk_under_water_one_cm", "walk_on_water_one_cm",
-                        "swim_one_cm", "fly_one_cm", "aviate_one_cm",
-                        "climb_one_cm", "crouch_one_cm", "sprint_one_cm",
-                        "fall_one_cm", "horse_one_cm", "pig_one_cm",
-                        "boat_one_cm", "minecart_one_cm", "strider_one_cm",
-                        "happy_ghast_one_cm"
-                    ]
-                    value = sum(custom.get(f"minecraft:{k}", 0) for k in distance_keys) / 100000
-                elif stat_type_lower == "block_broken":
-                    value = sum(mined.values())
-                elif stat_type_lower == "block_placed":
-                    value = sum(used.values())
-                elif stat_type_lower == "damage_done":
-                    value = round(custom.get("minecraft:damage_dealt", 0) / 20 * 2) / 2
-                elif stat_type_lower == "damage_taken":
-                    value = round(custom.get("minecraft:damage_taken", 0) / 20 * 2) / 2
-                elif stat_type_lower == "deaths":
-                    value = custom.get("minecraft:deaths", 0)
-                elif stat_type_lower == "player_kills":
-                    value = custom.get("minecraft:player_kills", 0)
-                elif stat_type_lower == "entity_kills":
-                    value = sum(v for k, v in killed.items() if k != "minecraft:player")
-                elif stat_type_lower == "playtime":
-                    value = round(custom.get("minecraft:play_time", 0) / 20 / 60 / 60, 2)
-
-                name = uuid_to_name.get(uuid, uuid)
-                player_stats.append((name, value))
-
-            top_players = sorted(player_stats, key=lambda x: x[1], reverse=True)[:number]
+            # Alle Kategorien werden einmal pro Index-Stand berechnet, danach nur noch Top-k
+            period_value = period.value if period else "all"
+            board = self.board_for(period_value)
+            top_players = [(self.players.name_for(uuid) or uuid, value)
+                           for uuid, value in board.top(stat_type_lower, number)]
 
             # Emojis nur hinter die Überschrift
-            emoji_map = {
-                "distance_traveled": "✈️",
-                "block_broken": "⛏️",
-                "block_placed": "🦺",
-                "damage_done": "🗡️",
-                "damage_taken": "💔",
-                "deaths": "🪦",
-                "player_kills": "⚔️",
-                "entity_kills": "👾",
-                "playtime": "⌛"
-            }
-            title_emoji = emoji_map.get(stat_type_lower, "")
-            msg = f"Top {number} Spieler für {stat_type_lower.replace('_', ' ').title()} {title_emoji}\n"
+            metric = REGISTRY.by_name[stat_type_lower]
+            suffix = f" ({PERIOD_LABELS[period_value]})" if period_value != "all" else ""
+            msg = f"Top {number} Spieler für {metric.label}{suffix} {metric.emoji}\n"
 
+            unit = f" {metric.unit}" if metric.unit else ""
             for i, p in enumerate(top_players):
-                if stat_type_lower == "distance_traveled":
-                    msg += f"{i+1}. {p[0]} — {p[1]:,.2f} km\n"
-                elif stat_type_lower == "playtime":
-                    msg += f"{i+1}. {p[0]} — {p[1]:,.2f} h\n"
-                else:
-                    msg += f"{i+1}. {p[0]} — {p[1]:,}\n"
+                msg += f"{i+1}. {p[0]} — {metric.format(p[1])}{unit}\n"
 
             await interaction.followup.send(f"```{msg}```")
 
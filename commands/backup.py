@@ -9,6 +9,7 @@ from dotenv import load_dotenv
 import logging
 import tempfile
 from datetime import datetime
+from utils.ssh_pool import ssh_pool
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -45,20 +46,19 @@ async def run_backup_script() -> tuple[str, bool]:
         f.write("locked")
 
     try:
-        async with asyncssh.connect(MC_SERVER_HOST, username=MC_SERVER_USER) as conn:
-            # Execute the backup.sh script
-            cmd = "/home/Minecraft/minecraft1/backups/backup.sh"
-            result = await conn.run(cmd, check=False)
+        # Execute the backup.sh script
+        cmd = "/home/Minecraft/minecraft1/backups/backup.sh"
+        result = await ssh_pool.run(MC_SERVER_HOST, MC_SERVER_USER, cmd, check=False)
 
-            output = result.stdout or ""
-            if result.stderr:
-                output += "\nError:\n" + result.stderr
+        output = result.stdout or ""
+        if result.stderr:
+            output += "\nError:\n" + result.stderr
 
-            if result.exit_status != 0:
-                return (f"Backup-Script failed with exit code {result.exit_status}:\n{output}", False)
+        if result.exit_status != 0:
+            return (f"Backup-Script failed with exit code {result.exit_status}:\n{output}", False)
 
-            logger.info("Backup script executed successfully.")
-            return (f"Backup erfolgreich:\n{output}", True)
+        logger.info("Backup script executed successfully.")
+        return (f"Backup erfolgreich:\n{output}", True)
 
     except (asyncssh.Error, OSError) as e:
         logger.error(f"Fehler beim Backup: {e}")
@@ -71,20 +71,24 @@ async def run_backup_script() -> tuple[str, bool]:
 
 async def perform_post_backup_action(action: str):
     """Perform server/container action after backup"""
-    async with asyncssh.connect(MC_SERVER_HOST, username=MC_SERVER_USER) as conn:
-        if action == "McHot":
-            # Do nothing, server stays online
-            return
-        elif action == "ServerRestart":
-            await conn.run("sudo reboot", check=False)
-        elif action == "ServerShutdown":
-            await conn.run("sudo shutdown now", check=False)
-        elif action == "McRestart":
-            for container in DOCKER_CONTAINERS:
-                await conn.run(f"docker restart {container}", check=False)
-        elif action == "McShutdown":
-            for container in DOCKER_CONTAINERS:
-                await conn.run(f"docker stop {container}", check=False)
+    async def run(cmd):
+        await ssh_pool.run(MC_SERVER_HOST, MC_SERVER_USER, cmd, check=False)
+
+    if action == "McHot":
+        # Do nothing, server stays online
+        return
+    elif action == "ServerRestart":
+        await run("sudo reboot")
+        ssh_pool.invalidate(MC_SERVER_HOST, MC_SERVER_USER)
+    elif action == "ServerShutdown":
+        await run("sudo shutdown now")
+        ssh_pool.invalidate(MC_SERVER_HOST, MC_SERVER_USER)
+    elif action == "McRestart":
+        for container in DOCKER_CONTAINERS:
+            await run(f"docker restart {container}")
+    elif action == "McShutdown":
+        for container in DOCKER_CONTAINERS:
+            await run(f"docker stop {container}")
 
 
 class BackupCog(commands.Cog):
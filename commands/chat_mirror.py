@@ -2,159 +2,462 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
+import asyncssh
+import json
+import os
+import posixpath
 import re
-from mcrcon import MCRcon
 import shlex
 import socket
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+from utils.discord_queue import CoalescingSender
+from utils.log_cursor import LogCursorStore
+from utils.ssh_pool import ssh_pool
+from utils.rcon import get_rcon
+from utils.player_index import player_index
+from utils.log_events import classify, EventKind, LogEvent
+from utils.tellraw import TellrawBatcher, message_components
+from utils.event_bus import event_bus, ServerLogEvent, PlayerCountChanged, MirrorStateChanged
+from utils.mc_ping import mc_ping
 
-class ChatMirror(commands.Cog):
-    def __init__(self, bot: commands.Bot):
+DATA_DIR = os.getenv("BOT_DATA_DIR", "data")
+# Liste der gespiegelten Server; ohne Datei wird nur der Standard-Server gespiegelt
+SERVERS_FILE = os.getenv("CHAT_SERVERS_FILE", os.path.join(DATA_DIR, "chat_servers.json"))
+
+
+# ===================== KONFIG =====================
+@dataclass
+class MirrorServer:
+    name: str
+    host: str
+    log_file: str
+    channel_id: int
+    rcon_password: str
+    ssh_user: str = "minecraft"
+    rcon_port: int = 25575
+    mc_port: int = 25565
+    # Optional: Webhook-URL, dann erscheinen Chat-Nachrichten mit Spielername und Kopf-Avatar
+    webhook_url: str = ""
+
+
+DEFAULT_SERVERS = [
+    MirrorServer(
+        name="minecraft1",
+        host="192.168.188.150",
+        log_file="/home/Minecraft/minecraft1/data/logs/latest.log",
+        channel_id=1443363440021475410,
+        rcon_password="passwort1",
+        webhook_url=os.getenv("CHAT_WEBHOOK_URL", ""),
+    ),
+]
+
+
+def load_servers(path: str = SERVERS_FILE) -> list[MirrorServer]:
+    """Lädt die gespiegelten Server aus einer JSON-Datei (Liste von Objekten mit MirrorServer-Feldern)."""
+    if not os.path.exists(path):
+        return DEFAULT_SERVERS
+    try:
+        with open(path, encoding="utf-8") as f:
+            servers = [MirrorServer(**entry) for entry in json.load(f)]
+    except (OSError, ValueError, TypeError) as e:
+        print(f"[ERROR] Chat-Server aus {path} konnten nicht geladen werden: {e}")
+        return DEFAULT_SERVERS
+    return servers or DEFAULT_SERVERS
+
+
+AVATAR_URL = os.getenv("CHAT_AVATAR_URL", "https://mc-heads.net/avatar/{id}/64")
+# So lange (Sekunden) bleibt eine Avatar-URL im Cache, bevor sie neu aufgelöst wird
+AVATAR_TTL = int(os.getenv("CHAT_AVATAR_TTL", "3600"))
+# Nach einem Neustart höchstens so viel nachholen
+MAX_BACKLOG_EVENTS = int(os.getenv("CHAT_MAX_BACKLOG", "100"))
+MAX_BACKLOG_BYTES = int(os.getenv("CHAT_MAX_BACKLOG_BYTES", str(4 * 1024 * 1024)))
+QUEUE_SIZE = int(os.getenv("CHAT_QUEUE_SIZE", "500"))
+QUEUE_LINGER = float(os.getenv("CHAT_QUEUE_LINGER", "0.25"))
+# Discord→Minecraft: so lange (Sekunden) sammeln, bevor ein gemeinsames tellraw gesendet wird
+TELLRAW_WINDOW = float(os.getenv("CHAT_TELLRAW_WINDOW", "0.15"))
+
+# Antwort auf RCON "list": "There are 2 of a max of 20 players online: Alex, Steve"
+LIST_RE = re.compile(r"There are (\d+)(?: of a max of |/)\d+ players online:(.*)")
+
+
+class StreamMetrics:
+    """Zeilen pro Sekunde (gleitend über eine Minute) und Verzögerung gegenüber dem Log-Zeitstempel."""
+
+    WINDOW = 60
+
+    def __init__(self):
+        self.lines = 0
+        self.events = 0
+        self.lag: Optional[float] = None
+        self.lag_max = 0.0
+        self.connected_at: Optional[float] = None
+        self._buckets: deque[list[int]] = deque()
+
+    def record(self, line: str):
+        now = time.time()
+        self.lines += 1
+        second = int(now)
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += 1
+        else:
+            self._buckets.append([second, 1])
+            while self._buckets[0][0] <= second - self.WINDOW:
+                self._buckets.popleft()
+
+        # Log-Zeilen tragen nur die Uhrzeit "[HH:MM:SS]" (Zeitzone des Servers = Zeitzone des Bots)
+        if len(line) > 9 and line[0] == "[" and line[3] == ":" and line[6] == ":":
+            try:
+                logged = int(line[1:3]) * 3600 + int(line[4:6]) * 60 + int(line[7:9])
+            except ValueError:
+                return
+            local = time.localtime(now)
+            current = local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec + (now % 1)
+            self.lag = (current - logged) % 86400
+            self.lag_max = max(self.lag_max, self.lag)
+
+    def rate(self) -> float:
+        cutoff = int(time.time()) - self.WINDOW
+        return sum(count for second, count in self._buckets if second > cutoff) / self.WINDOW
+
+    def as_dict(self) -> dict:
+        return {
+            "lines": self.lines,
+            "events": self.events,
+            "lines_per_s": round(self.rate(), 2),
+            "lag_s": round(self.lag, 1) if self.lag is not None else None,
+            "lag_max_s": round(self.lag_max, 1),
+        }
+
+
+class MirrorStream:
+    """Spiegelt das Log eines Servers in seinen Discord-Channel.
+
+    Alle Streams auf demselben Host teilen sich über den SSH-Pool eine Verbindung
+    (je ein Channel pro ``tail``).
+    """
+
+    def __init__(self, bot: commands.Bot, server: MirrorServer, cursors: LogCursorStore):
         self.bot = bot
+        self.server = server
+        self.cursors = cursors
+        self.cursor_key = f"{server.host}:{server.log_file}"
+        self.metrics = StreamMetrics()
+
+        self.webhook = discord.Webhook.from_url(server.webhook_url, client=bot) if server.webhook_url else None
+        # UUID (bzw. Name, solange keine UUID bekannt ist) -> (URL, gültig bis)
+        self._avatars: dict[str, tuple[str, float]] = {}
 
-        # ===================== KONFIG =====================
-        self.MC_HOST = "192.168.188.150"
-        self.MC_SSH_USER = "minecraft"
-        self.LOG_FILE = "/home/Minecraft/minecraft1/data/logs/latest.log"
-        self.DISCORD_CHANNEL_ID = 1443363440021475410
-        self.MC_RCON_PASSWORD = "passwort1"
-        self.MC_RCON_PORT = 25575
+        # Ausgehende Discord-Nachrichten laufen über eine begrenzte Warteschlange,
+        # damit der Log-Leser nie auf Discord (oder dessen Rate-Limit) wartet
+        self.outbox = CoalescingSender(self.send_to_channel, maxsize=QUEUE_SIZE, linger=QUEUE_LINGER)
+
+        # Discord→Minecraft-Nachrichten werden gebündelt und als ein tellraw pro Fenster gesendet
+        self.tellraw = TellrawBatcher(self.rcon_command, window=TELLRAW_WINDOW, on_error=self.report_mc_error)
+
+        # Aktuell eingeloggte Spieler; per RCON "list" gesetzt und durch Join/Leave fortgeschrieben
+        self.online: set[str] = set()
 
         self.proc = None
-        self.mirror_task = self.bot.loop.create_task(self.chat_mirror_loop())
+        self.task: Optional[asyncio.Task] = None
 
     # ===================== Helfer =====================
-    async def is_server_online(self, host, port=25565, timeout=3):
-        try:
-            with socket.create_connection((host, port), timeout):
-                return True
-        except OSError:
-            return False
+    async def is_server_online(self):
+        return await mc_ping.reachable(self.server.host, self.server.mc_port)
 
     async def stop_subprocess(self):
         if self.proc and self.proc.returncode is None:
-            self.proc.terminate()
+            # Nur den Channel schließen, die gepoolte SSH-Verbindung bleibt bestehen
+            self.proc.close()
             try:
-                await asyncio.wait_for(self.proc.wait(), timeout=5)
+                await asyncio.wait_for(self.proc.wait_closed(), timeout=5)
             except asyncio.TimeoutError:
-                self.proc.kill()
-            self.proc = None
+                pass
+        if self.metrics.connected_at is not None:
+            event_bus.publish(MirrorStateChanged(self.server.name, self.server.host, False))
+        self.proc = None
+        self.metrics.connected_at = None
+        self.cursors.flush()
+
+    @property
+    def running(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+    def avatar_for(self, player: str) -> str:
+        # Nach UUID cachen, damit der Kopf auch nach Namensänderungen stimmt
+        uuid = player_index.uuid_for(player)
+        key = uuid or player.lower()
+        now = time.time()
+        cached = self._avatars.get(key)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        if len(self._avatars) >= 256:
+            self._avatars = {k: v for k, v in self._avatars.items() if v[1] > now}
+        url = AVATAR_URL.format(id=uuid or player)
+        self._avatars[key] = (url, now + AVATAR_TTL)
+        return url
+
+    async def send_to_channel(self, key, text: str):
+        if self.webhook:
+            if key:
+                await self.webhook.send(text, username=key, avatar_url=self.avatar_for(key),
+                                        allowed_mentions=discord.AllowedMentions.none())
+            else:
+                await self.webhook.send(text, username=self.server.name,
+                                        allowed_mentions=discord.AllowedMentions.none())
+            return
+
+        channel = self.bot.get_channel(self.server.channel_id)
+        if channel:
+            await channel.send(text)
+
+    async def rcon_command(self, command: str) -> str:
+        return await get_rcon(self.server.host, self.server.rcon_port, self.server.rcon_password).command(command)
+
+    async def report_mc_error(self, error: Exception):
+        channel = self.bot.get_channel(self.server.channel_id)
+        if channel:
+            await channel.send(f"?? Minecraft Fehler: `{error}`")
+
+    # ===================== Spielerzahl =====================
+    def set_online(self, players: set[str], authoritative: bool = False):
+        if players == self.online and not authoritative:
+            return
+        self.online = players
+        event_bus.publish(PlayerCountChanged(self.server.name, self.server.host, len(players), frozenset(players),
+                                             authoritative=authoritative))
+
+    async def seed_online(self):
+        """Liest die aktuell eingeloggten Spieler per RCON, damit Join/Leave auf einem korrekten Stand aufsetzen."""
+        try:
+            rcon = get_rcon(self.server.host, self.server.rcon_port, self.server.rcon_password)
+            m = LIST_RE.search(await rcon.command("list", timeout=10))
+        except Exception as e:
+            print(f"[WARN] [{self.server.name}] Spielerliste per RCON nicht lesbar: {e}")
+            return
+        if m:
+            self.set_online({name.strip() for name in m.group(2).split(",") if name.strip()}, authoritative=True)
+
+    # ===================== Log-Ereignisse =====================
+    def handle_event(self, event: LogEvent, replayed: bool = False):
+        event_bus.publish(ServerLogEvent(self.server.name, self.server.host, event, replayed))
+        if not replayed:
+            if event.kind is EventKind.JOIN:
+                self.set_online(self.online | {event.player})
+            elif event.kind is EventKind.LEAVE:
+                self.set_online(self.online - {event.player})
+
+        if event.kind is EventKind.UUID:
+            player_index.absorb(event.player, event.text)
+            # Der Name allein ist jetzt nicht mehr der Cache-Schlüssel
+            self._avatars.pop(event.player.lower(), None)
+            return
+        if event.kind is EventKind.JOIN:
+            player_index.absorb(event.player)
+
+        if event.kind is EventKind.CHAT:
+            if self.webhook:
+                # Aufeinanderfolgende Nachrichten desselben Spielers werden zu einer zusammengefasst
+                self.outbox.put(event.text, key=event.player)
+            else:
+                self.outbox.put(f"**{event.player}**: {event.text}")
+        elif event.kind is EventKind.DEATH:
+            self.outbox.put(f"☠️ **Death:** {event.text}")
+        elif event.kind is EventKind.JOIN:
+            self.outbox.put(f"🟩 **Join:** `{event.player}` hat den Server betreten.")
+        elif event.kind is EventKind.LEAVE:
+            self.outbox.put(f"🟥 **Leave:** `{event.player}` hat den Server verlassen.")
+        elif event.kind is EventKind.ADVANCEMENT:
+            self.outbox.put(f"**Advancement:** {event.text}")
+
+    # ===================== Nachholen =====================
+    async def fetch_text(self, command: str) -> str:
+        result = await ssh_pool.run(self.server.host, self.server.ssh_user, command, timeout=60)
+        return result.stdout or ""
+
+    async def catch_up(self):
+        """Holt seit der gespeicherten Position verpasste Zeilen nach.
+
+        Gibt den Byte-Offset in latest.log zurück, ab dem live gelesen wird,
+        oder None, wenn die Datei nicht gelesen werden konnte.
+        """
+        log_file = shlex.quote(self.server.log_file)
+        log_dir = shlex.quote(posixpath.dirname(self.server.log_file))
+        state = await self.fetch_text(
+            f"stat -c '%i %s' {log_file} || exit 0; "
+            f"f=$(ls -1t {log_dir}/*.log.gz 2>/dev/null | head -n 1); "
+            f"[ -n \"$f\" ] && stat -c '%Y %n' \"$f\"; true"
+        )
+        lines = state.splitlines()
+        try:
+            inode, size = (int(x) for x in lines[0].split())
+        except (IndexError, ValueError):
+            return None
+
+        cursor = self.cursors.get(self.cursor_key)
+        rotated = False
+        if cursor is None:
+            # Erster Start: keine Vorgeschichte nachholen
+            start = size
+        elif cursor.inode == inode and cursor.offset <= size:
+            start = cursor.offset
+        else:
+            start = 0
+            rotated = True
+
+        # MAX_BACKLOG_BYTES gilt für beide Dateien zusammen; die neuesten Zeilen (latest.log) haben Vorrang
+        recent = ""
+        if start < size:
+            recent = await self.fetch_text(
+                f"tail -c +{start + 1} {log_file} | head -c {size - start} | tail -c {MAX_BACKLOG_BYTES}"
+            )
+        budget = MAX_BACKLOG_BYTES - len(recent.encode())
+
+        backlog: list[str] = []
+        if rotated and budget > 0 and len(lines) > 1:
+            # latest.log wurde rotiert: den Rest der alten Datei aus dem jüngsten Archiv lesen
+            mtime, gz_file = lines[1].split(" ", 1)
+            if float(mtime) >= cursor.ts - 60:
+                backlog += (await self.fetch_text(
+                    f"zcat -- {shlex.quote(gz_file)} | tail -c +{cursor.offset + 1} | tail -c {budget}"
+                )).splitlines()
+        backlog += recent.splitlines()
+
+        self.replay(backlog)
+        self.cursors.set(self.cursor_key, inode, size)
+        return size
+
+    def replay(self, lines: list[str]):
+        # Eine am Byte-Limit abgeschnittene erste Zeile passt nicht auf das Log-Präfix und fällt heraus
+        events = [e for e in map(classify, (line.strip() for line in lines)) if e is not None]
+        if not events:
+            return
+        skipped = max(0, len(events) - MAX_BACKLOG_EVENTS)
+        for event in events[:skipped]:
+            if event.kind in (EventKind.UUID, EventKind.JOIN):
+                player_index.absorb(event.player, event.text if event.kind is EventKind.UUID else None)
+        note = f" (die ältesten {skipped} ausgelassen)" if skipped else ""
+        self.outbox.put(f"⏪ **{len(events) - skipped}** verpasste Ereignisse{note}:")
+        for event in events[skipped:]:
+            self.handle_event(event, replayed=True)
 
     # ===================== Subprozess-Stream =====================
     async def stream_subprocess(self):
-        channel = self.bot.get_channel(self.DISCORD_CHANNEL_ID)
-        ssh_command = f"ssh {self.MC_SSH_USER}@{self.MC_HOST} tail -n 0 -F {shlex.quote(self.LOG_FILE)}"
+        self.outbox.start()
+        log_file = shlex.quote(self.server.log_file)
         try:
-            self.proc = await asyncio.create_subprocess_shell(
-                ssh_command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            start = await self.catch_up()
+            await self.seed_online()
+            if start is None:
+                tail_command = f"tail -n 0 -F {log_file}"
+            else:
+                tail_command = f"tail -c +{start + 1} -F {log_file}"
+
+            async with ssh_pool.process(self.server.host, self.server.ssh_user, tail_command) as proc:
+                self.proc = proc
+                self.metrics.connected_at = time.time()
+                event_bus.publish(MirrorStateChanged(self.server.name, self.server.host, True))
 
-            async def read_stdout():
-                async for line_bytes in self.proc.stdout:
-                    line = line_bytes.decode(errors="ignore").strip()
-                    if not line:
-                        continue
-
-                    # ================= Chat Messages =================
-                    chat_match = re.search(r"\[.*\]: <([^>]+)> (.*)", line)
-                    if chat_match:
-                        player = chat_match.group(1)
-                        msg = chat_match.group(2)
-                        if channel:
-                            await channel.send(f"**{player}**: {msg}")
-                        continue
-
-                    # ================= Death Messages =================
-                    death_patterns = [
-                        r"was slain by",
-                        r"fell from",
-                        r"fell off",
-                        r"fell out of the world",
-                        r"tried to swim in lava",
-                        r"was blown up",
-                        r"was killed by",
-                        r"burned to death",
-                        r"drowned",
-                        r".+ died",
-                        r"was burned to a crisp while fighting"
-                    ]
-                    if any(re.search(pat, line) for pat in death_patterns):
-                        cleaned = re.sub(r".*INFO\]: ", "", line)
-                        if channel:
-                            await channel.send(f"☠️ **Death:** {cleaned}")
-                        continue
-
-                    # ================= Player Join =================
-                    join_match = re.search(r": ([A-Za-z0-9_]+) joined the game", line)
-                    if join_match and channel:
-                        player = join_match.group(1)
-                        await channel.send(f"🟩 **Join:** `{player}` hat den Server betreten.")
-                        continue
-
-                    # ================= Player Leave =================
-                    leave_match = re.search(r": ([A-Za-z0-9_]+) left the game", line)
-                    if leave_match and channel:
-                        player = leave_match.group(1)
-                        await channel.send(f"🟥 **Leave:** `{player}` hat den Server verlassen.")
-                        continue
-
-                    # ================= Advancements =================
-                    adv_match = re.search(r"has made the advancement \[(.+)\]", line)
-                    if adv_match and channel:
-                        adv = adv_match.group(1)
-                        await channel.send(f"**Advancement:** {adv}")
-
-            async def read_stderr():
-                async for line_bytes in self.proc.stderr:
-                    line = line_bytes.decode(errors="ignore").strip()
-                    if line:
-                        print(f"[WARN][stderr] {line}")
-                        # Kritische SSH-Fehler → Subprozess stoppen + Pause
-                        if "Permission denied" in line or "Could not resolve hostname" in line:
-                            await self.stop_subprocess()
-                            print("[INFO] Warte 5 Minuten bevor neuer SSH-Versuch...")
-                            await asyncio.sleep(300)
-                            break
-
-            # Parallel stdout/stderr lesen
-            await asyncio.gather(read_stdout(), read_stderr())
+                async def read_stdout():
+                    async for line_bytes in proc.stdout:
+                        self.cursors.advance(self.cursor_key, len(line_bytes))
+                        line = line_bytes.decode(errors="ignore").strip()
+                        if not line:
+                            continue
+
+                        self.metrics.record(line)
+                        event = classify(line)
+                        if event is None:
+                            continue
+                        self.metrics.events += 1
+                        self.handle_event(event)
+
+                async def read_stderr():
+                    async for line_bytes in proc.stderr:
+                        line = line_bytes.decode(errors="ignore").strip()
+                        if not line:
+                            continue
+                        print(f"[WARN][{self.server.name}][stderr] {line}")
+                        if "has been replaced" in line or "file truncated" in line:
+                            # tail liest die neue Datei von vorn: Offset sofort (ohne await) zurücksetzen,
+                            # damit ihn read_stdout für die Zeilen der neuen Datei weiterzählt
+                            cursor = self.cursors.get(self.cursor_key)
+                            old_inode = cursor.inode if cursor else 0
+                            self.cursors.set(self.cursor_key, old_inode, 0)
+                            # Nur die Inode nachtragen, den inzwischen weitergezählten Offset behalten
+                            state = await self.fetch_text(f"stat -c %i {log_file}")
+                            cursor = self.cursors.get(self.cursor_key)
+                            if state.strip().isdigit() and cursor is not None:
+                                self.cursors.set(self.cursor_key, int(state), cursor.offset)
+
+                # Parallel stdout/stderr lesen
+                await asyncio.gather(read_stdout(), read_stderr())
+
+        except (asyncssh.PermissionDenied, asyncssh.HostKeyNotVerifiable, socket.gaierror) as e:
+            # Kritische SSH-Fehler → Pause statt sofortigem Neuversuch
+            print(f"[ERROR][{self.server.name}] SSH-Verbindung abgelehnt: {e}")
+            print("[INFO] Warte 5 Minuten bevor neuer SSH-Versuch...")
+            await self.stop_subprocess()
+            await asyncio.sleep(300)
 
         except Exception as e:
-            print(f"[ERROR] SSH Subprozess konnte nicht gestartet werden: {e}")
+            print(f"[ERROR][{self.server.name}] SSH Subprozess konnte nicht gestartet werden: {e}")
             await self.stop_subprocess()
             await asyncio.sleep(300)
 
     # ===================== Chat-Mirror Loop =====================
-    async def chat_mirror_loop(self):
+    async def run(self):
         await self.bot.wait_until_ready()
         while not self.bot.is_closed():
-            if not await self.is_server_online(self.MC_HOST):
-                print("[INFO] Minecraft Server offline. Prüfe in 5 Minuten erneut.")
+            if not await self.is_server_online():
+                print(f"[INFO] Minecraft Server {self.server.name} offline. Prüfe in 5 Minuten erneut.")
                 await asyncio.sleep(300)
                 continue
 
             await self.stop_subprocess()
-            print("[INFO] Starte Chat-Mirror Subprozess")
+            print(f"[INFO] Starte Chat-Mirror Subprozess für {self.server.name}")
             await self.stream_subprocess()
+            await self.stop_subprocess()
             await asyncio.sleep(5)
 
+    def summary(self) -> str:
+        stats = ", ".join(f"{k}={v}" for k, v in self.metrics.as_dict().items())
+        return (
+            f"**{self.server.name}** ({'aktiv' if self.running else 'inaktiv'})\n"
+            f"Stream: {stats}\nWarteschlange: {self.outbox.summary()}\n"
+            f"Discord→MC: {self.tellraw.messages} Nachrichten in {self.tellraw.commands} tellraw"
+        )
+
+
+class ChatMirror(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.cursors = LogCursorStore()
+        self.streams = [MirrorStream(bot, server, self.cursors) for server in load_servers()]
+        self.by_channel = {stream.server.channel_id: stream for stream in self.streams}
+        for stream in self.streams:
+            stream.task = self.bot.loop.create_task(stream.run())
+
     # ===================== Discord -> Minecraft =====================
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
-        if message.author == self.bot.user:
+        if message.author == self.bot.user or message.webhook_id is not None:
             return
-        if message.channel.id != self.DISCORD_CHANNEL_ID:
+        stream = self.by_channel.get(message.channel.id)
+        if stream is None:
             return
 
-        mc_msg = f"[Discord] {message.author.name}: {message.content}"
-        try:
-            with MCRcon(self.MC_HOST, self.MC_RCON_PASSWORD, port=self.MC_RCON_PORT) as rcon:
-                safe_msg = mc_msg.replace('"', "'")
-                tellraw_cmd = f'tellraw @a ["",{{"text":"{safe_msg}","color":"white"}}]'
-                rcon.command(tellraw_cmd)
-        except Exception as e:
-            await message.channel.send(f"?? Minecraft Fehler: `{e}`")
+        reply_to = None
+        if message.reference and isinstance(message.reference.resolved, discord.Message):
+            reply_to = message.reference.resolved.author.name
+        stream.tellraw.add(message_components(
+            message.author.name,
+            message.content,
+            [(a.filename, a.url) for a in message.attachments],
+            reply_to,
+        ))
 
     # ===================== App-Command /chatsync reload =====================
     @app_commands.command(
@@ -163,21 +466,22 @@ class ChatMirror(commands.Cog):
     )
     @app_commands.describe(action="Aktion")
     @app_commands.choices(action=[
-        app_commands.Choice(name="reload", value="reload")
+        app_commands.Choice(name="reload", value="reload"),
+        app_commands.Choice(name="status", value="status")
     ])
     async def chatsync_reload(self, interaction: discord.Interaction, action: app_commands.Choice[str]):
+        if action.value == "status":
+            await interaction.response.send_message(
+                "\n\n".join(stream.summary() for stream in self.streams), ephemeral=True
+            )
+            return
         if action.value != "reload":
             await interaction.response.send_message("Ungültige Auswahl.", ephemeral=True)
             return
 
-        await self.stop_subprocess()
-
-        # Starte Subprozess als Task im Hintergrund
-        async def start_mirror():
-            if await self.is_server_online(self.MC_HOST):
-                await self.stream_subprocess()
-
-        self.bot.loop.create_task(start_mirror())
+        # Die Stream-Schleifen verbinden sich nach dem Beenden des Subprozesses selbst neu
+        for stream in self.streams:
+            await stream.stop_subprocess()
 
         # Sofortige Rückmeldung an Discord
         await interaction.response.send_message(
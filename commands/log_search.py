@@ -0,0 +1,155 @@
+# log_search.py
+import discord
+from discord.ext import commands
+from discord import app_commands
+import asyncio
+import asyncssh
+import os
+import shlex
+import time
+from typing import Optional
+from dotenv import load_dotenv
+from utils.ssh_pool import ssh_pool
+from utils.player_index import player_index
+from utils.stats_history import PERIODS
+from utils.log_archive import LogArchiveIndex, ArchiveBuilder, GzipLineDecoder, archive_day, query_terms
+
+# ------------------------- Load environment variables -------------------------
+load_dotenv()
+
+GUILD_ID = int(os.getenv("GUILD_ID"))
+MC_HOST = os.getenv("SERVER_IP", "127.0.0.1")
+MC_SSH_USER = os.getenv("MC_SERVER_USER", "minecraft")
+LOG_DIR = os.getenv("MC_LOG_DIR", "/home/Minecraft/minecraft1/data/logs")
+# Abstand (Sekunden), in dem nach neuen rotierten Logs gesucht wird
+LOG_INDEX_INTERVAL = int(os.getenv("MC_LOG_INDEX_INTERVAL", "3600"))
+
+EVENT_CHOICES = [
+    app_commands.Choice(name="Chat", value="chat"),
+    app_commands.Choice(name="Join", value="join"),
+    app_commands.Choice(name="Leave", value="leave"),
+    app_commands.Choice(name="Tod", value="death"),
+    app_commands.Choice(name="Advancement", value="advancement"),
+]
+PERIOD_CHOICES = [
+    app_commands.Choice(name="Letzter Tag", value="day"),
+    app_commands.Choice(name="Letzte Woche", value="week"),
+    app_commands.Choice(name="Letzter Monat", value="month"),
+]
+EVENT_ICONS = {"chat": "💬", "join": "🟩", "leave": "🟥", "death": "☠️", "advancement": "🏆"}
+
+
+# ------------------------- Cog -------------------------
+class LogSearch(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.index = LogArchiveIndex()
+        self._index_lock = asyncio.Lock()
+        self.index_task = self.bot.loop.create_task(self.index_loop())
+
+    # ------------------------- Indexer -------------------------
+    async def list_archives(self) -> dict[str, int]:
+        result = await ssh_pool.run(
+            MC_HOST, MC_SSH_USER,
+            f"find {shlex.quote(LOG_DIR)} -maxdepth 1 -name '*.log.gz' -printf '%f\\t%s\\n'",
+            timeout=60, idempotent=True,
+        )
+        listing = {}
+        for line in (result.stdout or "").splitlines():
+            name, _, size = line.partition("\t")
+            if archive_day(name) is not None and size.isdigit():
+                listing[name] = int(size)
+        return listing
+
+    async def index_archive(self, name: str, size: int):
+        """Streamt ein Archiv einmal komprimiert über SSH und entpackt es stückweise."""
+        builder = ArchiveBuilder(archive_day(name))
+        decoder = GzipLineDecoder()
+        path = shlex.quote(f"{LOG_DIR.rstrip('/')}/{name}")
+        async with ssh_pool.process(MC_HOST, MC_SSH_USER, f"cat -- {path}", idempotent=True) as proc:
+            while True:
+                chunk = await proc.stdout.read(65536)
+                if not chunk:
+                    break
+                builder.feed(decoder.feed(chunk))
+        builder.feed(decoder.finish())
+        self.index.add_file(name, size, builder)
+        return builder
+
+    async def update_index(self) -> int:
+        """Indexiert alle neuen oder veränderten Archive und gibt deren Anzahl zurück."""
+        async with self._index_lock:
+            known = self.index.known()
+            listing = await self.list_archives()
+            todo = sorted(name for name, size in listing.items() if known.get(name) != size)
+            for name in todo:
+                started = time.monotonic()
+                builder = await self.index_archive(name, listing[name])
+                print(f"[INFO] Log-Archiv {name} indexiert: {builder.line_no} Zeilen, "
+                      f"{len(builder.events)} Ereignisse in {time.monotonic() - started:.1f}s")
+            return len(todo)
+
+    async def index_loop(self):
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            try:
+                await self.update_index()
+            except (asyncssh.Error, OSError, asyncio.TimeoutError) as e:
+                print(f"[SSH Exception] Log-Index: {e}")
+            except Exception as e:
+                print(f"[ERROR] Log-Index: {e}")
+            await asyncio.sleep(LOG_INDEX_INTERVAL)
+
+    # ------------------------- /logsearch command -------------------------
+    @app_commands.command(name="logsearch", description="Durchsucht die archivierten Server-Logs")
+    @app_commands.describe(player="Spieler", event="Ereignisart", text="Wörter im Text (alle müssen vorkommen)",
+                           period="Zeitraum", limit="Anzahl der angezeigten Treffer")
+    @app_commands.choices(event=EVENT_CHOICES, period=PERIOD_CHOICES)
+    async def logsearch(self, interaction: discord.Interaction, player: Optional[str] = None,
+                        event: Optional[app_commands.Choice[str]] = None, text: str = "",
+                        period: Optional[app_commands.Choice[str]] = None, limit: int = 15):
+        terms = query_terms(player, event.value if event else None, text)
+        if not terms:
+            await interaction.response.send_message("Bitte Spieler, Ereignisart oder Text angeben.", ephemeral=True)
+            return
+
+        started = time.perf_counter()
+        since = time.time() - PERIODS[period.value] if period else None
+        total, rows = await asyncio.to_thread(self.index.search, terms, since, max(1, min(limit, 30)))
+        elapsed = (time.perf_counter() - started) * 1000
+
+        if not rows:
+            await interaction.response.send_message(f"Keine Treffer ({elapsed:.0f} ms).")
+            return
+
+        lines = []
+        for ts, kind, name, message in rows:
+            when = time.strftime("%d.%m.%y %H:%M", time.localtime(ts))
+            if kind == "chat":
+                message = f"<{name}> {message}"
+            elif kind == "join":
+                message = f"{name} hat den Server betreten"
+            elif kind == "leave":
+                message = f"{name} hat den Server verlassen"
+            elif kind == "advancement":
+                message = f"{name}: {message}"
+            lines.append(f"{EVENT_ICONS.get(kind, '')} {when}  {message}")
+
+        header = f"{total} Treffer, neueste {len(rows)} ({elapsed:.0f} ms)\n"
+        body = "\n".join(lines)
+        if len(header) + len(body) > 1990:
+            body = body[:1990 - len(header) - 8] + "\n…"
+        await interaction.response.send_message(f"{header}```{body}```")
+
+    @logsearch.autocomplete("player")
+    async def player_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [app_commands.Choice(name=n, value=n) for n in player_index.complete(current)]
+
+
+# ------------------------- Cog Setup -------------------------
+async def setup(bot: commands.Bot):
+    cog = LogSearch(bot)
+    await bot.add_cog(cog)
+
+    guild = discord.Object(id=GUILD_ID)
+    bot.tree.add_command(cog.logsearch, guild=guild)
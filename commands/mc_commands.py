@@ -5,8 +5,8 @@ import textwrap
 import discord
 from discord.ext import commands
 from discord import app_commands
-from mcrcon import MCRcon
 from dotenv import load_dotenv
+from utils.rcon import get_rcon
 
 # Lade .env, falls vorhanden
 load_dotenv()
@@ -16,7 +16,7 @@ class MCCommands(commands.Cog):
 
     - liest RCON-Konfiguration aus der Umgebung
     - prüft Rollenberechtigung (ROLE_SERVER_CONTROL)
-    - führt Blocking-RCON-Aufrufe im Threadpool aus, damit der Bot-Loop nicht blockiert
+    - nutzt den geteilten asynchronen RCON-Pool, damit der Bot-Loop nicht blockiert
     """
 
     def __init__(self, bot: commands.Bot):
@@ -30,17 +30,12 @@ class MCCommands(commands.Cog):
         # Rolle, die Zugriff auf Server-Kommandos hat
         self.ROLE_SERVER_CONTROL = os.getenv("ROLE_SERVER_CONTROL", "ServerAdmin")
 
-    async def _run_rcon_blocking(self, command: str) -> str:
-        """Blocking RCON-Aufruf — führt MCRcon in executor aus."""
-        def blocking():
-            try:
-                with MCRcon(self.RCON_HOST, self.RCON_PASSWORD, port=self.RCON_PORT) as rcon:
-                    return rcon.command(command)
-            except Exception as e:
-                return f"RCON-Fehler: {e}"
-
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, blocking)
+    async def _run_rcon(self, command: str) -> str:
+        """RCON-Aufruf über den gepoolten, asynchronen Client."""
+        try:
+            return await get_rcon(self.RCON_HOST, self.RCON_PORT, self.RCON_PASSWORD).command(command, timeout=20)
+        except Exception as e:
+            return f"RCON-Fehler: {e}"
 
     def _member_has_role(self, member: discord.Member) -> bool:
         if not isinstance(member, discord.Member):
@@ -62,9 +57,9 @@ class MCCommands(commands.Cog):
         # Ack immediate to avoid interaction timeout
         await interaction.response.defer(ephemeral=True)
 
-        # Run RCON in executor
+        # Run RCON (Timeout wird pro Request im Client durchgesetzt)
         try:
-            result = await asyncio.wait_for(self._run_rcon_blocking(cmd), timeout=20)
+            result = await asyncio.wait_for(self._run_rcon(cmd), timeout=25)
         except asyncio.TimeoutError:
             await interaction.followup.send("RCON-Antwort zu langsam (Timeout).", ephemeral=True)
             return
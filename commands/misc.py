@@ -7,6 +7,8 @@ import os
 from dotenv import load_dotenv
 import logging
 from utils.wake_utils import power_on_server, is_server_online
+from utils.ssh_pool import ssh_pool
+from utils.mc_ping import mc_ping
 import subprocess
 
 load_dotenv()
@@ -30,10 +32,9 @@ DOCKER_CONTAINERS = [c.strip() for c in os.getenv("DOCKER_CONTAINERS", "minecraf
 # ======================================================
 async def run_ssh(command: str) -> str:
     try:
-        async with asyncssh.connect(MC_SERVER_HOST, username=MC_SERVER_USER) as conn:
-            result = await conn.run(command, check=True)
-            logger.info(f"SSH command executed: {command}")
-            return result.stdout
+        result = await ssh_pool.run(MC_SERVER_HOST, MC_SERVER_USER, command, check=True)
+        logger.info(f"SSH command executed: {command}")
+        return result.stdout
     except (asyncssh.Error, OSError) as e:
         logger.error(f"SSH error '{command}': {e}")
         return f"Fehler beim Ausführen des Commands: {e} ❌"
@@ -74,20 +75,26 @@ class Misc(commands.Cog):
         await interaction.response.defer()
 
         if action.value == "start":
-            if is_server_online():
+            wake = self.bot.get_cog("Wake")
+            if wake is not None:
+                return await wake.wake_with_progress(interaction)
+
+            if (MC_SERVER_HOST and await mc_ping.reachable(MC_SERVER_HOST)) or await is_server_online():
                 return await interaction.followup.send("Der Server läuft bereits! 🟢")
 
-            result = power_on_server()
+            result = await power_on_server()
             await interaction.followup.send(f"{result}")
 
         elif action.value == "shutdown":
             await interaction.followup.send("Fahre Server herunter… 🔻")
             output = await run_ssh("sudo shutdown -h now")
+            ssh_pool.invalidate(MC_SERVER_HOST, MC_SERVER_USER)
             await interaction.followup.send(f"**Ergebnis:**\n```\n{output}\n```")
 
         elif action.value == "restart":
             await interaction.followup.send("Starte Server neu… 🔄")
             output = await run_ssh("sudo reboot")
+            ssh_pool.invalidate(MC_SERVER_HOST, MC_SERVER_USER)
             await interaction.followup.send(f"**Ergebnis:**\n```\n{output}\n```")
 
 
@@ -154,6 +161,17 @@ class Misc(commands.Cog):
 
 
 
+    # --------------------------
+    # SSH POOL STATS
+    # --------------------------
+    @app_commands.command(name="sshpool", description="Zeigt Statistiken des geteilten SSH-Pools")
+    async def sshpool_cmd(self, interaction: discord.Interaction):
+        if MISC_ROLES["Server"] not in [role.name for role in interaction.user.roles]:
+            return await interaction.response.send_message("Du hast keine Berechtigung! 🔐", ephemeral=True)
+
+        lines = [f"{k}: {v}" for k, v in ssh_pool.stats.as_dict().items()]
+        await interaction.response.send_message("**SSH-Pool:**\n```\n" + "\n".join(lines) + "\n```", ephemeral=True)
+
     # --------------------------
     # DISCORD BOT SERVICE COMMAND
     # --------------------------
@@ -221,3 +239,4 @@ async def setup(bot: commands.Bot):
     bot.tree.add_command(cog.docker_cmd, guild=bot.guild)
     bot.tree.add_command(cog.purge_cmd, guild=bot.guild)
     bot.tree.add_command(cog.dcbot_cmd, guild=bot.guild)
+    bot.tree.add_command(cog.sshpool_cmd, guild=bot.guild)
@@ -0,0 +1,149 @@
+# online_history.py
+import discord
+from discord.ext import commands
+from discord import app_commands
+import asyncio
+import os
+import time
+from typing import Optional
+from dotenv import load_dotenv
+from utils.event_bus import event_bus, ServerLogEvent, PlayerCountChanged, MirrorStateChanged
+from utils.log_events import EventKind
+from utils.player_index import player_index
+from utils.sessions import SessionStore, OPEN, log_time
+
+# ------------------------- Load environment variables -------------------------
+load_dotenv()
+
+GUILD_ID = int(os.getenv("GUILD_ID"))
+# Abstand (Sekunden), in dem festgehalten wird, dass offene Sessions noch laufen
+SESSION_HEARTBEAT = int(os.getenv("MC_SESSION_HEARTBEAT", "60"))
+
+DAY = 86400
+# Zeitraum: (Sekunden, Anzahl Abschnitte der Verlaufskurve)
+PERIODS = {"day": (DAY, 24), "week": (7 * DAY, 28), "month": (30 * DAY, 30)}
+PERIOD_CHOICES = [
+    app_commands.Choice(name="Letzter Tag", value="day"),
+    app_commands.Choice(name="Letzte Woche", value="week"),
+    app_commands.Choice(name="Letzter Monat", value="month"),
+]
+BARS = " ▁▂▃▄▅▆▇█"
+
+
+def format_duration(seconds: float) -> str:
+    minutes = int(seconds // 60)
+    return f"{minutes // 60}h {minutes % 60:02d}m"
+
+
+def sparkline(values: list[float]) -> str:
+    peak = max(values) if values else 0
+    if peak <= 0:
+        return BARS[0] * len(values)
+    return "".join(BARS[min(len(BARS) - 1, round(v / peak * (len(BARS) - 1)))] for v in values)
+
+
+# ------------------------- Cog -------------------------
+class OnlineHistory(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        # Andere Cogs (AutoShutdown, Pre-Wake) fragen Aktivität direkt hier ab
+        self.store = SessionStore()
+        self._connected: set[str] = set()
+        self._events = event_bus.subscribe(ServerLogEvent, PlayerCountChanged, MirrorStateChanged, maxsize=512)
+        self.event_task = self.bot.loop.create_task(self.event_loop())
+        self.heartbeat_task = self.bot.loop.create_task(self.heartbeat_loop())
+
+    # ------------------------- Ereignisse -------------------------
+    def handle(self, item):
+        store = self.store
+        if isinstance(item, MirrorStateChanged):
+            if item.connected:
+                self._connected.add(item.server)
+            else:
+                self._connected.discard(item.server)
+                store.touch(item.server)
+            return
+
+        if isinstance(item, PlayerCountChanged):
+            # Nur eine direkt abgefragte Liste ist maßgeblich; Join/Leave kommen als eigene Ereignisse
+            if item.authoritative:
+                store.reconcile(item.server, set(item.players), item.ts)
+            return
+
+        event = item.event
+        # Nachgeholte Ereignisse tragen ihre echte Uhrzeit im Log-Präfix
+        ts = log_time(event.raw, item.ts) or item.ts
+        if event.kind is EventKind.JOIN:
+            store.open(item.server, event.player, ts)
+        elif event.kind is EventKind.LEAVE:
+            store.close(item.server, event.player, ts)
+        elif event.kind is EventKind.STOP:
+            store.close_all(item.server, ts)
+
+    async def event_loop(self):
+        async for item in self._events:
+            try:
+                self.handle(item)
+            except Exception as e:
+                print(f"[ERROR] Session-Tracker: {e}")
+
+    async def heartbeat_loop(self):
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            for server in self._connected:
+                self.store.touch(server)
+            await asyncio.sleep(SESSION_HEARTBEAT)
+
+    # ------------------------- /online_history command -------------------------
+    @app_commands.command(name="online_history", description="Zeigt, wann wer wie lange online war")
+    @app_commands.describe(period="Zeitraum", player="Nur diesen Spieler anzeigen")
+    @app_commands.choices(period=PERIOD_CHOICES)
+    async def online_history(self, interaction: discord.Interaction,
+                             period: Optional[app_commands.Choice[str]] = None, player: Optional[str] = None):
+        period_value = period.value if period else "day"
+        label = period.name if period else PERIOD_CHOICES[0].name
+        span, buckets = PERIODS[period_value]
+        now = time.time()
+        since = now - span
+        store = self.store
+
+        if player:
+            seconds = sum(store.playtime(since, now, player=player).values())
+            embed = discord.Embed(title=f"Online-Verlauf von {player} ({label})", color=discord.Color.blue())
+            embed.add_field(name="Spielzeit", value=format_duration(seconds), inline=True)
+            recent = [s for s in store.sessions_of(player, limit=50) if s.end > since][:8]
+            lines = []
+            for s in recent:
+                start = time.strftime("%d.%m. %H:%M", time.localtime(s.start))
+                end = "jetzt" if s.end == OPEN else time.strftime("%H:%M", time.localtime(s.end))
+                lines.append(f"{start} – {end} ({format_duration(min(s.end, now) - s.start)})")
+            embed.add_field(name="Sessions", value="\n".join(lines) or "Keine", inline=False)
+            await interaction.response.send_message(embed=embed)
+            return
+
+        curve = store.concurrency(since, now, buckets)
+        sessions = store.overlapping(since, now)
+        peak = max((store.online_at(max(s.start, since)) for s in sessions), default=0)
+        totals = sorted(store.playtime(since, now).items(), key=lambda kv: kv[1], reverse=True)
+
+        embed = discord.Embed(title=f"Online-Verlauf ({label})", color=discord.Color.blue())
+        embed.add_field(name="Spieler im Verlauf", value=f"`{sparkline(curve)}`", inline=False)
+        embed.add_field(name="Jetzt online", value=str(store.online_at(now)), inline=True)
+        embed.add_field(name="Maximal gleichzeitig", value=str(peak), inline=True)
+        embed.add_field(name="Sessions", value=str(len(sessions)), inline=True)
+        top = "\n".join(f"{i + 1}. {name} — {format_duration(sec)}" for i, (name, sec) in enumerate(totals[:10]))
+        embed.add_field(name="Spielzeit", value=top or "Niemand online gewesen", inline=False)
+        await interaction.response.send_message(embed=embed)
+
+    @online_history.autocomplete("player")
+    async def player_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [app_commands.Choice(name=n, value=n) for n in player_index.complete(current)]
+
+
+# ------------------------- Cog Setup -------------------------
+async def setup(bot: commands.Bot):
+    cog = OnlineHistory(bot)
+    await bot.add_cog(cog)
+
+    guild = discord.Object(id=GUILD_ID)
+    bot.tree.add_command(cog.online_history, guild=guild)
@@ -0,0 +1,121 @@
+# perf.py
+import discord
+from discord.ext import commands
+from discord import app_commands
+import asyncio
+import os
+import time
+from typing import Optional
+from dotenv import load_dotenv
+from utils.rcon import get_rcon
+from utils.event_bus import event_bus, ServerLogEvent
+from utils.log_events import EventKind
+from utils.perf_telemetry import PerfTelemetry, parse_mspt
+
+# ------------------------- Load environment variables -------------------------
+load_dotenv()
+
+GUILD_ID = int(os.getenv("GUILD_ID"))
+RCON_HOST = os.getenv("RCON_HOST", "127.0.0.1")
+RCON_PORT = int(os.getenv("RCON_PORT", "25575"))
+RCON_PASSWORD = os.getenv("RCON_PASSWORD", "")
+SERVER_IP = os.getenv("SERVER_IP", "127.0.0.1")
+# Abstand (Sekunden) zwischen zwei Tick-Messungen per RCON
+PERF_SAMPLE_INTERVAL = int(os.getenv("MC_PERF_SAMPLE_INTERVAL", "30"))
+
+# Reihenfolge, in der die Tick-Befehle probiert werden (Vanilla ≥ 1.20.3, dann Forge)
+TICK_COMMANDS = ["tick query", "forge tps"]
+
+PERIOD_CHOICES = [
+    app_commands.Choice(name="Letzte Stunde", value="hour"),
+    app_commands.Choice(name="Letzter Tag", value="day"),
+    app_commands.Choice(name="Letzte Woche", value="week"),
+]
+
+
+# ------------------------- Cog -------------------------
+class Perf(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.telemetry = PerfTelemetry()
+        self.tick_command: Optional[str] = None
+        # Letzter Messfehler, damit ein offline Server nicht alle 30s dasselbe loggt
+        self._sample_error: Optional[str] = None
+        self._events = event_bus.subscribe(ServerLogEvent, maxsize=64)
+        self.sample_task = self.bot.loop.create_task(self.sample_loop())
+        self.spike_task = self.bot.loop.create_task(self.spike_loop())
+
+    # ------------------------- Erfassung -------------------------
+    # Gemessen wird nur der Server hinter RCON_HOST/SERVER_IP, weitere Server des Chat-Mirrors nicht
+    async def sample_once(self) -> Optional[float]:
+        rcon = get_rcon(RCON_HOST, RCON_PORT, RCON_PASSWORD)
+        # Den zuletzt funktionierenden Befehl zuerst, die anderen nur falls er nichts Lesbares liefert
+        commands_to_try = [self.tick_command] if self.tick_command else TICK_COMMANDS
+        for command in commands_to_try:
+            mspt = parse_mspt(await rcon.command(command, timeout=10))
+            if mspt is not None:
+                self.tick_command = command
+                return mspt
+        self.tick_command = None
+        return None
+
+    async def sample_loop(self):
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            try:
+                mspt = await self.sample_once()
+                if mspt is not None:
+                    self.telemetry.record_mspt(mspt)
+            except Exception as e:
+                # Meist ist der Server nur offline: nächste Runde abwarten, jeden Fehler aber einmal melden
+                if str(e) != self._sample_error:
+                    print(f"[ERROR] Perf-Messung: {e}")
+                self._sample_error = str(e)
+            else:
+                self._sample_error = None
+            await asyncio.sleep(PERF_SAMPLE_INTERVAL)
+
+    async def spike_loop(self):
+        # "Can't keep up"-Zeilen kommen aus dem bereits laufenden Log-Stream des Chat-Mirrors
+        async for item in self._events:
+            if item.event.kind is not EventKind.LAG or item.replayed:
+                continue
+            if item.host not in (RCON_HOST, SERVER_IP):
+                continue
+            self.telemetry.record_spike(float(item.event.text), item.ts)
+
+    # ------------------------- /perf command -------------------------
+    @app_commands.command(name="perf", description="Zeigt Tick-Zeiten (MSPT) und Lag-Spitzen des Servers")
+    @app_commands.describe(period="Zeitraum (ohne Angabe: Stunde, Tag und Woche)")
+    @app_commands.choices(period=PERIOD_CHOICES)
+    async def perf(self, interaction: discord.Interaction, period: Optional[app_commands.Choice[str]] = None):
+        periods = [period] if period else PERIOD_CHOICES
+        embed = discord.Embed(title="Server-Performance", color=discord.Color.orange())
+
+        for choice in periods:
+            r = self.telemetry.report(choice.value)
+            if r["samples"]:
+                value = f"p50: `{r['p50']:.1f} ms`\np95: `{r['p95']:.1f} ms`\nMessungen: {r['samples']}"
+            else:
+                value = "Keine Messungen"
+            value += f"\nLag-Spitzen: {r['spikes']}"
+            if r["spikes"]:
+                value += f" (max. {r['worst_ms'] / 1000:.1f} s)"
+            embed.add_field(name=choice.name, value=value, inline=True)
+
+        if self.telemetry.last_mspt is not None:
+            age = int(time.time() - self.telemetry.last_sample_at)
+            embed.set_footer(text=f"Letzte Messung: {self.telemetry.last_mspt:.1f} ms vor {age}s via '{self.tick_command or '?'}'")
+        else:
+            embed.set_footer(text="Noch keine Tick-Messung (RCON nicht erreichbar oder Befehl nicht unterstützt)")
+
+        await interaction.response.send_message(embed=embed)
+
+
+# ------------------------- Cog Setup -------------------------
+async def setup(bot: commands.Bot):
+    cog = Perf(bot)
+    await bot.add_cog(cog)
+
+    guild = discord.Object(id=GUILD_ID)
+    bot.tree.add_command(cog.perf, guild=guild)
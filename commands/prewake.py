@@ -0,0 +1,205 @@
+# prewake.py
+import discord
+from discord.ext import commands
+from discord import app_commands
+import asyncio
+import os
+import time
+from typing import Optional
+from dotenv import load_dotenv
+from utils.activity_forecast import WeeklyForecast, PrewakeLog, Prewake, SLOT, slot_label
+from utils.mc_ping import mc_ping
+from utils.wake_utils import power_on_server
+
+# ------------------------- Load environment variables -------------------------
+load_dotenv()
+
+GUILD_ID = int(os.getenv("GUILD_ID"))
+MC_HOST = os.getenv("SERVER_IP", "192.168.188.150")
+# Name des Servers (wie im Chat-Mirror) auf MC_HOST; nur seine Sessions zählen für Vorhersage und Treffer
+PREWAKE_SERVER = os.getenv("MC_PREWAKE_SERVER", "minecraft1")
+PREWAKE_ENABLED = os.getenv("MC_PREWAKE", "1") == "1"
+# So viele Sekunden vor einer erwarteten Session wird eingeschaltet (≈ Bootdauer)
+PREWAKE_LEAD = int(os.getenv("MC_PREWAKE_LEAD", "600"))
+# Ab diesem Anteil der Wochen mit Session-Beginn in einer Viertelstunde wird vorab geweckt
+PREWAKE_THRESHOLD = float(os.getenv("MC_PREWAKE_THRESHOLD", "0.5"))
+PREWAKE_WEEKS = int(os.getenv("MC_PREWAKE_WEEKS", "6"))
+# So lange nach der vorhergesagten Zeit zählt ein Join noch als Treffer
+PREWAKE_WINDOW = int(os.getenv("MC_PREWAKE_WINDOW", "2700"))
+# Unter dieser Online-Wahrscheinlichkeit (nächste Stunde) gilt ein Zeitfenster als tot
+DEAD_THRESHOLD = float(os.getenv("MC_PREWAKE_DEAD", "0.1"))
+DEAD_LOOKAHEAD = 3600
+# Shutdown-Timeout in toten Zeitfenstern und nach einem Pre-Wake ohne Join
+DEAD_TIMEOUT = int(os.getenv("MC_PREWAKE_DEAD_TIMEOUT", "300"))
+PREWAKE_TICK = 60
+FORECAST_MAX_AGE = 3600
+
+ACTION_CHOICES = [
+    app_commands.Choice(name="Status", value="status"),
+    app_commands.Choice(name="Enable", value="enable"),
+    app_commands.Choice(name="Disable", value="disable"),
+]
+
+
+def format_duration(seconds: float) -> str:
+    minutes = int(seconds // 60)
+    return f"{minutes // 60}h {minutes % 60:02d}m"
+
+
+# ------------------------- Cog -------------------------
+class PreWake(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.enabled = PREWAKE_ENABLED
+        self.log = PrewakeLog()
+        self.forecast: Optional[WeeklyForecast] = None
+        self.task = self.bot.loop.create_task(self.prewake_loop())
+
+    @property
+    def store(self):
+        # Sessions führt der OnlineHistory-Cog
+        cog = self.bot.get_cog("OnlineHistory")
+        return cog.store if cog else None
+
+    def refresh_forecast(self, now: float) -> Optional[WeeklyForecast]:
+        if self.store is None:
+            return None
+        if self.forecast is None or now - self.forecast.built_at > FORECAST_MAX_AGE:
+            self.forecast = WeeklyForecast.build(self.store, PREWAKE_WEEKS, now, server=PREWAKE_SERVER)
+        return self.forecast
+
+    async def host_up(self) -> bool:
+        return await mc_ping.reachable(MC_HOST, 22) or await mc_ping.reachable(MC_HOST)
+
+    # ------------------------- Für AutoShutdown -------------------------
+    def timeout_for(self, host: str, base: int, now: Optional[float] = None) -> int:
+        """Shutdown-Timeout für ``host``: kürzer nach einem Pre-Wake ohne Join und in toten Zeitfenstern."""
+        now = now if now is not None else time.time()
+        if not self.enabled or host != MC_HOST or self.forecast is None:
+            return base
+        pending = self.log.pending
+        if pending is not None:
+            return int(min(base, max(DEAD_TIMEOUT, pending.predicted_at + PREWAKE_WINDOW - now)))
+        if self.forecast.online_chance(now, DEAD_LOOKAHEAD) < DEAD_THRESHOLD:
+            return min(base, DEAD_TIMEOUT)
+        return base
+
+    # ------------------------- Scheduler -------------------------
+    async def settle(self, entry: Prewake, now: float):
+        joins = [s.start for s in self.store.overlapping(entry.woke_at, now)
+                 if s.server == PREWAKE_SERVER and s.start >= entry.woke_at]
+        if joins:
+            entry.first_join = min(joins)
+            self.log.save()
+            print(f"[INFO] Pre-Wake Treffer: erster Join {int(entry.first_join - entry.woke_at)}s nach dem Einschalten")
+        elif now > entry.predicted_at + PREWAKE_WINDOW and not await self.host_up():
+            entry.down_at = now
+            self.log.save()
+            print(f"[INFO] Pre-Wake ohne Join, {format_duration(entry.wasted)} Laufzeit verschwendet")
+
+    async def tick(self):
+        now = time.time()
+        forecast = self.refresh_forecast(now)
+        if forecast is None:
+            return
+
+        pending = self.log.pending
+        if pending is not None:
+            await self.settle(pending, now)
+            return
+
+        if not self.enabled:
+            return
+        upcoming = forecast.next_start(now, PREWAKE_LEAD, PREWAKE_THRESHOLD)
+        if upcoming is None:
+            return
+        last = self.log.entries[-1] if self.log.entries else None
+        if last is not None and now - last.woke_at < PREWAKE_WINDOW:
+            return
+        if await self.host_up():
+            return
+
+        predicted_at, probability = upcoming
+        # Über den Wake-Cog, damit auch vorab geweckte Starts in die Boot-Zeiten eingehen
+        wake = self.bot.get_cog("Wake")
+        if wake is not None:
+            if wake.booting:
+                return
+            wake.start_server()
+            result = "Boot gestartet"
+        else:
+            result = await power_on_server()
+        print(f"[INFO] Pre-Wake für {slot_label(predicted_at)} ({probability:.0%}): {result}")
+        self.log.add(Prewake(woke_at=now, predicted_at=predicted_at, probability=probability))
+
+    async def prewake_loop(self):
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            try:
+                await self.tick()
+            except Exception as e:
+                print(f"[ERROR] Pre-Wake: {e}")
+            await asyncio.sleep(PREWAKE_TICK)
+
+    # ------------------------- /prewake command -------------------------
+    @app_commands.command(name="prewake", description="Vorhergesagte Spielzeiten und automatisches Einschalten")
+    @app_commands.describe(action="Aktion wählen")
+    @app_commands.choices(action=ACTION_CHOICES)
+    async def prewake(self, interaction: discord.Interaction, action: Optional[app_commands.Choice[str]] = None):
+        action_value = action.value if action else "status"
+        if action_value == "enable":
+            self.enabled = True
+            await interaction.response.send_message("Pre-Wake aktiviert. 🟩")
+            return
+        if action_value == "disable":
+            self.enabled = False
+            await interaction.response.send_message("Pre-Wake deaktiviert. 🟥")
+            return
+
+        now = time.time()
+        forecast = self.refresh_forecast(now)
+        if forecast is None or not forecast.weeks:
+            await interaction.response.send_message("Noch keine Sessions aufgezeichnet – keine Vorhersage möglich.")
+            return
+
+        # Aufeinanderfolgende Viertelstunden zu einem erwarteten Session-Beginn zusammenfassen
+        predictions = []
+        for ts, p in forecast.predicted_starts(now, 7 * 86400, PREWAKE_THRESHOLD):
+            if predictions and ts - predictions[-1][2] <= SLOT:
+                predictions[-1] = (predictions[-1][0], max(predictions[-1][1], p), ts)
+            else:
+                predictions.append((ts, p, ts))
+        lines = [f"{slot_label(ts)} ({p:.0%})" for ts, p, _ in predictions[:6]]
+
+        embed = discord.Embed(title="Pre-Wake", color=discord.Color.green() if self.enabled else discord.Color.dark_grey())
+        embed.add_field(name="Nächste erwartete Sessions", value="\n".join(lines) or "Keine", inline=False)
+
+        stats = self.log.stats(now - 30 * 86400)
+        if stats["prewakes"]:
+            hit_rate = f"{stats['hits']}/{stats['prewakes']} ({stats['hit_rate']:.0%})"
+            wasted = f"{format_duration(stats['wasted'])} (Ø {format_duration(stats['wasted'] / stats['prewakes'])})"
+        else:
+            hit_rate = wasted = "–"
+        embed.add_field(name="Trefferquote (30 Tage)", value=hit_rate, inline=True)
+        embed.add_field(name="Verschwendete Laufzeit", value=wasted, inline=True)
+
+        pending = self.log.pending
+        if pending is not None:
+            embed.add_field(name="Läuft", value=f"Eingeschaltet für {slot_label(pending.predicted_at)}", inline=False)
+        chance = forecast.online_chance(now, DEAD_LOOKAHEAD)
+        value = f"Online-Wahrscheinlichkeit {chance:.0%}"
+        if self.enabled and (pending is not None or chance < DEAD_THRESHOLD):
+            value += f", leerer Server wird schon nach {format_duration(self.timeout_for(MC_HOST, 10 ** 9, now))} heruntergefahren"
+        embed.add_field(name="Nächste Stunde", value=value, inline=False)
+        embed.set_footer(text=f"{'Aktiv' if self.enabled else 'Deaktiviert'} · Profil aus {forecast.weeks} Woche(n) · "
+                              f"Vorlauf {PREWAKE_LEAD // 60} min · Schwelle {PREWAKE_THRESHOLD:.0%}")
+        await interaction.response.send_message(embed=embed)
+
+
+# ------------------------- Cog Setup -------------------------
+async def setup(bot: commands.Bot):
+    cog = PreWake(bot)
+    await bot.add_cog(cog)
+
+    guild = discord.Object(id=GUILD_ID)
+    bot.tree.add_command(cog.prewake, guild=guild)
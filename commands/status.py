@@ -0,0 +1,62 @@
+# status.py
+import discord
+from discord.ext import commands
+from discord import app_commands
+import os
+from dotenv import load_dotenv
+from utils.mc_ping import mc_ping, DEFAULT_PORT
+
+# ------------------------- Load environment variables -------------------------
+load_dotenv()
+
+GUILD_ID = int(os.getenv("GUILD_ID"))
+SERVER_IP = os.getenv("SERVER_IP", "127.0.0.1")
+# "name=host:port,name=host:port" – alle Einträge werden gleichzeitig angepingt
+MC_STATUS_SERVERS = os.getenv("MC_STATUS_SERVERS", f"minecraft1={SERVER_IP}:{DEFAULT_PORT}")
+
+
+def parse_targets(spec: str) -> list[tuple[str, str, int]]:
+    targets = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, address = entry.rpartition("=")
+        host, _, port = address.partition(":")
+        targets.append((name or host, host, int(port) if port else DEFAULT_PORT))
+    return targets
+
+
+# ------------------------- Cog -------------------------
+class Status(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.targets = parse_targets(MC_STATUS_SERVERS)
+
+    # ------------------------- /status command -------------------------
+    @app_commands.command(name="status", description="Zeigt, welche Minecraft-Server online sind")
+    async def status(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        results = await mc_ping.status_many([(host, port) for _, host, port in self.targets])
+
+        embed = discord.Embed(title="Server-Status", color=discord.Color.green())
+        for (name, host, port), result in zip(self.targets, results):
+            if result is None:
+                value = "🔴 Offline"
+            else:
+                value = f"🟢 {result.online}/{result.max} Spieler · {result.version} · {result.latency_ms:.0f} ms"
+                if result.players:
+                    value += "\n" + ", ".join(result.players)
+            embed.add_field(name=name, value=value, inline=False)
+        embed.set_footer(text=" | ".join(f"{name}: {mc_ping.summary(host, port)}" for name, host, port in self.targets))
+
+        await interaction.followup.send(embed=embed)
+
+
+# ------------------------- Cog Setup -------------------------
+async def setup(bot: commands.Bot):
+    cog = Status(bot)
+    await bot.add_cog(cog)
+
+    guild = discord.Object(id=GUILD_ID)
+    bot.tree.add_command(cog.status, guild=guild)
@@ -3,17 +3,86 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+import asyncio
 import os
+import time
+from typing import Optional
 from dotenv import load_dotenv
 from utils.wake_utils import power_on_server, is_server_online
+from utils.mc_ping import mc_ping
+from utils.boot_tracker import BootTracker, BootLog, BootRun, BOOT_PHASES
 
 load_dotenv()
 GUILD_ID = int(os.getenv("GUILD_ID"))
+MC_HOST = os.getenv("SERVER_IP", "192.168.188.150")
+
+
+def render_boot(result: str, run: BootRun) -> str:
+    lines = [result]
+    for key, label in BOOT_PHASES:
+        if key in run.reached:
+            lines.append(f"✅ {label} ({int(run.reached[key])}s)")
+        elif key == run.failed:
+            lines.append(f"❌ {label} (Zeitüberschreitung)")
+        elif key == run.current and not run.failed:
+            lines.append(f"⏳ {label} … ({int(time.time() - run.started)}s)")
+        else:
+            lines.append(f"▫️ {label}")
+    if run.done:
+        lines.append(f"🟢 Server bereit nach {int(run.reached[BOOT_PHASES[-1][0]])}s")
+    return "\n".join(lines)
 
 
 class Wake(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.boot_log = BootLog()
+        self.boot_task: Optional[asyncio.Task] = None
+
+    @property
+    def booting(self) -> bool:
+        return self.boot_task is not None and not self.boot_task.done()
+
+    def start_server(self, message: Optional[discord.Message] = None) -> asyncio.Task:
+        """Schaltet den Server im Hintergrund ein und verfolgt den Boot (Fortschritt in ``message``)."""
+        self.boot_task = asyncio.create_task(self.boot(message))
+        return self.boot_task
+
+    async def boot(self, message: Optional[discord.Message]) -> str:
+        result = await power_on_server()
+
+        async def progress(run: BootRun):
+            if message is None:
+                return
+            try:
+                await message.edit(content=render_boot(result, run))
+            except discord.HTTPException as e:
+                print(f"[ERROR] Boot-Fortschritt: {e}")
+
+        try:
+            run = await BootTracker(MC_HOST).run(progress)
+        except Exception as e:
+            print(f"[ERROR] Boot-Verfolgung: {e}")
+            return result
+        self.boot_log.add(run)
+        phases = ", ".join(f"{key} {seconds:.0f}s" for key, seconds in run.durations().items())
+        print(f"[INFO] Boot {'abgebrochen bei ' + run.failed if run.failed else 'fertig'}: {phases}")
+        return result
+
+    async def wake_with_progress(self, interaction: discord.Interaction):
+        """Gemeinsamer Ablauf für /wake und /server start (Interaction muss bereits deferred sein)."""
+        if self.booting:
+            return await interaction.followup.send("Der Server startet bereits! ⏳")
+
+        # Antwortet Minecraft, muss der Rechner nicht extra angepingt werden
+        if await mc_ping.reachable(MC_HOST) or await is_server_online(MC_HOST):
+            return await interaction.followup.send("Der Server läuft bereits! 🟢")
+
+        message = await interaction.followup.send("Server wird eingeschaltet … ⏳", wait=True)
+        # Zwischen den Prüfungen oben kann ein zweiter Aufruf gestartet haben: nicht doppelt drücken
+        if self.booting:
+            return await message.edit(content="Der Server startet bereits! ⏳")
+        self.start_server(message)
 
     @app_commands.command(
         name="wake",
@@ -21,13 +90,22 @@ class Wake(commands.Cog):
     )
     async def wake(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=False)
-
-        if is_server_online():
-            return await interaction.followup.send("Der Server läuft bereits! 🟢")
-
-        result = power_on_server()
-
-        await interaction.followup.send(f"{result}")
+        await self.wake_with_progress(interaction)
+
+    @app_commands.command(name="boottimes", description="Zeigt, wie lange die einzelnen Boot-Phasen dauern")
+    async def boottimes(self, interaction: discord.Interaction):
+        stats = self.boot_log.stats()
+        if not stats:
+            return await interaction.response.send_message("Noch keine Bootvorgänge aufgezeichnet.")
+
+        embed = discord.Embed(title="Boot-Zeiten", color=discord.Color.green())
+        for key, label in BOOT_PHASES + [("total", "Gesamt")]:
+            if key in stats:
+                count, median, p90 = stats[key]
+                embed.add_field(name=label, value=f"Median `{median:.0f}s`\np90 `{p90:.0f}s`\n{count} Messungen", inline=True)
+        failed = sum(1 for run in self.boot_log.runs if run.failed)
+        embed.set_footer(text=f"Letzte {len(self.boot_log.runs)} Starts, {failed} mit Zeitüberschreitung")
+        await interaction.response.send_message(embed=embed)
 
     # async def cog_load(self):
     #     # Automatisch alle App-Commands des Cogs zur Guild hinzufügen
@@ -48,4 +126,5 @@ async def setup(bot: commands.Bot):
     await bot.add_cog(cog)
 
     guild = discord.Object(id=GUILD_ID)
-    bot.tree.add_command(cog.wake, guild=guild)
\ No newline at end of file
+    bot.tree.add_command(cog.wake, guild=guild)
+    bot.tree.add_command(cog.boottimes, guild=guild)
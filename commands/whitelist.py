@@ -2,9 +2,10 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from mcrcon import MCRcon
 import os
 from dotenv import load_dotenv
+from utils.rcon import get_rcon
+from utils.player_index import player_index, SortedNames
 
 load_dotenv()
 
@@ -20,15 +21,29 @@ class Whitelist(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.synced = False
+        self.whitelisted = SortedNames()
+        self.bot.loop.create_task(self.load_whitelist())
+
+    async def load_whitelist(self):
+        """Liest die aktuelle Whitelist einmal per RCON für das Autocomplete ein."""
+        await self.bot.wait_until_ready()
+        result = await self.run_rcon_command("whitelist list")
+        # "There are 3 whitelisted player(s): Alex, Steve, Notch"
+        _, sep, names = result.partition(":")
+        if not sep or result.startswith("Error"):
+            return
+        for name in (n.strip() for n in names.split(",")):
+            if name:
+                self.whitelisted.add(name)
+                player_index.absorb(name)
 
     # --------------------------
     # RCON helper
     # --------------------------
-    def run_rcon_command(self, command: str) -> str:
+    async def run_rcon_command(self, command: str) -> str:
         try:
-            with MCRcon(RCON_HOST, RCON_PASSWORD, port=RCON_PORT) as mcr:
-                resp = mcr.command(command)
-                return resp.strip() if resp else "Command erfolgreich ausgeführt. ✔️"
+            resp = await get_rcon(RCON_HOST, RCON_PORT, RCON_PASSWORD).command(command)
+            return resp.strip() if resp else "Command erfolgreich ausgeführt. ✔️"
         except Exception as e:
             return f"Error: {e} ❌"
 
@@ -70,23 +85,34 @@ class Whitelist(commands.Cog):
 
         # RCON Command bauen
         cmd = f"whitelist {action.value} {name}"
-        result = self.run_rcon_command(cmd)
+        result = await self.run_rcon_command(cmd)
         clean_result = result.lower()
 
         if "already whitelisted" in clean_result:
+            self.whitelisted.add(name)
             return await interaction.followup.send(f"`{name}` ist schon gewhitelistet ✅")
 
         if "not whitelisted" in clean_result:
             return await interaction.followup.send(f"`{name}` is not on the whitelist ❌")
 
         if action.value == "add" and ("added" in clean_result or "whitelisted" in clean_result):
+            self.whitelisted.add(name)
+            player_index.absorb(name)
             return await interaction.followup.send(f"`{name}` wurde erfolgreich gewhitelistet! ✨")
 
         if action.value == "remove" and ("removed" in clean_result):
+            self.whitelisted.discard(name)
             return await interaction.followup.send(f"`{name}` wurde von der Whitelist entfernt🗿")
 
         await interaction.followup.send(result)
 
+    @whitelist.autocomplete("name")
+    async def name_autocomplete(self, interaction: discord.Interaction, current: str):
+        # Beim Entfernen nur gewhitelistete Spieler vorschlagen, sonst alle bekannten Namen
+        action = getattr(interaction.namespace, "action", None)
+        source = self.whitelisted if action == "remove" else player_index
+        return [app_commands.Choice(name=n, value=n) for n in source.complete(current)]
+
     # --------------------------
     # Automatic guild registration
     # --------------------------
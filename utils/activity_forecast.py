@@ -0,0 +1,157 @@
+# utils/activity_forecast.py
+
+import json
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+from utils.sessions import SessionStore
+
+DATA_DIR = os.getenv("BOT_DATA_DIR", "data")
+
+WEEK = 7 * 86400
+SLOT = 900
+SLOTS_PER_WEEK = WEEK // SLOT
+WEEKDAYS = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
+
+
+def week_slot(ts: float) -> int:
+    """Viertelstunde der Woche (0 = Montag 00:00 Ortszeit)."""
+    t = time.localtime(ts)
+    return (t.tm_wday * 24 + t.tm_hour) * 4 + t.tm_min // 15
+
+
+def slot_start(ts: float) -> float:
+    t = time.localtime(ts)
+    return time.mktime((t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min - t.tm_min % 15, 0, 0, 0, -1))
+
+
+def slot_label(ts: float) -> str:
+    return f"{WEEKDAYS[time.localtime(ts).tm_wday]} {time.strftime('%H:%M', time.localtime(ts))}"
+
+
+class WeeklyForecast:
+    """Wochenprofil aus den Sessions der letzten Wochen.
+
+    Pro Viertelstunde der Woche: Anteil der Wochen, in denen dort eine Session
+    begann (``start``), bzw. in denen dort jemand online war (``online``).
+    Gezählt werden nur Wochen, für die es überhaupt schon Daten gibt.
+    """
+
+    def __init__(self, start: list[float], online: list[float], weeks: int, built_at: float):
+        self.start = start
+        self.online = online
+        self.weeks = weeks
+        self.built_at = built_at
+
+    @classmethod
+    def build(cls, store: SessionStore, weeks: int, now: Optional[float] = None,
+              server: Optional[str] = None) -> "WeeklyForecast":
+        now = now if now is not None else time.time()
+        sessions = [s for s in store.overlapping(now - weeks * WEEK, now) if not server or s.server == server]
+        first = min((s.start for s in sessions), default=now)
+        # Angebrochene erste Woche zählt mit, sonst wären neue Installationen lange blind
+        observed = max(1, min(weeks, int((now - first) // WEEK) + 1)) if sessions else 0
+
+        start_weeks = [set() for _ in range(SLOTS_PER_WEEK)]
+        online_weeks = [set() for _ in range(SLOTS_PER_WEEK)]
+        for s in sessions:
+            if s.start >= now - weeks * WEEK:
+                start_weeks[week_slot(s.start)].add(int((now - s.start) // WEEK))
+            t = slot_start(max(s.start, now - weeks * WEEK))
+            end = min(s.end, now)
+            while t < end:
+                online_weeks[week_slot(t)].add(int((now - t) // WEEK))
+                t += SLOT
+
+        def ratio(sets: list[set]) -> list[float]:
+            return [len(x) / observed if observed else 0.0 for x in sets]
+
+        return cls(ratio(start_weeks), ratio(online_weeks), observed, now)
+
+    def predicted_starts(self, since: float, horizon: float, threshold: float) -> list[tuple[float, float]]:
+        """(Zeitpunkt, Wahrscheinlichkeit) aller Viertelstunden im Fenster, in denen Sessions erwartet werden."""
+        result = []
+        t = slot_start(since)
+        while t < since + horizon:
+            p = self.start[week_slot(t)]
+            if p >= threshold and t + SLOT > since:
+                result.append((t, p))
+            t += SLOT
+        return result
+
+    def next_start(self, since: float, horizon: float, threshold: float) -> Optional[tuple[float, float]]:
+        starts = self.predicted_starts(since, horizon, threshold)
+        return starts[0] if starts else None
+
+    def online_chance(self, since: float, duration: float) -> float:
+        """Höchste Online-Wahrscheinlichkeit einer Viertelstunde im Fenster [since, since + duration)."""
+        t = slot_start(since)
+        chance = 0.0
+        while t < since + duration:
+            chance = max(chance, self.online[week_slot(t)])
+            t += SLOT
+        return chance
+
+
+@dataclass
+class Prewake:
+    woke_at: float
+    predicted_at: float
+    probability: float
+    # Erster Join nach dem Aufwecken (Treffer) bzw. Zeitpunkt, ab dem der Server wieder aus war (Fehlschlag)
+    first_join: Optional[float] = None
+    down_at: Optional[float] = None
+
+    @property
+    def settled(self) -> bool:
+        return self.first_join is not None or self.down_at is not None
+
+    @property
+    def wasted(self) -> float:
+        """Laufzeit ohne Spieler, die der Pre-Wake verursacht hat."""
+        end = self.first_join if self.first_join is not None else self.down_at
+        return max(0.0, (end if end is not None else time.time()) - self.woke_at)
+
+
+class PrewakeLog:
+    """Die letzten ``keep`` Pre-Wakes als JSON, für Trefferquote und verschwendete Laufzeit."""
+
+    def __init__(self, path: Optional[str] = None, keep: int = 200):
+        self.path = path or os.path.join(DATA_DIR, "prewake.json")
+        self.keep = keep
+        self.entries: list[Prewake] = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = [Prewake(**entry) for entry in json.load(f)]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[ERROR] Pre-Wake-Log {self.path} konnte nicht geladen werden: {e}")
+
+    def add(self, entry: Prewake):
+        self.entries = (self.entries + [entry])[-self.keep:]
+        self.save()
+
+    @property
+    def pending(self) -> Optional[Prewake]:
+        last = self.entries[-1] if self.entries else None
+        return last if last is not None and not last.settled else None
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([asdict(e) for e in self.entries], f)
+        os.replace(tmp, self.path)
+
+    def stats(self, since: float) -> dict:
+        recent = [e for e in self.entries if e.woke_at >= since and e.settled]
+        hits = [e for e in recent if e.first_join is not None]
+        return {
+            "prewakes": len(recent),
+            "hits": len(hits),
+            "hit_rate": len(hits) / len(recent) if recent else None,
+            "wasted": sum(e.wasted for e in recent),
+        }
@@ -0,0 +1,152 @@
+# utils/boot_tracker.py
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Awaitable, Callable, Optional
+
+from utils.mc_ping import mc_ping, PingError, DEFAULT_PORT
+from utils.wake_utils import is_server_online
+
+DATA_DIR = os.getenv("BOT_DATA_DIR", "data")
+BOOT_TIMEOUT = int(os.getenv("MC_BOOT_TIMEOUT", "600"))
+BOOT_POLL_INTERVAL = float(os.getenv("MC_BOOT_POLL_INTERVAL", "2"))
+
+# Reihenfolge der Boot-Phasen: (Schlüssel, Anzeigename)
+BOOT_PHASES = [
+    ("icmp", "Rechner antwortet auf Ping"),
+    ("ssh", "SSH erreichbar"),
+    ("mc_port", "Minecraft-Port offen"),
+    ("status", "Status-Ping meldet Spieler"),
+]
+
+
+@dataclass
+class BootRun:
+    started: float
+    # Sekunden seit ``started``, zu denen die jeweilige Phase erreicht wurde
+    reached: dict[str, float] = field(default_factory=dict)
+    failed: Optional[str] = None
+
+    @property
+    def current(self) -> Optional[str]:
+        for key, _ in BOOT_PHASES:
+            if key not in self.reached:
+                return key
+        return None
+
+    @property
+    def done(self) -> bool:
+        return self.current is None
+
+    def durations(self) -> dict[str, float]:
+        """Dauer jeder erreichten Phase für sich (Differenz zur vorherigen)."""
+        result = {}
+        previous = 0.0
+        for key, _ in BOOT_PHASES:
+            if key not in self.reached:
+                break
+            result[key] = self.reached[key] - previous
+            previous = self.reached[key]
+        return result
+
+
+class BootTracker:
+    """Verfolgt einen Bootvorgang Phase für Phase und meldet jeden Fortschritt.
+
+    Geprüft werden in jeder Runde alle noch offenen Phasen gleichzeitig, damit
+    z. B. ein gefiltertes ICMP den Rest nicht aufhält.
+    """
+
+    def __init__(self, host: str, mc_port: int = DEFAULT_PORT, ssh_port: int = 22,
+                 timeout: float = BOOT_TIMEOUT, interval: float = BOOT_POLL_INTERVAL):
+        self.host = host
+        self.mc_port = mc_port
+        self.ssh_port = ssh_port
+        self.timeout = timeout
+        self.interval = interval
+
+    async def check(self, phase: str) -> bool:
+        if phase == "icmp":
+            return await is_server_online(self.host, log=False)
+        if phase == "ssh":
+            return await mc_ping.reachable(self.host, self.ssh_port)
+        if phase == "mc_port":
+            return await mc_ping.reachable(self.host, self.mc_port)
+        try:
+            await mc_ping.status(self.host, self.mc_port)
+            return True
+        except PingError:
+            return False
+
+    async def run(self, on_progress: Optional[Callable[[BootRun], Awaitable[None]]] = None,
+                  report_every: float = 10.0) -> BootRun:
+        """Wartet Phase für Phase; ``on_progress`` wird bei jedem Phasenwechsel und sonst alle ``report_every`` Sekunden gerufen."""
+        run = BootRun(started=time.time())
+        keys = [key for key, _ in BOOT_PHASES]
+        last_report = 0.0
+        while not run.done:
+            now = time.time()
+            if now - run.started > self.timeout:
+                run.failed = run.current
+                break
+            if on_progress and now - last_report >= report_every:
+                await on_progress(run)
+                last_report = now
+
+            candidates = keys[keys.index(run.current):]
+            results = await asyncio.gather(*(self.check(key) for key in candidates))
+            if any(results):
+                # Eine spätere Phase schließt alle früheren ein
+                reached_at = time.time() - run.started
+                last = max(i for i, ok in enumerate(results) if ok)
+                for key in candidates[:last + 1]:
+                    run.reached[key] = reached_at
+                last_report = 0.0
+                continue
+            await asyncio.sleep(self.interval)
+
+        if on_progress:
+            await on_progress(run)
+        return run
+
+
+def _quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class BootLog:
+    """Die letzten ``keep`` Bootvorgänge als JSON, für Phasen-Latenzen."""
+
+    def __init__(self, path: Optional[str] = None, keep: int = 50):
+        self.path = path or os.path.join(DATA_DIR, "boot_times.json")
+        self.keep = keep
+        self.runs: list[BootRun] = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.runs = [BootRun(**entry) for entry in json.load(f)]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[ERROR] Boot-Log {self.path} konnte nicht geladen werden: {e}")
+
+    def add(self, run: BootRun):
+        self.runs = (self.runs + [run])[-self.keep:]
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in self.runs], f)
+        os.replace(tmp, self.path)
+
+    def stats(self) -> dict[str, tuple[int, float, float]]:
+        """Pro Phase (und "total"): (Anzahl, Median, p90) der Dauer in Sekunden."""
+        samples: dict[str, list[float]] = {}
+        for run in self.runs:
+            for key, seconds in run.durations().items():
+                samples.setdefault(key, []).append(seconds)
+            if run.done and not run.failed:
+                samples.setdefault("total", []).append(run.reached[BOOT_PHASES[-1][0]])
+        return {key: (len(v), _quantile(v, 0.5), _quantile(v, 0.9)) for key, v in samples.items()}
@@ -0,0 +1,134 @@
+# utils/discord_queue.py
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, Optional
+
+MAX_MESSAGE_CHARS = 2000
+
+
+class TokenBucket:
+    """Lokaler Rate-Limiter: ``rate`` Nachrichten pro ``per`` Sekunden."""
+
+    def __init__(self, rate: int = 5, per: float = 5.0):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+
+    async def acquire(self):
+        self._refill()
+        while self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) * self.per / self.rate)
+            self._refill()
+        self.tokens -= 1
+
+
+@dataclass
+class QueueStats:
+    enqueued: int = 0
+    dropped: int = 0
+    batches: int = 0
+    lines_sent: int = 0
+    last_batch: int = 0
+    max_depth: int = 0
+    send_errors: int = 0
+
+    def as_dict(self, depth: int) -> dict:
+        return {
+            "depth": depth,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "avg_batch": round(self.lines_sent / self.batches, 2) if self.batches else 0.0,
+            "last_batch": self.last_batch,
+            "send_errors": self.send_errors,
+        }
+
+
+class CoalescingSender:
+    """Begrenzte Warteschlange zwischen Log-Leser und Discord.
+
+    ``put`` blockiert nie: Ist die Schlange voll, wird die älteste Zeile verworfen
+    und gezählt. Der Sender-Task fasst wartende Zeilen mit gleichem ``key`` zu
+    mehrzeiligen Nachrichten bis 2000 Zeichen zusammen und hält das Rate-Limit ein.
+    """
+
+    def __init__(self, send: Callable[[Optional[Hashable], str], Awaitable[None]], maxsize: int = 500,
+                 rate: int = 5, per: float = 5.0, linger: float = 0.25, max_chars: int = MAX_MESSAGE_CHARS):
+        self.send = send
+        self.maxsize = maxsize
+        self.linger = linger
+        self.max_chars = max_chars
+        self.bucket = TokenBucket(rate, per)
+        self.stats = QueueStats()
+        self._items: deque[tuple[Optional[Hashable], str]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    def put(self, text: str, key: Optional[Hashable] = None):
+        if len(text) > self.max_chars:
+            text = text[:self.max_chars - 1] + "…"
+        if len(self._items) >= self.maxsize:
+            self._items.popleft()
+            self.stats.dropped += 1
+        self._items.append((key, text))
+        self.stats.enqueued += 1
+        self.stats.max_depth = max(self.stats.max_depth, len(self._items))
+        self._wakeup.set()
+
+    def _next_batch(self) -> tuple[Optional[Hashable], str, int]:
+        key, text = self._items.popleft()
+        lines = 1
+        while self._items:
+            next_key, next_text = self._items[0]
+            if next_key != key or len(text) + 1 + len(next_text) > self.max_chars:
+                break
+            self._items.popleft()
+            text += "\n" + next_text
+            lines += 1
+        return key, text, lines
+
+    async def run(self):
+        while True:
+            if not self._items:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                # Kurz warten, damit zusammengehörige Zeilen gemeinsam rausgehen
+                await asyncio.sleep(self.linger)
+
+            await self.bucket.acquire()
+            key, text, lines = self._next_batch()
+            try:
+                await self.send(key, text)
+            except Exception as e:
+                self.stats.send_errors += 1
+                print(f"[WARN] Senden an Discord fehlgeschlagen: {e}")
+                continue
+            self.stats.batches += 1
+            self.stats.lines_sent += lines
+            self.stats.last_batch = lines
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def summary(self) -> str:
+        return ", ".join(f"{k}={v}" for k, v in self.stats.as_dict(self.depth).items())
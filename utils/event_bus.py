@@ -0,0 +1,115 @@
+# utils/event_bus.py
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from utils.log_events import LogEvent
+
+
+# ------------------------- Ereignistypen -------------------------
+@dataclass(frozen=True)
+class ServerLogEvent:
+    """Ein klassifiziertes Log-Ereignis eines gespiegelten Servers."""
+    server: str
+    host: str
+    event: LogEvent
+    # True für Ereignisse, die nach einem Neustart aus dem Log nachgeholt wurden
+    replayed: bool = False
+    ts: float = field(default_factory=time.time)
+
+
+@dataclass(frozen=True)
+class PlayerCountChanged:
+    """Die Spielerzahl eines Servers hat sich geändert (aus Join/Leave oder RCON ``list``)."""
+    server: str
+    host: str
+    online: int
+    players: frozenset = frozenset()
+    # True, wenn die Liste direkt vom Server stammt (RCON "list") statt aus Join/Leave fortgeschrieben
+    authoritative: bool = False
+    ts: float = field(default_factory=time.time)
+
+
+@dataclass(frozen=True)
+class MirrorStateChanged:
+    """Der Log-Stream eines Servers wurde verbunden bzw. getrennt.
+
+    Solange ein Stream verbunden ist, kommen Spielerzahl-Änderungen per Push;
+    Abonnenten können ihr eigenes Polling dann zurückfahren.
+    """
+    server: str
+    host: str
+    connected: bool
+    ts: float = field(default_factory=time.time)
+
+
+# ------------------------- Bus -------------------------
+class Subscription:
+    """Begrenzte Warteschlange eines Abonnenten. Läuft sie voll, fällt das älteste Ereignis weg."""
+
+    def __init__(self, bus: "EventBus", types: tuple[type, ...], maxsize: int):
+        self.bus = bus
+        self.types = types
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def _offer(self, event):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None):
+        """Wartet auf das nächste Ereignis; mit ``timeout`` wird bei Ablauf None zurückgegeben."""
+        if timeout is None:
+            return await self.queue.get()
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            return None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """In-Process Publish/Subscribe nach Ereignistyp.
+
+    ``publish`` blockiert nie: Jeder Abonnent hat eine eigene begrenzte Warteschlange,
+    ein langsamer Abonnent verliert nur seine eigenen ältesten Ereignisse.
+    """
+
+    def __init__(self):
+        self._subscriptions: list[Subscription] = []
+        self.published = 0
+
+    def subscribe(self, *types: type, maxsize: int = 256) -> Subscription:
+        sub = Subscription(self, types, maxsize)
+        self._subscriptions.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        if sub in self._subscriptions:
+            self._subscriptions.remove(sub)
+
+    def publish(self, event):
+        self.published += 1
+        for sub in self._subscriptions:
+            if isinstance(event, sub.types):
+                sub._offer(event)
+
+    def summary(self) -> str:
+        dropped = sum(sub.dropped for sub in self._subscriptions)
+        return f"published={self.published}, subscribers={len(self._subscriptions)}, dropped={dropped}"
+
+
+# Geteilte Instanz: ChatMirror veröffentlicht, beliebige Cogs abonnieren
+event_bus = EventBus()
@@ -0,0 +1,106 @@
+# utils/leaderboard.py
+
+import heapq
+from array import array
+from typing import Optional
+
+from utils.stat_metrics import REGISTRY, MetricRegistry
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Leaderboard:
+    """Spaltenbasierte Rangliste über alle Spieler und alle Kategorien.
+
+    ``build`` lädt alle Stats einmal in eine Spieler × Metrik-Matrix und rechnet
+    alle Kategorien der Registry in einem Durchlauf um. Das Ergebnis bleibt
+    gecacht, bis sich die ``generation`` des Stats-Index ändert.
+    """
+
+    def __init__(self, registry: MetricRegistry = REGISTRY):
+        self.registry = registry
+        self.generation: Optional[int] = None
+        self.uuids: list[str] = []
+        self.raw_rows: dict[str, list] = {}
+        self._row: dict[str, int] = {}
+        self._columns: dict[str, object] = {}
+        self._top_cache: dict[tuple[str, int], list[tuple[str, float]]] = {}
+
+    def build(self, docs: dict[str, dict], generation: int):
+        if generation == self.generation:
+            return
+
+        uuids = []
+        rows = []
+        raw_row = self.registry.raw_row
+        for uuid, data in docs.items():
+            if not data or "stats" not in data:
+                continue
+            uuids.append(uuid)
+            rows.append(raw_row(data["stats"]))
+
+        self.load_rows(uuids, rows, generation)
+
+    def load_rows(self, uuids: list[str], rows: list, generation: int):
+        """Übernimmt bereits extrahierte Rohwerte (eine Zeile pro Spieler in Registry-Reihenfolge)."""
+        names = self.registry.names
+        if np is not None:
+            matrix = np.array(rows, dtype=np.float64).reshape(len(rows), len(names))
+            matrix *= np.array(self.registry.scales, dtype=np.float64)
+            columns = {}
+            for i, name in enumerate(names):
+                col = matrix[:, i]
+                for divisor in self.registry.divisors[i]:
+                    col = col / divisor
+                digits = self.registry.step_digits[i]
+                inv = self.registry.inv_steps[i]
+                if digits is not None:
+                    # np.round(col, n) rundet über col * 10**n und weicht an Grenzen von round() ab
+                    col = np.array([round(v, digits) for v in col.tolist()], dtype=np.float64)
+                elif inv:
+                    col = np.round(col * inv) / inv
+                columns[name] = col
+        else:
+            columns = {
+                name: array("d", (self.registry.transform(i, row[i]) for row in rows))
+                for i, name in enumerate(names)
+            }
+
+        self.uuids = uuids
+        self.raw_rows = dict(zip(uuids, rows))
+        self._row = {uuid: i for i, uuid in enumerate(uuids)}
+        self._columns = columns
+        self._top_cache = {}
+        self.generation = generation
+
+    def top(self, metric: str, k: int) -> list[tuple[str, float]]:
+        """Top-k (uuid, wert) einer Kategorie, absteigend sortiert."""
+        k = max(0, min(k, len(self.uuids)))
+        key = (metric, k)
+        if key in self._top_cache:
+            return self._top_cache[key]
+
+        col = self._columns[metric]
+        if k == 0:
+            result = []
+        elif np is not None:
+            # argpartition statt vollständiger Sortierung, nur die k Besten werden sortiert
+            idx = np.argpartition(-col, k - 1)[:k] if k < len(col) else np.arange(len(col))
+            idx = idx[np.argsort(-col[idx], kind="stable")]
+            result = [(self.uuids[i], float(col[i])) for i in idx]
+        else:
+            idx = heapq.nlargest(k, range(len(col)), key=col.__getitem__)
+            result = [(self.uuids[i], col[i]) for i in idx]
+
+        self._top_cache[key] = result
+        return result
+
+    def values(self, uuid: str) -> Optional[dict[str, float]]:
+        """Alle Kategorien eines Spielers."""
+        i = self._row.get(uuid)
+        if i is None:
+            return None
+        return {name: float(col[i]) for name, col in self._columns.items()}
@@ -0,0 +1,262 @@
+# utils/log_archive.py
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Iterable, Optional
+
+from utils.log_events import EventKind, LogEvent, classify
+
+DATA_DIR = os.getenv("BOT_DATA_DIR", "data")
+
+# Rotierte Logs heißen "2026-10-17-1.log.gz"
+ARCHIVE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})-\d+\.log\.gz$")
+WORD_RE = re.compile(r"\w{2,}")
+
+
+# ------------------------- Postings -------------------------
+def encode_postings(lines: Iterable[int]) -> bytes:
+    """Aufsteigende Zeilennummern als Delta-Varints (meist 1 Byte pro Eintrag)."""
+    out = bytearray()
+    previous = 0
+    for line in lines:
+        delta = line - previous
+        previous = line
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(blob: bytes) -> list[int]:
+    lines = []
+    value = shift = previous = 0
+    for byte in blob:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        lines.append(previous)
+        value = shift = 0
+    return lines
+
+
+def event_terms(event: LogEvent) -> set[str]:
+    """Index-Begriffe eines Ereignisses: Art, Spieler und Wörter des Textes."""
+    terms = {f"k:{event.kind.value}", f"p:{event.player.lower()}"}
+    if event.kind is not EventKind.JOIN and event.kind is not EventKind.LEAVE:
+        terms.update(f"w:{w}" for w in WORD_RE.findall(event.text.lower()))
+    return terms
+
+
+def query_terms(player: Optional[str] = None, kind: Optional[str] = None, text: str = "") -> list[str]:
+    terms = []
+    if kind:
+        terms.append(f"k:{kind}")
+    if player:
+        terms.append(f"p:{player.lower()}")
+    terms.extend(f"w:{w}" for w in WORD_RE.findall(text.lower()))
+    return terms
+
+
+# ------------------------- Gzip-Stream -------------------------
+class GzipLineDecoder:
+    """Entpackt einen gzip-Stream stückweise und liefert vollständige Zeilen."""
+
+    def __init__(self):
+        self._inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._rest = b""
+
+    def feed(self, chunk: bytes) -> list[str]:
+        data = self._inflate.decompress(chunk)
+        # Mehrere gzip-Member hintereinander (z. B. angehängte Logs)
+        while self._inflate.unused_data:
+            unused = self._inflate.unused_data
+            self._inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            data += self._inflate.decompress(unused)
+        return self._split(data)
+
+    def finish(self) -> list[str]:
+        lines = self._split(self._inflate.flush())
+        if self._rest:
+            lines.append(self._rest.decode(errors="ignore"))
+            self._rest = b""
+        return lines
+
+    def _split(self, data: bytes) -> list[str]:
+        if not data:
+            return []
+        parts = (self._rest + data).split(b"\n")
+        self._rest = parts.pop()
+        return [p.decode(errors="ignore").rstrip("\r") for p in parts]
+
+
+def archive_day(name: str) -> Optional[float]:
+    """Tagesbeginn (lokale Zeit) aus dem Dateinamen eines rotierten Logs."""
+    m = ARCHIVE_RE.search(name)
+    if not m:
+        return None
+    return time.mktime(time.strptime(m.group(1), "%Y-%m-%d"))
+
+
+def line_time(day: float, line: str) -> float:
+    if len(line) > 9 and line[0] == "[" and line[3] == ":" and line[6] == ":":
+        try:
+            return day + int(line[1:3]) * 3600 + int(line[4:6]) * 60 + int(line[7:9])
+        except ValueError:
+            pass
+    return day
+
+
+# ------------------------- Index -------------------------
+class ArchiveBuilder:
+    """Sammelt die Ereignisse einer Archivdatei, während sie gestreamt wird."""
+
+    def __init__(self, day: float):
+        self.day = day
+        self.line_no = 0
+        self.events: list[tuple[int, float, LogEvent]] = []
+        self.postings: dict[str, list[int]] = {}
+
+    def feed(self, lines: list[str]):
+        for line in lines:
+            self.line_no += 1
+            event = classify(line.strip())
+            if event is None or event.kind in (EventKind.UUID, EventKind.LAG, EventKind.STOP):
+                continue
+            self.events.append((self.line_no, line_time(self.day, line), event))
+            for term in event_terms(event):
+                self.postings.setdefault(term, []).append(self.line_no)
+
+
+class LogArchiveIndex:
+    """Invertierter Index über die rotierten Server-Logs.
+
+    Pro Archivdatei wird jeder Begriff (Ereignisart, Spieler, Wort) auf die Liste
+    der Zeilennummern abgebildet, delta-kodiert in einem Blob. Gespeichert werden
+    nur Ereigniszeilen; eine Suche schneidet die Postings der Begriffe und lädt
+    danach nur die Treffer aus der Ereignistabelle.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(DATA_DIR, "log_archive.sqlite3")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        # Suchen laufen per asyncio.to_thread, Schreibzugriffe in der Event-Loop: ein Lock für beide
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, size INTEGER NOT NULL, "
+            "day REAL NOT NULL, lines INTEGER NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "term TEXT NOT NULL, file_id INTEGER NOT NULL, lines BLOB NOT NULL, PRIMARY KEY (term, file_id))"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "file_id INTEGER NOT NULL, line INTEGER NOT NULL, ts REAL NOT NULL, kind TEXT NOT NULL, "
+            "player TEXT NOT NULL, text TEXT NOT NULL, PRIMARY KEY (file_id, line))"
+        )
+        self.db.commit()
+
+    def known(self) -> dict[str, int]:
+        """{Dateiname: Größe} aller bereits indexierten Archive."""
+        with self._lock:
+            return {name: size for name, size in self.db.execute("SELECT name, size FROM files")}
+
+    def add_file(self, name: str, size: int, builder: ArchiveBuilder):
+        with self._lock:
+            self._add_file(name, size, builder)
+
+    def _add_file(self, name: str, size: int, builder: ArchiveBuilder):
+        row = self.db.execute("SELECT id FROM files WHERE name = ?", (name,)).fetchone()
+        if row:
+            self.db.execute("DELETE FROM postings WHERE file_id = ?", row)
+            self.db.execute("DELETE FROM events WHERE file_id = ?", row)
+            self.db.execute("DELETE FROM files WHERE id = ?", row)
+        file_id = self.db.execute(
+            "INSERT INTO files (name, size, day, lines) VALUES (?, ?, ?, ?)",
+            (name, size, builder.day, builder.line_no),
+        ).lastrowid
+        self.db.executemany(
+            "INSERT INTO postings (term, file_id, lines) VALUES (?, ?, ?)",
+            ((term, file_id, encode_postings(lines)) for term, lines in builder.postings.items()),
+        )
+        self.db.executemany(
+            "INSERT INTO events (file_id, line, ts, kind, player, text) VALUES (?, ?, ?, ?, ?, ?)",
+            ((file_id, line, ts, e.kind.value, e.player, e.text) for line, ts, e in builder.events),
+        )
+        self.db.commit()
+
+    def search(self, terms: list[str], since: Optional[float] = None, limit: int = 20) -> tuple[int, list[tuple]]:
+        """Findet Ereignisse, die alle Begriffe enthalten (neueste zuerst).
+
+        Gibt (Gesamtzahl der Treffer, [(ts, kind, player, text), ...]) zurück.
+        Blockiert – aus der Event-Loop per ``asyncio.to_thread`` aufrufen.
+        """
+        if not terms:
+            return 0, []
+        with self._lock:
+            return self._search(terms, since, limit)
+
+    def _search(self, terms: list[str], since: Optional[float], limit: int) -> tuple[int, list[tuple]]:
+        query = "SELECT id FROM files" + (" WHERE day >= ?" if since is not None else "") + " ORDER BY day DESC, id DESC"
+        # Tagesgenau vorfiltern; die genaue Zeitgrenze prüft die Ereignistabelle
+        day_since = since - 86400 if since is not None else None
+        file_ids = [fid for fid, in self.db.execute(query, (day_since,) if since is not None else ())]
+
+        self.db.execute("CREATE TEMP TABLE IF NOT EXISTS hit_lines (line INTEGER PRIMARY KEY)")
+        ts_filter = " AND e.ts >= ?" if since is not None else ""
+        ts_args = (since,) if since is not None else ()
+        rows = []
+        total = 0
+        for file_id in file_ids:
+            matched: Optional[set[int]] = None
+            blobs = []
+            for term in terms:
+                row = self.db.execute(
+                    "SELECT lines FROM postings WHERE term = ? AND file_id = ?", (term, file_id)).fetchone()
+                if row is None:
+                    blobs = None
+                    break
+                blobs.append(row[0])
+            if not blobs:
+                continue
+            # Seltenste Begriffe (kürzeste Postings) zuerst, damit die Schnittmenge schnell klein wird
+            for blob in sorted(blobs, key=len):
+                lines = decode_postings(blob)
+                matched = set(lines) if matched is None else matched.intersection(lines)
+                if not matched:
+                    break
+            if not matched:
+                continue
+
+            # Treffer einer Datei mit je einer Abfrage zählen und laden (Join über eine Temp-Tabelle)
+            self.db.execute("DELETE FROM hit_lines")
+            self.db.executemany("INSERT INTO hit_lines (line) VALUES (?)", ((line,) for line in matched))
+            join = "FROM hit_lines h JOIN events e ON e.file_id = ? AND e.line = h.line" + ts_filter
+            count, = self.db.execute(f"SELECT COUNT(*) {join}", (file_id, *ts_args)).fetchone()
+            total += count
+            if count and len(rows) < limit:
+                rows.extend(self.db.execute(
+                    f"SELECT e.ts, e.kind, e.player, e.text {join} ORDER BY e.line DESC LIMIT ?",
+                    (file_id, *ts_args, limit - len(rows))))
+        self.db.execute("DELETE FROM hit_lines")
+        return total, rows
+
+    def summary(self) -> str:
+        with self._lock:
+            files, lines = self.db.execute("SELECT COUNT(*), COALESCE(SUM(lines), 0) FROM files").fetchone()
+            events, = self.db.execute("SELECT COUNT(*) FROM events").fetchone()
+            terms, = self.db.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()
+        return f"{files} Archive, {lines} Zeilen, {events} Ereignisse, {terms} Begriffe"
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,75 @@
+# utils/log_cursor.py
+
+import json
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+DATA_DIR = os.getenv("BOT_DATA_DIR", "data")
+
+
+@dataclass
+class LogCursor:
+    """Lese-Position in einer Remote-Logdatei (identifiziert über die Inode)."""
+    inode: int
+    offset: int
+    ts: float = 0.0
+
+
+class LogCursorStore:
+    """Persistiert Log-Positionen als kleine JSON-Datei.
+
+    ``advance`` wird pro Zeile aufgerufen und ist billig; geschrieben wird höchstens
+    alle ``flush_interval`` Sekunden (und beim expliziten ``flush``).
+    """
+
+    def __init__(self, path: Optional[str] = None, flush_interval: float = 5.0):
+        self.path = path or os.path.join(DATA_DIR, "log_cursors.json")
+        self.flush_interval = flush_interval
+        self._cursors: dict[str, LogCursor] = {}
+        self._dirty = False
+        self._last_flush = 0.0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._cursors = {key: LogCursor(**value) for key, value in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[WARN] Log-Positionen konnten nicht gelesen werden: {e}")
+
+    def get(self, key: str) -> Optional[LogCursor]:
+        return self._cursors.get(key)
+
+    def set(self, key: str, inode: int, offset: int):
+        self._cursors[key] = LogCursor(inode, offset, time.time())
+        self._dirty = True
+        self.maybe_flush()
+
+    def advance(self, key: str, nbytes: int):
+        cursor = self._cursors.get(key)
+        if cursor is None:
+            return
+        cursor.offset += nbytes
+        cursor.ts = time.time()
+        self._dirty = True
+        self.maybe_flush()
+
+    def maybe_flush(self):
+        if self._dirty and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({key: asdict(c) for key, c in self._cursors.items()}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[WARN] Log-Positionen konnten nicht gespeichert werden: {e}")
+            return
+        self._dirty = False
+        self._last_flush = time.monotonic()
@@ -0,0 +1,84 @@
+# utils/log_events.py
+
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+class EventKind(str, Enum):
+    CHAT = "chat"
+    JOIN = "join"
+    LEAVE = "leave"
+    DEATH = "death"
+    ADVANCEMENT = "advancement"
+    UUID = "uuid"
+    LAG = "lag"
+    STOP = "stop"
+
+
+@dataclass(frozen=True)
+class LogEvent:
+    kind: EventKind
+    player: str
+    # Chat-Nachricht, Advancement-Name, vollständige Todesnachricht, UUID bzw. Rückstand in ms
+    text: str = ""
+    raw: str = ""
+
+
+NAME = r"[A-Za-z0-9_]{1,16}"
+
+DEATH_PHRASES = [
+    "was slain by", "was shot by", "was killed", "was blown up", "blew up",
+    "fell from", "fell off", "fell out of the world", "hit the ground too hard",
+    "tried to swim in lava", "burned to death", "went up in flames", "walked into fire",
+    "was burned to a crisp while fighting", "drowned", "suffocated in a wall", "starved to death",
+    "froze to death", "was frozen to death", "was struck by lightning", "withered away",
+    "was squashed", "was squished", "was pricked to death", "was poked to death", "was impaled",
+    "was fireballed", "was stung to death", "was skewered", "was obliterated", "was pummeled",
+    "experienced kinetic energy", "discovered the floor was lava", "left the confines of this world",
+    "didn't want to live", "died",
+]
+
+# Eine einzige, am Log-Präfix verankerte Regex für alle Ereignisse.
+# Zeilen anderer Threads oder Level scheitern bereits nach wenigen Zeichen.
+_EVENT_RE = re.compile(
+    r"\[[^\]]*\] \[(?:"
+    r"Server thread/WARN\]: Can't keep up! Is the server overloaded\? "
+    r"Running (?P<lag>\d+)ms or (?P<lag_ticks>\d+) ticks behind"
+    r"|(?:Server thread|User Authenticator #\d+)/INFO\]: (?:"
+    r"<(?P<chat_player>[^>]+)> (?P<chat_msg>.*)"
+    r"|(?P<stop>Stopping server)"
+    rf"|(?P<join>{NAME}) joined the game"
+    rf"|(?P<leave>{NAME}) left the game"
+    rf"|(?P<adv_player>{NAME}) has (?:made the advancement|completed the challenge|reached the goal) \[(?P<adv>.+)\]"
+    rf"|UUID of player (?P<uuid_player>{NAME}) is (?P<uuid>[0-9a-f-]{{36}})"
+    rf"|(?P<death>(?P<death_player>{NAME}) (?:{'|'.join(re.escape(p) for p in DEATH_PHRASES)})\b.*)"
+    r"))$"
+)
+
+
+def classify(line: str) -> Optional[LogEvent]:
+    """Ordnet eine Log-Zeile in einem Durchlauf einem Ereignis zu (oder None)."""
+    m = _EVENT_RE.match(line)
+    if m is None:
+        return None
+
+    group = m.lastgroup
+    if group == "chat_msg":
+        return LogEvent(EventKind.CHAT, m.group("chat_player"), m.group("chat_msg"), line)
+    if group == "join":
+        return LogEvent(EventKind.JOIN, m.group("join"), raw=line)
+    if group == "leave":
+        return LogEvent(EventKind.LEAVE, m.group("leave"), raw=line)
+    if group == "adv":
+        return LogEvent(EventKind.ADVANCEMENT, m.group("adv_player"), m.group("adv"), line)
+    if group == "uuid":
+        return LogEvent(EventKind.UUID, m.group("uuid_player"), m.group("uuid"), line)
+    if group == "stop":
+        return LogEvent(EventKind.STOP, "", raw=line)
+    if group == "lag_ticks":
+        return LogEvent(EventKind.LAG, "", m.group("lag"), line)
+    if group == "death":
+        return LogEvent(EventKind.DEATH, m.group("death_player"), m.group("death"), line)
+    return None
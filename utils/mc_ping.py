@@ -0,0 +1,363 @@
+# utils/mc_ping.py
+
+import asyncio
+import ipaddress
+import json
+import os
+import random
+import socket
+import struct
+import time
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Optional
+
+try:
+    import dns.asyncresolver
+    HAS_DNSPYTHON = True
+except ImportError:
+    HAS_DNSPYTHON = False
+
+MC_PING_TIMEOUT = float(os.getenv("MC_PING_TIMEOUT", "3"))
+# Wie lange (Sekunden) aufgelöste Adressen und SRV-Einträge wiederverwendet werden
+MC_DNS_TTL = int(os.getenv("MC_DNS_TTL", "300"))
+
+DEFAULT_PORT = 25565
+# Protokollversion im Handshake; für den Status-Ping akzeptiert jeder Server jede Version
+PROTOCOL_VERSION = 47
+
+# Logarithmische Latenz-Klassen von 0,5 ms bis ~10 s (≈15 % Breite)
+LATENCY_EDGES = [round(0.5 * 1.15 ** i, 3) for i in range(72)]
+
+
+class PingError(Exception):
+    pass
+
+
+@dataclass
+class StatusResult:
+    online: int
+    max: int
+    players: list[str]
+    version: str
+    motd: str
+    latency_ms: float
+
+
+@dataclass
+class QueryResult:
+    online: int
+    max: int
+    players: list[str]
+    version: str
+    map: str
+    latency_ms: float
+
+
+class LatencyHistogram:
+    """Fest vorgegebene, logarithmische Klassen; Perzentile sind auf ~7 % genau."""
+
+    def __init__(self):
+        self.counts = array("I", [0] * (len(LATENCY_EDGES) + 1))
+        self.total = 0
+
+    def add(self, ms: float):
+        self.counts[bisect_right(LATENCY_EDGES, ms)] += 1
+        self.total += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.total:
+            return None
+        rank = q * self.total
+        seen = 0
+        for j, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return LATENCY_EDGES[min(j, len(LATENCY_EDGES) - 1)]
+        return LATENCY_EDGES[-1]
+
+
+@dataclass
+class HostStats:
+    ok: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    connect: LatencyHistogram = field(default_factory=LatencyHistogram)
+    status: LatencyHistogram = field(default_factory=LatencyHistogram)
+    query: LatencyHistogram = field(default_factory=LatencyHistogram)
+    last_ok: Optional[float] = None
+    last_error: str = ""
+
+    def as_dict(self) -> dict:
+        return {
+            "ok": self.ok,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "connect_p50_ms": self.connect.percentile(0.5),
+            "connect_p95_ms": self.connect.percentile(0.95),
+            "status_p50_ms": self.status.percentile(0.5),
+            "status_p95_ms": self.status.percentile(0.95),
+            "query_p50_ms": self.query.percentile(0.5),
+            "last_error": self.last_error,
+        }
+
+
+# ------------------------- Protokoll -------------------------
+def _varint(value: int) -> bytes:
+    value &= 0xFFFFFFFF
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _string(text: str) -> bytes:
+    data = text.encode("utf-8")
+    return _varint(len(data)) + data
+
+
+def _packet(packet_id: int, payload: bytes = b"") -> bytes:
+    body = _varint(packet_id) + payload
+    return _varint(len(body)) + body
+
+
+async def _read_varint(reader: asyncio.StreamReader) -> int:
+    value = 0
+    for shift in range(0, 35, 7):
+        byte = (await reader.readexactly(1))[0]
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value - (1 << 32) if value & 0x80000000 else value
+    raise PingError("VarInt zu lang")
+
+
+def motd_text(description) -> str:
+    """Flacht eine MOTD (String oder Chat-Komponente) zu reinem Text ab."""
+    if isinstance(description, str):
+        return description
+    if isinstance(description, list):
+        return "".join(motd_text(part) for part in description)
+    if isinstance(description, dict):
+        return description.get("text", "") + "".join(motd_text(part) for part in description.get("extra", []))
+    return ""
+
+
+def parse_status(raw: str, latency_ms: float) -> StatusResult:
+    data = json.loads(raw)
+    players = data.get("players") or {}
+    return StatusResult(
+        online=int(players.get("online", 0)),
+        max=int(players.get("max", 0)),
+        players=[p.get("name", "") for p in players.get("sample") or []],
+        version=(data.get("version") or {}).get("name", ""),
+        motd=motd_text(data.get("description", "")),
+        latency_ms=latency_ms,
+    )
+
+
+def parse_full_stat(data: bytes, latency_ms: float) -> QueryResult:
+    # Antwort: Typ(1) + Session(4) + "splitnum\0\x80\0"(11) + Key/Value-Paare + "\x01player_\0\0"(10) + Namen
+    body = data[16:]
+    kv_part, _, player_part = body.partition(b"\x00\x00\x01player_\x00\x00")
+    fields = kv_part.split(b"\x00")
+    info = {fields[i].decode("latin-1"): fields[i + 1].decode("utf-8", "replace")
+            for i in range(0, len(fields) - 1, 2)}
+    players = [n.decode("utf-8", "replace") for n in player_part.split(b"\x00") if n]
+    return QueryResult(
+        online=int(info.get("numplayers", len(players)) or 0),
+        max=int(info.get("maxplayers", 0) or 0),
+        players=players,
+        version=info.get("version", ""),
+        map=info.get("map", ""),
+        latency_ms=latency_ms,
+    )
+
+
+class _QueryProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.packets: asyncio.Queue = asyncio.Queue()
+
+    def datagram_received(self, data, addr):
+        self.packets.put_nowait(data)
+
+    def error_received(self, exc):
+        self.packets.put_nowait(exc)
+
+
+# ------------------------- Client -------------------------
+class MinecraftPinger:
+    """Asynchroner Server-List-Ping und Query ohne Threads.
+
+    Host und SRV-Eintrag werden einmal aufgelöst und ``dns_ttl`` Sekunden
+    gecacht, jeder Verbindungsaufbau hat ein eigenes Timeout. Pro Ziel werden
+    Verbindungs-, Status- und Query-Latenzen in Histogrammen gesammelt.
+    """
+
+    def __init__(self, timeout: float = MC_PING_TIMEOUT, dns_ttl: int = MC_DNS_TTL):
+        self.timeout = timeout
+        self.dns_ttl = dns_ttl
+        self._dns: dict[tuple[str, int], tuple[float, str, int]] = {}
+        self.stats: dict[str, HostStats] = {}
+
+    def _stats(self, host: str, port: int) -> HostStats:
+        return self.stats.setdefault(f"{host}:{port}", HostStats())
+
+    # ------------------------- DNS -------------------------
+    async def resolve(self, host: str, port: int = DEFAULT_PORT) -> tuple[str, int]:
+        """(IP, Port) zu einem Host; SRV ``_minecraft._tcp`` nur ohne expliziten Port und mit dnspython."""
+        try:
+            ipaddress.ip_address(host)
+            return host, port
+        except ValueError:
+            pass
+
+        key = (host, port)
+        cached = self._dns.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1], cached[2]
+
+        target, target_port = host, port
+        if HAS_DNSPYTHON and port == DEFAULT_PORT:
+            try:
+                answer = await dns.asyncresolver.resolve(f"_minecraft._tcp.{host}", "SRV", lifetime=self.timeout)
+                record = answer[0]
+                target, target_port = str(record.target).rstrip("."), record.port
+            except Exception:
+                pass
+
+        loop = asyncio.get_running_loop()
+        infos = await asyncio.wait_for(
+            loop.getaddrinfo(target, target_port, type=socket.SOCK_STREAM), self.timeout
+        )
+        address = infos[0][4][0]
+        self._dns[key] = (time.monotonic() + self.dns_ttl, address, target_port)
+        return address, target_port
+
+    # ------------------------- Status (TCP) -------------------------
+    async def _open(self, host: str, port: int, stats: HostStats):
+        address, real_port = await self.resolve(host, port)
+        started = time.perf_counter()
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(address, real_port), self.timeout)
+        stats.connect.add((time.perf_counter() - started) * 1000)
+        return reader, writer, real_port
+
+    async def status(self, host: str, port: int = DEFAULT_PORT) -> StatusResult:
+        stats = self._stats(host, port)
+        writer = None
+        try:
+            reader, writer, real_port = await self._open(host, port, stats)
+
+            async def exchange() -> StatusResult:
+                handshake = _varint(PROTOCOL_VERSION) + _string(host) + struct.pack(">H", real_port) + _varint(1)
+                started = time.perf_counter()
+                writer.write(_packet(0x00, handshake) + _packet(0x00))
+                await writer.drain()
+                await _read_varint(reader)
+                if await _read_varint(reader) != 0x00:
+                    raise PingError("Unerwartete Antwort auf Status-Anfrage")
+                length = await _read_varint(reader)
+                raw = (await reader.readexactly(length)).decode("utf-8")
+                return parse_status(raw, (time.perf_counter() - started) * 1000)
+
+            result = await asyncio.wait_for(exchange(), self.timeout)
+        except Exception as e:
+            self._failed(stats, e)
+            raise PingError(f"Status-Ping {host}:{port} fehlgeschlagen: {e or type(e).__name__}") from e
+        finally:
+            if writer is not None:
+                writer.close()
+        stats.status.add(result.latency_ms)
+        self._succeeded(stats)
+        return result
+
+    # ------------------------- Query (UDP) -------------------------
+    async def query(self, host: str, port: int = DEFAULT_PORT) -> QueryResult:
+        stats = self._stats(host, port)
+        transport = None
+        try:
+            address, real_port = await self.resolve(host, port)
+            loop = asyncio.get_running_loop()
+            transport, protocol = await loop.create_datagram_endpoint(_QueryProtocol, remote_addr=(address, real_port))
+            session = random.getrandbits(32) & 0x0F0F0F0F
+
+            async def receive() -> bytes:
+                data = await protocol.packets.get()
+                if isinstance(data, Exception):
+                    raise data
+                return data
+
+            async def exchange() -> QueryResult:
+                started = time.perf_counter()
+                transport.sendto(b"\xfe\xfd\x09" + struct.pack(">i", session))
+                challenge = int((await receive())[5:].rstrip(b"\x00"))
+                transport.sendto(b"\xfe\xfd\x00" + struct.pack(">ii", session, challenge) + b"\x00" * 4)
+                data = await receive()
+                return parse_full_stat(data, (time.perf_counter() - started) * 1000)
+
+            result = await asyncio.wait_for(exchange(), self.timeout)
+        except Exception as e:
+            self._failed(stats, e)
+            raise PingError(f"Query {host}:{port} fehlgeschlagen: {e or type(e).__name__}") from e
+        finally:
+            if transport is not None:
+                transport.close()
+        stats.query.add(result.latency_ms)
+        self._succeeded(stats)
+        return result
+
+    # ------------------------- Komfort -------------------------
+    async def player_count(self, host: str, port: int = DEFAULT_PORT) -> Optional[int]:
+        """Spielerzahl per Status-Ping, ersatzweise per Query; None, wenn beides scheitert."""
+        try:
+            return (await self.status(host, port)).online
+        except PingError:
+            try:
+                return (await self.query(host, port)).online
+            except PingError:
+                return None
+
+    async def reachable(self, host: str, port: int = DEFAULT_PORT) -> bool:
+        """Nimmt der Port Verbindungen an (ohne Minecraft-Protokoll)?"""
+        try:
+            _, writer, _ = await self._open(host, port, self._stats(host, port))
+        except (OSError, asyncio.TimeoutError, PingError):
+            return False
+        writer.close()
+        return True
+
+    async def status_many(self, targets: list[tuple[str, int]]) -> list[Optional[StatusResult]]:
+        """Pingt alle Ziele gleichzeitig; unerreichbare liefern None."""
+        async def one(host: str, port: int) -> Optional[StatusResult]:
+            try:
+                return await self.status(host, port)
+            except PingError:
+                return None
+        return await asyncio.gather(*(one(host, port) for host, port in targets))
+
+    def _succeeded(self, stats: HostStats):
+        stats.ok += 1
+        stats.last_ok = time.time()
+
+    def _failed(self, stats: HostStats, exc: Exception):
+        stats.failures += 1
+        if isinstance(exc, asyncio.TimeoutError):
+            stats.timeouts += 1
+        stats.last_error = str(exc) or type(exc).__name__
+
+    def summary(self, host: str, port: int = DEFAULT_PORT) -> str:
+        s = self.stats.get(f"{host}:{port}")
+        if s is None:
+            return "noch keine Pings"
+        p50 = s.status.percentile(0.5)
+        p95 = s.status.percentile(0.95)
+        latency = f"p50 {p50:.0f} ms, p95 {p95:.0f} ms" if p50 is not None else "keine Antwort bisher"
+        return f"{latency} ({s.ok} ok, {s.failures} fehlgeschlagen)"
+
+
+mc_ping = MinecraftPinger()
@@ -0,0 +1,131 @@
+# utils/perf_telemetry.py
+
+import re
+import time
+from array import array
+from bisect import bisect_right
+from typing import Optional
+
+# Logarithmische MSPT-Klassen von 1 ms bis ~2 s (≈10 % Breite); Perzentile sind damit auf ~5 % genau
+MSPT_EDGES = [round(1.1 ** i, 3) for i in range(81)]
+
+# "tick query" (Vanilla ab 1.20.3) bzw. "forge tps"
+TICK_QUERY_RE = re.compile(r"Average time per tick: ([\d.]+) ?ms")
+FORGE_TPS_RE = re.compile(r"Overall\s*:.*?Mean tick time: ([\d.]+) ms")
+
+
+def parse_mspt(text: str) -> Optional[float]:
+    m = TICK_QUERY_RE.search(text) or FORGE_TPS_RE.search(text)
+    return float(m.group(1)) if m else None
+
+
+class Rollup:
+    """Ringpuffer fester Größe aus Zeit-Buckets mit MSPT-Histogramm und Lag-Spike-Zählern.
+
+    Ein Bucket deckt ``resolution`` Sekunden ab; ältere Buckets werden beim
+    Weiterlaufen überschrieben, der Speicherbedarf ist also konstant.
+    """
+
+    def __init__(self, resolution: int, capacity: int):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.slots = array("q", [-1] * capacity)
+        self.hist = [array("I", [0] * (len(MSPT_EDGES) + 1)) for _ in range(capacity)]
+        self.spikes = array("I", [0] * capacity)
+        self.worst = array("d", [0.0] * capacity)
+
+    def _bucket(self, ts: float) -> Optional[int]:
+        slot = int(ts) // self.resolution
+        i = slot % self.capacity
+        if self.slots[i] > slot:
+            # Älter als der Ring reicht
+            return None
+        if self.slots[i] != slot:
+            self.slots[i] = slot
+            self.hist[i] = array("I", [0] * (len(MSPT_EDGES) + 1))
+            self.spikes[i] = 0
+            self.worst[i] = 0.0
+        return i
+
+    def add_mspt(self, ts: float, mspt: float):
+        i = self._bucket(ts)
+        if i is not None:
+            self.hist[i][bisect_right(MSPT_EDGES, mspt)] += 1
+
+    def add_spike(self, ts: float, behind_ms: float):
+        i = self._bucket(ts)
+        if i is None:
+            return
+        self.spikes[i] += 1
+        self.worst[i] = max(self.worst[i], behind_ms)
+
+    def window(self, since: float) -> tuple[list[int], int, float]:
+        """(zusammengeführtes Histogramm, Spikes, schlimmster Rückstand) aller Buckets ab ``since``."""
+        first = int(since) // self.resolution
+        merged = [0] * (len(MSPT_EDGES) + 1)
+        spikes = 0
+        worst = 0.0
+        for i, slot in enumerate(self.slots):
+            if slot < first:
+                continue
+            for j, count in enumerate(self.hist[i]):
+                if count:
+                    merged[j] += count
+            spikes += self.spikes[i]
+            worst = max(worst, self.worst[i])
+        return merged, spikes, worst
+
+
+def percentile(hist: list[int], q: float) -> Optional[float]:
+    total = sum(hist)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for j, count in enumerate(hist):
+        seen += count
+        if seen >= rank:
+            # Obere Klassengrenze (konservativ); letzte Klasse ist offen
+            return MSPT_EDGES[min(j, len(MSPT_EDGES) - 1)]
+    return MSPT_EDGES[-1]
+
+
+class PerfTelemetry:
+    """MSPT-Stichproben und "Can't keep up"-Spikes in drei Auflösungen.
+
+    Stunde: 1-Minuten-Buckets, Tag: 15-Minuten-Buckets, Woche: 1-Stunden-Buckets.
+    Jeder Zeitraum wird aus seinem eigenen Ring beantwortet.
+    """
+
+    def __init__(self):
+        self.rollups = {
+            "hour": Rollup(60, 61),
+            "day": Rollup(900, 97),
+            "week": Rollup(3600, 169),
+        }
+        self.spans = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+        self.last_mspt: Optional[float] = None
+        self.last_sample_at: Optional[float] = None
+
+    def record_mspt(self, mspt: float, ts: Optional[float] = None):
+        ts = ts if ts is not None else time.time()
+        for rollup in self.rollups.values():
+            rollup.add_mspt(ts, mspt)
+        self.last_mspt = mspt
+        self.last_sample_at = ts
+
+    def record_spike(self, behind_ms: float, ts: Optional[float] = None):
+        ts = ts if ts is not None else time.time()
+        for rollup in self.rollups.values():
+            rollup.add_spike(ts, behind_ms)
+
+    def report(self, period: str, now: Optional[float] = None) -> dict:
+        now = now if now is not None else time.time()
+        hist, spikes, worst = self.rollups[period].window(now - self.spans[period])
+        return {
+            "samples": sum(hist),
+            "p50": percentile(hist, 0.50),
+            "p95": percentile(hist, 0.95),
+            "spikes": spikes,
+            "worst_ms": worst,
+        }
@@ -0,0 +1,118 @@
+# utils/player_index.py
+
+from bisect import bisect_left, insort
+from typing import Iterable, Optional
+
+
+class SortedNames:
+    """Sortiertes Array kleingeschriebener Namen für Präfix-Suche per bisect.
+
+    Einfügen ist O(log n) Suche plus Verschieben, eine Präfix-Anfrage O(log n + k).
+    Reicht für Autocomplete mit zehntausenden Namen deutlich unter Discords Frist.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._display: dict[str, str] = {n.lower(): n for n in names}
+        self._keys = sorted(self._display)
+
+    def add(self, name: str):
+        key = name.lower()
+        if key not in self._display:
+            insort(self._keys, key)
+        self._display[key] = name
+
+    def discard(self, name: str):
+        key = name.lower()
+        if self._display.pop(key, None) is not None:
+            i = bisect_left(self._keys, key)
+            if i < len(self._keys) and self._keys[i] == key:
+                del self._keys[i]
+
+    def complete(self, prefix: str, limit: int = 25) -> list[str]:
+        prefix = prefix.lower()
+        i = bisect_left(self._keys, prefix)
+        result = []
+        while i < len(self._keys) and len(result) < limit and self._keys[i].startswith(prefix):
+            result.append(self._display[self._keys[i]])
+            i += 1
+        return result
+
+    def __contains__(self, name: str):
+        return name.lower() in self._display
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class PlayerIndex:
+    """Bidirektionaler Name ↔ UUID-Index aus der usercache.json.
+
+    Namen werden case-insensitiv nachgeschlagen. Die usercache wird nur neu
+    geladen, wenn sich mtime oder Größe der Remote-Datei geändert haben; Namen
+    aus dem Log-Stream (Join-Zeilen) können jederzeit ergänzt werden.
+    """
+
+    def __init__(self):
+        self._by_name: dict[str, tuple[str, Optional[str]]] = {}
+        self._by_uuid: dict[str, str] = {}
+        self.meta: Optional[tuple[float, int]] = None
+        self.sorted = SortedNames()
+
+    def needs_refresh(self, meta: Optional[tuple[float, int]]) -> bool:
+        return meta is not None and meta != self.meta
+
+    def load(self, users: list[dict], meta: Optional[tuple[float, int]] = None):
+        """Übernimmt den Inhalt der usercache.json; gelernte Namen ohne UUID bleiben erhalten."""
+        learned = {key: entry for key, entry in self._by_name.items() if entry[1] is None}
+        self._by_name = learned
+        self._by_uuid = {}
+        for user in users or []:
+            name, uuid = user.get("name"), user.get("uuid")
+            if name and uuid:
+                self._add(name, uuid, index=False)
+        self.meta = meta
+        self.sorted = SortedNames(self.names())
+
+    def _add(self, name: str, uuid: Optional[str], index: bool = True):
+        key = name.lower()
+        if uuid is None:
+            # Bereits bekannte UUID nicht durch einen reinen Namen überschreiben
+            if key not in self._by_name:
+                self._by_name[key] = (name, None)
+                if index:
+                    self.sorted.add(name)
+            return
+        old_name = self._by_uuid.get(uuid)
+        if old_name and old_name.lower() != key:
+            # Namensänderung: alter Name zeigt nicht mehr auf diese UUID
+            self._by_name.pop(old_name.lower(), None)
+            if index:
+                self.sorted.discard(old_name)
+        self._by_name[key] = (name, uuid)
+        self._by_uuid[uuid] = name
+        if index:
+            self.sorted.add(name)
+
+    def absorb(self, name: str, uuid: Optional[str] = None):
+        """Ergänzt einen Namen (z. B. aus einer Join-Zeile im Log)."""
+        self._add(name, uuid)
+
+    def uuid_for(self, name: str) -> Optional[str]:
+        entry = self._by_name.get(name.lower())
+        return entry[1] if entry else None
+
+    def name_for(self, uuid: str) -> Optional[str]:
+        return self._by_uuid.get(uuid)
+
+    def names(self) -> list[str]:
+        return [name for name, _ in self._by_name.values()]
+
+    def complete(self, prefix: str, limit: int = 25) -> list[str]:
+        return self.sorted.complete(prefix, limit)
+
+    def __len__(self):
+        return len(self._by_name)
+
+
+# Geteilte Instanz: McStats lädt die usercache, ChatMirror ergänzt Namen aus dem Log
+player_index = PlayerIndex()
@@ -0,0 +1,195 @@
+# utils/rcon.py
+
+import asyncio
+import itertools
+import struct
+from typing import Optional
+
+TYPE_RESPONSE = 0
+TYPE_COMMAND = 2
+TYPE_AUTH = 3
+# Unbekannter Typ: Minecraft antwortet mit "Unknown request", markiert damit das Ende einer Mehrpaket-Antwort
+TYPE_SENTINEL = 100
+
+MAX_PAYLOAD = 1446
+
+
+class RconError(Exception):
+    pass
+
+
+class RconAuthError(RconError):
+    pass
+
+
+def _pack(request_id: int, packet_type: int, payload: str) -> bytes:
+    body = struct.pack("<ii", request_id, packet_type) + payload.encode("utf-8") + b"\x00\x00"
+    return struct.pack("<i", len(body)) + body
+
+
+class RconConnection:
+    """Eine authentifizierte RCON-Verbindung mit Pipelining über die Request-ID.
+
+    Jede Anfrage wird von einem Sentinel-Paket gefolgt. Alle Antwortpakete mit der
+    Request-ID werden gesammelt, bis die Antwort auf den Sentinel eintrifft – so werden
+    auch Antworten über 4096 Bytes (mehrere Pakete) vollständig zusammengesetzt.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._chunks: dict[int, list[str]] = {}
+        self._sentinels: dict[int, int] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        self.closed = False
+
+    @classmethod
+    async def open(cls, host: str, port: int, password: str, timeout: float = 5) -> "RconConnection":
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        conn = cls(reader, writer)
+        try:
+            await asyncio.wait_for(conn._login(password), timeout)
+        except BaseException:
+            conn.close()
+            raise
+        conn._reader_task = asyncio.create_task(conn._read_loop())
+        return conn
+
+    async def _read_packet(self) -> tuple[int, int, str]:
+        length = struct.unpack("<i", await self.reader.readexactly(4))[0]
+        data = await self.reader.readexactly(length)
+        request_id, packet_type = struct.unpack("<ii", data[:8])
+        return request_id, packet_type, data[8:-2].decode("utf-8", errors="replace")
+
+    async def _login(self, password: str):
+        request_id = next(self._ids)
+        self.writer.write(_pack(request_id, TYPE_AUTH, password))
+        await self.writer.drain()
+        while True:
+            response_id, packet_type, _ = await self._read_packet()
+            # Manche Server schicken vor der Auth-Antwort ein leeres RESPONSE-Paket
+            if packet_type == TYPE_COMMAND:
+                if response_id == -1:
+                    raise RconAuthError("RCON-Login fehlgeschlagen (falsches Passwort?)")
+                return
+
+    async def _read_loop(self):
+        try:
+            while True:
+                response_id, _, payload = await self._read_packet()
+                if response_id in self._sentinels:
+                    request_id = self._sentinels.pop(response_id)
+                    future = self._pending.pop(request_id, None)
+                    text = "".join(self._chunks.pop(request_id, []))
+                    if future and not future.done():
+                        future.set_result(text)
+                elif response_id in self._pending:
+                    self._chunks.setdefault(response_id, []).append(payload)
+        except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+            self._fail(RconError(f"RCON-Verbindung verloren: {e}"))
+        except asyncio.CancelledError:
+            self._fail(RconError("RCON-Verbindung geschlossen"))
+            raise
+
+    def _fail(self, exc: Exception):
+        self.closed = True
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        self._pending.clear()
+        self._chunks.clear()
+        self._sentinels.clear()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def command(self, command: str, timeout: float = 10) -> str:
+        if self.closed:
+            raise RconError("RCON-Verbindung geschlossen")
+        if len(command.encode("utf-8")) > MAX_PAYLOAD:
+            raise RconError(f"RCON-Befehl zu lang (max. {MAX_PAYLOAD} Bytes)")
+
+        request_id = next(self._ids)
+        sentinel_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._sentinels[sentinel_id] = request_id
+
+        self.writer.write(_pack(request_id, TYPE_COMMAND, command) + _pack(sentinel_id, TYPE_SENTINEL, ""))
+        try:
+            await self.writer.drain()
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise RconError(f"RCON-Timeout nach {timeout}s")
+        finally:
+            self._pending.pop(request_id, None)
+            self._chunks.pop(request_id, None)
+            self._sentinels.pop(sentinel_id, None)
+
+    def close(self):
+        self.closed = True
+        if self._reader_task:
+            self._reader_task.cancel()
+        self.writer.close()
+
+
+class RconPool:
+    """Kleiner Pool authentifizierter Verbindungen zu einem Server.
+
+    Neue Verbindungen werden nur aufgebaut, wenn alle vorhandenen bereits Anfragen in
+    Bearbeitung haben und das Limit noch nicht erreicht ist.
+    """
+
+    def __init__(self, host: str, port: int, password: str, size: int = 2, connect_timeout: float = 5):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.size = size
+        self.connect_timeout = connect_timeout
+        self._conns: list[RconConnection] = []
+        self._lock = asyncio.Lock()
+
+    async def _acquire(self) -> RconConnection:
+        self._conns = [c for c in self._conns if not c.closed]
+        idle = [c for c in self._conns if c.in_flight == 0]
+        if idle or len(self._conns) >= self.size:
+            return min(self._conns, key=lambda c: c.in_flight)
+
+        async with self._lock:
+            if len(self._conns) < self.size:
+                conn = await RconConnection.open(self.host, self.port, self.password, self.connect_timeout)
+                self._conns.append(conn)
+                print(f"[INFO] RCON-Verbindung zu {self.host}:{self.port} aufgebaut ({len(self._conns)}/{self.size})")
+                return conn
+        return min(self._conns, key=lambda c: c.in_flight)
+
+    async def command(self, command: str, timeout: float = 10) -> str:
+        """Führt einen Befehl aus; eine tote Verbindung wird einmalig durch eine neue ersetzt."""
+        for attempt in range(2):
+            conn = await self._acquire()
+            try:
+                return await conn.command(command, timeout)
+            except RconError:
+                if attempt or not conn.closed:
+                    raise
+                conn.close()
+
+    def close(self):
+        for conn in self._conns:
+            conn.close()
+        self._conns.clear()
+
+
+_pools: dict[tuple[str, int], RconPool] = {}
+
+
+def get_rcon(host: str, port: int, password: str) -> RconPool:
+    """Gibt den geteilten Pool für einen Server zurück (wird beim ersten Aufruf angelegt)."""
+    key = (host, int(port))
+    pool = _pools.get(key)
+    if pool is None or pool.password != password:
+        pool = _pools[key] = RconPool(host, int(port), password)
+    return pool
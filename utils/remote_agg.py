@@ -0,0 +1,84 @@
+# utils/remote_agg.py
+
+import json
+import shlex
+from typing import Optional
+
+# Bei Änderungen am Skript oder am Ausgabeformat hochzählen
+AGG_VERSION = 1
+
+# Läuft auf dem Minecraft-Host (nur Python-3-Standardbibliothek) und gibt pro Spieler
+# nur den Rohwert-Vektor der Registry-Metriken aus statt der kompletten Stats-JSON.
+AGG_SCRIPT = """
+import json, os, sys
+d, spec = sys.argv[1], json.loads(sys.argv[2])
+u = sys.argv[3] if len(sys.argv) > 3 else ''
+out = ['MCAGG %d' % VERSION]
+if u:
+    try:
+        st = os.stat(u)
+        out.append('U\\t%r\\t%d' % (st.st_mtime, st.st_size))
+    except OSError:
+        pass
+for f in os.listdir(d):
+    if not f.endswith('.json'):
+        continue
+    try:
+        with open(os.path.join(d, f)) as h:
+            s = json.load(h).get('stats', {})
+    except Exception:
+        continue
+    row = []
+    for m in spec:
+        t = 0
+        for c, ks in m['keys']:
+            v = s.get(c)
+            if v:
+                for k in ks:
+                    t += v.get(k, 0)
+        for c, ex in m['all']:
+            v = s.get(c)
+            if v:
+                t += sum(v.values())
+                for k in ex:
+                    t -= v.get(k, 0)
+        row.append(t)
+    out.append(f[:-5] + '\\t' + ','.join(repr(x) for x in row))
+sys.stdout.write('\\n'.join(out) + '\\n')
+""".replace("VERSION", str(AGG_VERSION))
+
+# Exit-Code, wenn auf dem Host kein python3 vorhanden ist
+NO_INTERPRETER = 127
+
+
+def build_command(stats_path: str, spec: list[dict], usercache_path: str = "") -> str:
+    args = " ".join(shlex.quote(a) for a in (stats_path, json.dumps(spec, separators=(",", ":")), usercache_path))
+    return (
+        f"command -v python3 >/dev/null 2>&1 || exit {NO_INTERPRETER}; "
+        f"python3 -c {shlex.quote(AGG_SCRIPT)} {args}"
+    )
+
+
+def parse_output(text: str, width: int) -> Optional[tuple[dict[str, list[float]], Optional[tuple[float, int]]]]:
+    """Zerlegt die Skript-Ausgabe in ({uuid: rohwerte}, usercache-meta).
+
+    Gibt None zurück, wenn Header oder Version nicht passen.
+    """
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != f"MCAGG {AGG_VERSION}":
+        return None
+
+    rows: dict[str, list[float]] = {}
+    usercache_meta = None
+    for line in lines[1:]:
+        parts = line.split("\t")
+        try:
+            if parts[0] == "U" and len(parts) == 3:
+                usercache_meta = (float(parts[1]), int(parts[2]))
+            elif len(parts) == 2:
+                values = [float(x) for x in parts[1].split(",")] if parts[1] else []
+                if len(values) == width:
+                    rows[parts[0]] = values
+        except ValueError:
+            continue
+    return rows, usercache_meta
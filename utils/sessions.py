@@ -0,0 +1,199 @@
+# utils/sessions.py
+
+import math
+import os
+import sqlite3
+import time
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from typing import Optional
+
+DATA_DIR = os.getenv("BOT_DATA_DIR", "data")
+OPEN = math.inf
+
+
+@dataclass
+class Session:
+    id: int
+    server: str
+    player: str
+    start: float
+    end: float = OPEN
+
+    @property
+    def is_open(self) -> bool:
+        return self.end == OPEN
+
+    def overlap(self, since: float, until: float) -> float:
+        return max(0.0, min(self.end, until) - max(self.start, since))
+
+
+def log_time(line: str, now: Optional[float] = None) -> Optional[float]:
+    """Zeitpunkt einer Log-Zeile "[HH:MM:SS] ...": der letzte solche Zeitpunkt bis ``now``."""
+    if len(line) < 10 or line[0] != "[" or line[3] != ":" or line[6] != ":":
+        return None
+    try:
+        hour, minute, second = int(line[1:3]), int(line[4:6]), int(line[7:9])
+    except ValueError:
+        return None
+    now = now if now is not None else time.time()
+    local = time.localtime(now)
+    ts = time.mktime((local.tm_year, local.tm_mon, local.tm_mday, hour, minute, second, 0, 0, -1))
+    return ts - 86400 if ts > now + 60 else ts
+
+
+class SessionStore:
+    """Spieler-Sessions (Server, Spieler, Beginn, Ende) aus Join/Leave-Ereignissen.
+
+    Alle Sessions liegen zusätzlich im Speicher: sortierte Beginn- und Endzeiten
+    beantworten "wie viele waren zum Zeitpunkt t online" per bisect in O(log n),
+    die längste Session begrenzt, welche Sessions ein Zeitfenster überhaupt
+    berühren können. Offene Sessions haben das Ende ``inf``; ``last_seen(server)``
+    hält pro Server fest, bis wann sie sicher noch liefen.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(DATA_DIR, "sessions.sqlite3")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        self.db = sqlite3.connect(self.path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id INTEGER PRIMARY KEY, server TEXT NOT NULL, player TEXT NOT NULL, "
+            "start REAL NOT NULL, end REAL)"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.db.commit()
+
+        self._sessions: dict[int, Session] = {}
+        self._open: dict[tuple[str, str], Session] = {}
+        self._by_start: list[tuple[float, int]] = []
+        self._starts: list[float] = []
+        self._ends: list[float] = []
+        self._by_player: dict[str, list[tuple[float, int]]] = {}
+        self.max_duration = 0.0
+        # Letzter sicherer Zeitpunkt pro Server (in meta als "last_seen:<server>")
+        self._last_seen: dict[str, float] = {}
+
+        for key, value in self.db.execute("SELECT key, value FROM meta WHERE key LIKE 'last_seen%'"):
+            self._last_seen[key.partition(":")[2]] = float(value)
+        for sid, server, player, start, end in self.db.execute("SELECT id, server, player, start, end FROM sessions"):
+            self._index(Session(sid, server, player, start, OPEN if end is None else end))
+
+    # ------------------------- Index -------------------------
+    def _index(self, session: Session):
+        self._sessions[session.id] = session
+        insort(self._by_start, (session.start, session.id))
+        insort(self._starts, session.start)
+        insort(self._ends, session.end)
+        insort(self._by_player.setdefault(session.player.lower(), []), (session.start, session.id))
+        if session.is_open:
+            self._open[(session.server, session.player.lower())] = session
+        else:
+            self.max_duration = max(self.max_duration, session.end - session.start)
+
+    def last_seen(self, server: str) -> float:
+        # Ältere Datenbanken kennen nur einen globalen Wert (Schlüssel "last_seen")
+        return self._last_seen.get(server, self._last_seen.get("", 0.0))
+
+    def touch(self, server: str, when: Optional[float] = None):
+        """Merkt sich, dass offene Sessions auf ``server`` bis ``when`` sicher noch liefen."""
+        when = when if when is not None else time.time()
+        self._last_seen[server] = when
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (f"last_seen:{server}", str(when)))
+        self.db.commit()
+
+    # ------------------------- Schreiben -------------------------
+    def open(self, server: str, player: str, start: float) -> Optional[Session]:
+        if (server, player.lower()) in self._open:
+            return None
+        sid = self.db.execute(
+            "INSERT INTO sessions (server, player, start, end) VALUES (?, ?, ?, NULL)", (server, player, start)
+        ).lastrowid
+        self.db.commit()
+        session = Session(sid, server, player, start)
+        self._index(session)
+        return session
+
+    def close(self, server: str, player: str, end: float) -> Optional[Session]:
+        session = self._open.pop((server, player.lower()), None)
+        if session is None:
+            return None
+        end = max(end, session.start)
+        self.db.execute("UPDATE sessions SET end = ? WHERE id = ?", (end, session.id))
+        self.db.commit()
+        del self._ends[bisect_left(self._ends, OPEN)]
+        insort(self._ends, end)
+        session.end = end
+        self.max_duration = max(self.max_duration, end - session.start)
+        return session
+
+    def close_all(self, server: str, end: float) -> int:
+        players = [player for (srv, player) in self._open if srv == server]
+        for player in players:
+            self.close(server, player, end)
+        return len(players)
+
+    def reconcile(self, server: str, online: set[str], now: Optional[float] = None):
+        """Gleicht offene Sessions mit einer maßgeblichen Spielerliste ab (z. B. RCON ``list``).
+
+        Nicht mehr anwesende Spieler werden zum letzten sicheren Zeitpunkt geschlossen,
+        unbekannte Anwesende ab ``now`` geöffnet.
+        """
+        now = now if now is not None else time.time()
+        online_keys = {p.lower() for p in online}
+        for (srv, key), session in list(self._open.items()):
+            if srv == server and key not in online_keys:
+                self.close(server, session.player, max(session.start, min(self.last_seen(server) or now, now)))
+        for player in online:
+            self.open(server, player, now)
+
+    # ------------------------- Abfragen -------------------------
+    def online_at(self, ts: float) -> int:
+        """Anzahl gleichzeitig eingeloggter Spieler zum Zeitpunkt ``ts`` in O(log n)."""
+        return bisect_right(self._starts, ts) - bisect_right(self._ends, ts)
+
+    def overlapping(self, since: float, until: float) -> list[Session]:
+        """Alle Sessions, die das Fenster [since, until) berühren."""
+        # Offene Sessions können beliebig lang sein, der Rest höchstens max_duration
+        lo = bisect_left(self._by_start, (since - self.max_duration, -1))
+        hi = bisect_left(self._by_start, (until, -1))
+        result = [self._sessions[sid] for _, sid in self._by_start[lo:hi]]
+        seen = {s.id for s in result}
+        result += [s for s in self._open.values() if s.id not in seen and s.start < until]
+        return [s for s in result if s.end > since]
+
+    def playtime(self, since: float, until: Optional[float] = None, player: Optional[str] = None) -> dict[str, float]:
+        """Spielzeit (Sekunden) pro Spieler im Fenster; offene Sessions zählen bis ``until``."""
+        until = until if until is not None else time.time()
+        if player is not None:
+            sessions = [self._sessions[sid] for _, sid in self._by_player.get(player.lower(), [])]
+        else:
+            sessions = self.overlapping(since, until)
+        totals: dict[str, float] = {}
+        for session in sessions:
+            seconds = session.overlap(since, until)
+            if seconds > 0:
+                totals[session.player] = totals.get(session.player, 0.0) + seconds
+        return totals
+
+    def concurrency(self, since: float, until: float, buckets: int) -> list[float]:
+        """Durchschnittliche Spielerzahl pro Zeitabschnitt (für Verlaufskurven)."""
+        width = (until - since) / buckets
+        curve = [0.0] * buckets
+        for session in self.overlapping(since, until):
+            start = max(session.start, since)
+            end = min(session.end, until)
+            first = int((start - since) // width)
+            last = min(buckets - 1, int((end - since) // width))
+            for i in range(first, last + 1):
+                b_start = since + i * width
+                curve[i] += max(0.0, min(end, b_start + width) - max(start, b_start)) / width
+        return curve
+
+    def sessions_of(self, player: str, limit: int = 10) -> list[Session]:
+        entries = self._by_player.get(player.lower(), [])
+        return [self._sessions[sid] for _, sid in reversed(entries[-limit:])]
+
+    def close_db(self):
+        self.db.close()
@@ -0,0 +1,223 @@
+# utils/ssh_pool.py
+
+import asyncio
+import os
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+import asyncssh
+
+SSH_MAX_CHANNELS = int(os.getenv("SSH_MAX_CHANNELS", "8"))
+SSH_KEEPALIVE = int(os.getenv("SSH_KEEPALIVE", "30"))
+SSH_CONNECT_TIMEOUT = int(os.getenv("SSH_CONNECT_TIMEOUT", "10"))
+SSH_MAX_BACKOFF = int(os.getenv("SSH_MAX_BACKOFF", "60"))
+# Ungesetzt: Prüfung gegen ~/.ssh/known_hosts (asyncssh-Standard), ein Pfad: diese Datei,
+# "none": keine Host-Key-Prüfung (nur für Deployments, die das bewusst wollen)
+SSH_KNOWN_HOSTS = os.getenv("SSH_KNOWN_HOSTS", "")
+
+# Channel ließ sich nicht öffnen: das Kommando lief sicher noch nicht, ein neuer Versuch ist immer harmlos
+_NOT_STARTED = (asyncssh.ChannelOpenError,)
+# Verbindung brach ab, evtl. nachdem das Kommando schon lief: nur bei idempotent=True wiederholen
+_RETRYABLE = (asyncssh.ConnectionLost, asyncssh.ChannelOpenError, asyncssh.DisconnectError, BrokenPipeError)
+
+
+@dataclass
+class SSHPoolStats:
+    connects: int = 0
+    connect_failures: int = 0
+    connect_time_total: float = 0.0
+    acquisitions: int = 0
+    reused: int = 0
+    channel_wait_total: float = 0.0
+    channel_wait_max: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "connects": self.connects,
+            "connect_failures": self.connect_failures,
+            "connect_latency_avg_ms": round(self.connect_time_total / self.connects * 1000, 1) if self.connects else 0.0,
+            "acquisitions": self.acquisitions,
+            "reuse_rate": round(self.reused / self.acquisitions, 3) if self.acquisitions else 0.0,
+            "channel_wait_avg_ms": round(self.channel_wait_total / self.acquisitions * 1000, 1) if self.acquisitions else 0.0,
+            "channel_wait_max_ms": round(self.channel_wait_max * 1000, 1),
+        }
+
+
+@dataclass
+class _HostEntry:
+    channels: asyncio.Semaphore
+    conn: Optional[asyncssh.SSHClientConnection] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    failures: int = 0
+    retry_at: float = 0.0
+
+
+def known_hosts_options() -> dict:
+    setting = SSH_KNOWN_HOSTS.strip()
+    if setting.lower() == "none":
+        return {"known_hosts": None}
+    if setting and setting.lower() != "default":
+        return {"known_hosts": setting}
+    return {}
+
+
+if SSH_KNOWN_HOSTS.strip().lower() == "none":
+    print("[WARN] SSH_KNOWN_HOSTS=none: Host-Keys werden nicht geprüft.")
+
+
+class _PooledClient(asyncssh.SSHClient):
+    def __init__(self, entry: _HostEntry):
+        self._entry = entry
+        self._conn: Optional[asyncssh.SSHClientConnection] = None
+
+    def connection_made(self, conn):
+        self._conn = conn
+
+    def connection_lost(self, exc):
+        # Nur die eigene Verbindung aus dem Pool werfen; eine inzwischen neu aufgebaute bleibt stehen
+        if self._entry.conn is self._conn:
+            self._entry.conn = None
+
+
+class SSHPool:
+    """Gemeinsamer SSH-Pool: eine Keep-Alive-Verbindung pro Host, darüber gemultiplexte Channels.
+
+    Alle Cogs holen sich Verbindungen hier statt selbst ``ssh`` zu starten oder
+    ``asyncssh.connect`` aufzurufen. Fehlgeschlagene Verbindungsaufbauten werden
+    mit exponentiellem Backoff wiederholt.
+    """
+
+    def __init__(self, max_channels: int = SSH_MAX_CHANNELS, keepalive: int = SSH_KEEPALIVE,
+                 connect_timeout: int = SSH_CONNECT_TIMEOUT, max_backoff: int = SSH_MAX_BACKOFF):
+        self.max_channels = max_channels
+        self.keepalive = keepalive
+        self.connect_timeout = connect_timeout
+        self.max_backoff = max_backoff
+        self.stats = SSHPoolStats()
+        self._hosts: dict[tuple[str, str, int], _HostEntry] = {}
+
+    def _entry(self, host: str, user: str, port: int) -> _HostEntry:
+        key = (host, user, port)
+        if key not in self._hosts:
+            self._hosts[key] = _HostEntry(channels=asyncio.Semaphore(self.max_channels))
+        return self._hosts[key]
+
+    async def connection(self, host: str, user: str, port: int = 22) -> asyncssh.SSHClientConnection:
+        """Gibt die gepoolte Verbindung zurück und baut sie bei Bedarf (mit Backoff) neu auf."""
+        entry = self._entry(host, user, port)
+        self.stats.acquisitions += 1
+        if entry.conn is not None:
+            self.stats.reused += 1
+            return entry.conn
+
+        async with entry.lock:
+            if entry.conn is not None:
+                self.stats.reused += 1
+                return entry.conn
+
+            delay = entry.retry_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            options = known_hosts_options()
+
+            started = time.monotonic()
+            try:
+                conn, _ = await asyncssh.create_connection(
+                    lambda: _PooledClient(entry), host, port=port, username=user,
+                    connect_timeout=self.connect_timeout,
+                    keepalive_interval=self.keepalive, keepalive_count_max=3,
+                    **options,
+                )
+            except (asyncssh.Error, OSError):
+                entry.failures += 1
+                entry.retry_at = time.monotonic() + min(2 ** entry.failures, self.max_backoff)
+                self.stats.connect_failures += 1
+                raise
+
+            elapsed = time.monotonic() - started
+            self.stats.connects += 1
+            self.stats.connect_time_total += elapsed
+            entry.failures = 0
+            entry.retry_at = 0.0
+            entry.conn = conn
+            print(f"[INFO] SSH-Verbindung zu {user}@{host}:{port} aufgebaut ({elapsed * 1000:.0f} ms)")
+            return conn
+
+    def invalidate(self, host: str, user: str, port: int = 22):
+        entry = self._entry(host, user, port)
+        if entry.conn is not None:
+            entry.conn.close()
+            entry.conn = None
+
+    @asynccontextmanager
+    async def channel(self, host: str, user: str, port: int = 22):
+        """Reserviert einen Channel-Slot auf der Host-Verbindung."""
+        entry = self._entry(host, user, port)
+        started = time.monotonic()
+        async with entry.channels:
+            waited = time.monotonic() - started
+            self.stats.channel_wait_total += waited
+            self.stats.channel_wait_max = max(self.stats.channel_wait_max, waited)
+            yield await self.connection(host, user, port)
+
+    @asynccontextmanager
+    async def _started(self, host: str, user: str, port: int, start, idempotent: bool):
+        """Reserviert einen Channel und ruft ``start(conn)``; bei toter Verbindung genau einmal neu.
+
+        Der Slot bleibt reserviert, bis der Block verlassen wird. Nach einem Abbruch, bei dem das
+        Kommando schon gelaufen sein kann, wird nur bei ``idempotent=True`` wiederholt.
+        """
+        retryable = _RETRYABLE if idempotent else _NOT_STARTED
+        for attempt in range(2):
+            stack = AsyncExitStack()
+            conn = await stack.enter_async_context(self.channel(host, user, port))
+            try:
+                result = await start(conn)
+            except retryable:
+                await stack.aclose()
+                if attempt:
+                    raise
+                self.invalidate(host, user, port)
+                continue
+            except BaseException:
+                await stack.aclose()
+                raise
+            async with stack:
+                yield result
+            return
+
+    async def run(self, host: str, user: str, command: str, check: bool = False,
+                  timeout: Optional[float] = None, port: int = 22,
+                  idempotent: bool = False) -> asyncssh.SSHCompletedProcess:
+        """Führt ein Kommando aus; ``idempotent=True`` nur für Kommandos, die doppelt laufen dürfen."""
+        async with self._started(host, user, port, lambda conn: conn.run(command, check=check, timeout=timeout),
+                                 idempotent) as result:
+            return result
+
+    @asynccontextmanager
+    async def process(self, host: str, user: str, command: str, encoding: Optional[str] = None, port: int = 22,
+                      idempotent: bool = False):
+        """Startet ein Kommando zum Streamen von stdout (z. B. ``tail -F`` oder ein tar-Stream)."""
+        async with self._started(host, user, port, lambda conn: conn.create_process(command, encoding=encoding),
+                                 idempotent) as proc:
+            proc.stdin.write_eof()
+            try:
+                yield proc
+            finally:
+                proc.close()
+
+    def summary(self) -> str:
+        return ", ".join(f"{k}={v}" for k, v in self.stats.as_dict().items())
+
+    def close(self):
+        for entry in self._hosts.values():
+            if entry.conn is not None:
+                entry.conn.close()
+                entry.conn = None
+
+
+# Geteilte Instanz für alle Cogs
+ssh_pool = SSHPool()
@@ -0,0 +1,191 @@
+# utils/stat_metrics.py
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+DATA_DIR = os.getenv("BOT_DATA_DIR", "data")
+METRICS_FILE = os.getenv("MC_METRICS_FILE", os.path.join(DATA_DIR, "metrics.json"))
+
+
+@dataclass(frozen=True)
+class Metric:
+    """Eine Kennzahl, deklariert als Summe von Stat-Pfaden plus Umrechnung.
+
+    ``sources`` sind Pfade der Form ``"kategorie/schlüssel"`` (z. B.
+    ``"minecraft:custom/minecraft:deaths"``) oder ``"kategorie/*"`` für die Summe
+    einer ganzen Kategorie. ``exclude`` nimmt einzelne Schlüssel aus einer
+    ``*``-Summe wieder heraus. Das Präfix ``minecraft:`` darf weggelassen werden.
+    ``divisors`` werden nacheinander geteilt (wie ``x / 20 / 60 / 60``), damit die
+    Werte exakt den früheren Berechnungen entsprechen.
+    """
+    name: str
+    label: str
+    sources: tuple[str, ...]
+    exclude: tuple[str, ...] = ()
+    scale: float = 1.0
+    divisors: tuple[float, ...] = ()
+    step: Optional[float] = None
+    decimals: Optional[int] = None
+    unit: str = ""
+    emoji: str = ""
+
+    def format(self, value) -> str:
+        if self.decimals is None:
+            return f"{int(value):,}"
+        return f"{value:,.{self.decimals}f}"
+
+
+def _ns(part: str) -> str:
+    return part if ":" in part or part == "*" else f"minecraft:{part}"
+
+
+def _split(path: str) -> tuple[str, str]:
+    category, _, key = path.partition("/")
+    if not key:
+        raise ValueError(f"Ungültiger Stat-Pfad '{path}' (erwartet 'kategorie/schlüssel')")
+    return _ns(category), _ns(key)
+
+
+_DISTANCE = tuple(f"custom/{k}_one_cm" for k in (
+    "walk", "walk_under_water", "walk_on_water", "swim", "fly", "aviate",
+    "climb", "crouch", "sprint", "fall", "horse", "pig",
+    "boat", "minecart", "strider", "happy_ghast",
+))
+
+BUILTIN_METRICS = [
+    Metric("distance_traveled", "Distance Traveled", _DISTANCE, divisors=(100000,), step=0.01, decimals=2, unit="km", emoji="✈️"),
+    Metric("block_broken", "Blocks Broken", ("mined/*",), emoji="⛏️"),
+    Metric("block_placed", "Blocks Placed", ("used/*",), emoji="🦺"),
+    Metric("damage_done", "Damage Done", ("custom/damage_dealt",), divisors=(20,), step=0.5, decimals=1, emoji="🗡️"),
+    Metric("damage_taken", "Damage Taken", ("custom/damage_taken",), divisors=(20,), step=0.5, decimals=1, emoji="💔"),
+    Metric("deaths", "Deaths", ("custom/deaths",), emoji="🪦"),
+    Metric("player_kills", "Player Kills", ("custom/player_kills",), emoji="⚔️"),
+    Metric("entity_kills", "Entity Kills", ("killed/*",), exclude=("killed/player",), emoji="👾"),
+    Metric("playtime", "Playtime", ("custom/play_time",), divisors=(20, 60, 60), step=0.01, decimals=2,
+           unit="h", emoji="⌛"),
+]
+
+
+def _decimal_digits(step: Optional[float]) -> Optional[int]:
+    """Nachkommastellen, wenn ``step`` eine Zehnerpotenz ist (0.01 -> 2), sonst None."""
+    if not step:
+        return None
+    for digits in range(-6, 10):
+        if step == float(f"1e{-digits}"):
+            return digits
+    return None
+
+
+class MetricRegistry:
+    """Kompiliert Metriken in vorab aufgelöste Schlüssel-Listen pro Kategorie.
+
+    Beim Auslesen eines Stats-Dokuments werden nur noch fertige Strings
+    nachgeschlagen – keine Formatierung oder Pfad-Zerlegung pro Aufruf.
+    """
+
+    def __init__(self, metrics: list[Metric]):
+        self.metrics = list(metrics)
+        self.names = [m.name for m in self.metrics]
+        self.by_name = {m.name: m for m in self.metrics}
+        if len(self.by_name) != len(self.metrics):
+            raise ValueError("Doppelte Metrik-Namen in der Registry")
+
+        # plan[i] = (einzelne Schlüssel je Kategorie, ganze Kategorien mit Ausnahmen)
+        self.plan: list[tuple[tuple[tuple[str, tuple[str, ...]], ...], tuple[tuple[str, tuple[str, ...]], ...]]] = []
+        for metric in self.metrics:
+            keys: dict[str, list[str]] = {}
+            wildcards: dict[str, list[str]] = {}
+            for path in metric.sources:
+                category, key = _split(path)
+                if key == "*":
+                    wildcards.setdefault(category, [])
+                else:
+                    keys.setdefault(category, []).append(key)
+            for path in metric.exclude:
+                category, key = _split(path)
+                if category in wildcards:
+                    wildcards[category].append(key)
+            self.plan.append((
+                tuple((c, tuple(k)) for c, k in keys.items()),
+                tuple((c, tuple(e)) for c, e in wildcards.items()),
+            ))
+
+        self.scales = [m.scale for m in self.metrics]
+        self.divisors = [m.divisors for m in self.metrics]
+        # Zehnerpotenzen runden per round(x, n) wie bisher; sonst über den Kehrwert
+        # (round(x * 2) / 2 ist exakt, round(x / 0.5) * 0.5 nicht immer)
+        self.step_digits = [_decimal_digits(m.step) for m in self.metrics]
+        self.inv_steps = [1 / m.step if m.step and d is None else None
+                          for m, d in zip(self.metrics, self.step_digits)]
+
+    def raw_row(self, stats: dict) -> list[float]:
+        """Rohwerte eines Stats-Dokuments in Registry-Reihenfolge (vor scale/step)."""
+        row = []
+        for keys, wildcards in self.plan:
+            total = 0
+            for category, names in keys:
+                values = stats.get(category)
+                if values:
+                    for key in names:
+                        total += values.get(key, 0)
+            for category, excluded in wildcards:
+                values = stats.get(category)
+                if values:
+                    total += sum(values.values())
+                    for key in excluded:
+                        total -= values.get(key, 0)
+            row.append(total)
+        return row
+
+    def transform(self, i: int, value: float) -> float:
+        if self.scales[i] != 1.0:
+            value = value * self.scales[i]
+        for divisor in self.divisors[i]:
+            value = value / divisor
+        if self.step_digits[i] is not None:
+            return round(value, self.step_digits[i])
+        inv = self.inv_steps[i]
+        return round(value * inv) / inv if inv else value
+
+    def spec(self) -> list[dict]:
+        """JSON-fähige Form des kompilierten Plans (z. B. für Remote-Auswertung)."""
+        return [
+            {"keys": [[c, list(k)] for c, k in keys], "all": [[c, list(e)] for c, e in wildcards]}
+            for keys, wildcards in self.plan
+        ]
+
+
+def load_custom_metrics(path: str = METRICS_FILE) -> list[Metric]:
+    """Lädt zusätzliche Metriken aus einer JSON-Datei (Liste von Objekten mit Metric-Feldern)."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+        metrics = []
+        for entry in entries:
+            entry = dict(entry)
+            entry["sources"] = tuple(entry["sources"])
+            entry["exclude"] = tuple(entry.get("exclude", ()))
+            entry["divisors"] = tuple(entry.get("divisors", ()))
+            entry.setdefault("label", entry["name"].replace("_", " ").title())
+            metric = Metric(**entry)
+            for p in metric.sources + metric.exclude:
+                _split(p)
+            metrics.append(metric)
+        return metrics
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"[ERROR] Eigene Metriken aus {path} konnten nicht geladen werden: {e}")
+        return []
+
+
+def _build_registry() -> MetricRegistry:
+    builtin = {m.name for m in BUILTIN_METRICS}
+    custom = [m for m in load_custom_metrics() if m.name not in builtin]
+    # Discord erlaubt maximal 25 Choices pro Option
+    return MetricRegistry((BUILTIN_METRICS + custom)[:25])
+
+
+REGISTRY = _build_registry()
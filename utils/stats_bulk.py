@@ -0,0 +1,107 @@
+# utils/stats_bulk.py
+
+import os
+import shlex
+import zlib
+from typing import AsyncIterator
+
+BLOCK = 512
+CHUNK = 64 * 1024
+
+
+def bulk_command(stats_path: str, usercache_path: str, compress: bool = False) -> str:
+    """Remote-Kommando, das alle Stats-Dateien plus usercache.json als einen tar-Stream ausgibt.
+
+    Stats-Dateien erscheinen als ``stats/<uuid>.json``, die usercache als ``usercache.json``.
+    """
+    stats_dir = os.path.normpath(stats_path)
+    cmd = (
+        f"tar -cf - --ignore-failed-read "
+        f"-C {shlex.quote(os.path.dirname(stats_dir))} "
+        f"--transform {shlex.quote('s,^' + os.path.basename(stats_dir) + '/,stats/,')} "
+        f"{shlex.quote(os.path.basename(stats_dir))} "
+        f"-C {shlex.quote(os.path.dirname(usercache_path))} "
+        f"{shlex.quote(os.path.basename(usercache_path))}"
+    )
+    if compress:
+        cmd += " | gzip -1"
+    return cmd
+
+
+def _parse_octal(field: bytes) -> int:
+    field = field.rstrip(b"\0 ").strip()
+    return int(field, 8) if field else 0
+
+
+class TarStreamParser:
+    """Inkrementeller tar-Parser: Bytes rein, fertige (name, inhalt)-Einträge raus.
+
+    Unterstützt reguläre Dateien sowie GNU-Longnames und pax-Header (die übersprungen
+    bzw. für den Namen ausgewertet werden). Der Stream kann optional gzip-komprimiert sein.
+    """
+
+    def __init__(self, compressed: bool = False):
+        self._inflate = zlib.decompressobj(wbits=31) if compressed else None
+        self._buf = bytearray()
+        self._pending_name = None
+        self.done = False
+        self.bytes_in = 0
+
+    def feed(self, chunk: bytes) -> list[tuple[str, bytes]]:
+        self.bytes_in += len(chunk)
+        if self._inflate is not None:
+            chunk = self._inflate.decompress(chunk)
+        self._buf += chunk
+        return self._drain()
+
+    def _drain(self) -> list[tuple[str, bytes]]:
+        entries = []
+        while not self.done and len(self._buf) >= BLOCK:
+            header = bytes(self._buf[:BLOCK])
+            if header == b"\0" * BLOCK:
+                # Zwei Null-Blöcke markieren das Archivende, einer reicht uns
+                self.done = True
+                break
+
+            size = _parse_octal(header[124:136])
+            padded = BLOCK + (size + BLOCK - 1) // BLOCK * BLOCK
+            if len(self._buf) < padded:
+                break
+
+            typeflag = header[156:157]
+            data = bytes(self._buf[BLOCK:BLOCK + size])
+            del self._buf[:padded]
+
+            name = header[0:100].split(b"\0", 1)[0].decode(errors="ignore")
+            prefix = header[345:500].split(b"\0", 1)[0].decode(errors="ignore")
+            if prefix:
+                name = f"{prefix}/{name}"
+
+            if typeflag == b"L":
+                self._pending_name = data.split(b"\0", 1)[0].decode(errors="ignore")
+                continue
+            if typeflag == b"x":
+                for record in data.decode(errors="ignore").splitlines():
+                    _, _, kv = record.partition(" ")
+                    if kv.startswith("path="):
+                        self._pending_name = kv[len("path="):]
+                continue
+            if typeflag not in (b"0", b"\0"):
+                self._pending_name = None
+                continue
+
+            if self._pending_name:
+                name, self._pending_name = self._pending_name, None
+            entries.append((name, data))
+        return entries
+
+
+async def iter_tar_stream(reader, compressed: bool = False) -> AsyncIterator[tuple[str, bytes]]:
+    """Liest einen tar-Stream von einem asyncio-Reader und liefert Einträge, sobald sie vollständig sind."""
+    parser = TarStreamParser(compressed)
+    while not parser.done:
+        chunk = await reader.read(CHUNK)
+        if not chunk:
+            break
+        for entry in parser.feed(chunk):
+            yield entry
@@ -0,0 +1,180 @@
+# utils/stats_history.py
+
+import json
+import os
+import sqlite3
+import time
+from array import array
+from bisect import bisect_right
+from typing import Optional
+
+DATA_DIR = os.getenv("BOT_DATA_DIR", "data")
+# Rohe Snapshots bleiben so lange erhalten, danach werden sie zu Tageswerten zusammengefasst
+HISTORY_RAW_DAYS = int(os.getenv("MC_HISTORY_RAW_DAYS", "8"))
+# Tageswerte älter als das werden gelöscht
+HISTORY_RETENTION_DAYS = int(os.getenv("MC_HISTORY_RETENTION_DAYS", "120"))
+
+RES_RAW = 0
+RES_DAY = 1
+DAY = 86400
+
+PERIODS = {"day": DAY, "week": 7 * DAY, "month": 30 * DAY}
+
+
+class StatsHistory:
+    """Append-only Zeitreihe der Metrik-Deltas pro Spieler.
+
+    Pro Snapshot wird nur gespeichert, um wie viel sich die Rohwerte eines Spielers
+    seit dem letzten Snapshot verändert haben (Zeilen ohne Änderung entfallen).
+    Im Speicher liegen pro Spieler Präfixsummen, damit Abfragen wie "letzte Woche"
+    eine einzige Differenz zweier Präfixsummen sind.
+    """
+
+    def __init__(self, metric_names: list[str], path: Optional[str] = None):
+        self.metric_names = list(metric_names)
+        self.width = len(self.metric_names)
+        self.path = path or os.path.join(DATA_DIR, "stats_history.sqlite3")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        self.db = sqlite3.connect(self.path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS deltas ("
+            "ts INTEGER NOT NULL, res INTEGER NOT NULL, uuid TEXT NOT NULL, v BLOB NOT NULL, "
+            "PRIMARY KEY (res, ts, uuid))"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS baseline (uuid TEXT PRIMARY KEY, v BLOB NOT NULL)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._check_layout()
+
+        self._baseline: dict[str, array] = {
+            uuid: self._unpack(blob) for uuid, blob in self.db.execute("SELECT uuid, v FROM baseline")
+        }
+        self._ts: dict[str, list[int]] = {}
+        self._cum: dict[str, list[array]] = {}
+        self._load_prefix_sums()
+        self.version = 0
+
+    # ------------------------- Speicherformat -------------------------
+    def _check_layout(self):
+        """Verwirft die Historie, wenn sich die Metrik-Spalten geändert haben."""
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'metrics'").fetchone()
+        names = json.dumps(self.metric_names)
+        if row and row[0] != names:
+            print("[WARN] Metriken haben sich geändert – Stats-Historie wird neu begonnen.")
+            self.db.execute("DELETE FROM deltas")
+            self.db.execute("DELETE FROM baseline")
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('metrics', ?)", (names,))
+        self.db.commit()
+
+    def _pack(self, values) -> bytes:
+        return array("d", values).tobytes()
+
+    def _unpack(self, blob: bytes) -> array:
+        values = array("d")
+        values.frombytes(blob)
+        return values
+
+    def _load_prefix_sums(self):
+        self._ts = {}
+        self._cum = {}
+        for ts, uuid, blob in self.db.execute("SELECT ts, uuid, v FROM deltas ORDER BY ts"):
+            self._append_prefix(uuid, ts, self._unpack(blob))
+
+    def _append_prefix(self, uuid: str, ts: int, delta: array):
+        ts_list = self._ts.setdefault(uuid, [])
+        cum_list = self._cum.setdefault(uuid, [])
+        last = cum_list[-1] if cum_list else None
+        ts_list.append(ts)
+        cum_list.append(array("d", (a + b for a, b in zip(last, delta))) if last is not None else array("d", delta))
+
+    # ------------------------- Schreiben -------------------------
+    def snapshot(self, rows: dict[str, list[float]], ts: Optional[int] = None) -> int:
+        """Speichert die Deltas der aktuellen Rohwerte gegenüber dem letzten Snapshot.
+
+        Beim allerersten Snapshot wird nur die Basis gesetzt (die Vorgeschichte ist unbekannt).
+        Gibt die Anzahl gespeicherter Delta-Zeilen zurück.
+        """
+        ts = int(ts if ts is not None else time.time())
+        first = not self._baseline
+        written = 0
+        for uuid, raw in rows.items():
+            raw = array("d", raw)
+            base = self._baseline.get(uuid)
+            if not first:
+                # Zurückgesetzte Zähler (z. B. Welt-Reset, editierte Stats) zählen je Metrik als 0,
+                # die übrige Aktivität des Spielers bleibt erhalten
+                delta = array("d", (max(0.0, a - b) for a, b in zip(raw, base))) if base is not None else raw
+                if any(d != 0 for d in delta):
+                    self.db.execute("INSERT OR REPLACE INTO deltas (ts, res, uuid, v) VALUES (?, ?, ?, ?)",
+                                    (ts, RES_RAW, uuid, self._pack(delta)))
+                    self._append_prefix(uuid, ts, delta)
+                    written += 1
+            if base is None or base != raw:
+                self.db.execute("INSERT OR REPLACE INTO baseline (uuid, v) VALUES (?, ?)", (uuid, self._pack(raw)))
+                self._baseline[uuid] = raw
+        self.db.commit()
+        self.version += 1
+        return written
+
+    def compact(self, now: Optional[float] = None):
+        """Fasst alte Roh-Snapshots zu Tageswerten zusammen und löscht alles jenseits der Aufbewahrung."""
+        now = now if now is not None else time.time()
+        raw_cutoff = int(now - HISTORY_RAW_DAYS * DAY) // DAY * DAY
+        retention_cutoff = int(now - HISTORY_RETENTION_DAYS * DAY)
+
+        merged: dict[tuple[int, str], array] = {}
+        for ts, uuid, blob in self.db.execute(
+                "SELECT ts, uuid, v FROM deltas WHERE res = ? AND ts < ?", (RES_RAW, raw_cutoff)):
+            # Das Tages-Bucket endet am Tagesende, damit Bereichsabfragen konservativ bleiben
+            key = (ts // DAY * DAY + DAY - 1, uuid)
+            delta = self._unpack(blob)
+            merged[key] = array("d", (a + b for a, b in zip(merged[key], delta))) if key in merged else delta
+
+        deleted = self.db.execute("DELETE FROM deltas WHERE ts < ?", (retention_cutoff,)).rowcount
+        if not merged and not deleted:
+            return
+
+        self.db.execute("DELETE FROM deltas WHERE res = ? AND ts < ?", (RES_RAW, raw_cutoff))
+        for (ts, uuid), delta in merged.items():
+            if ts < retention_cutoff:
+                continue
+            existing = self.db.execute(
+                "SELECT v FROM deltas WHERE res = ? AND ts = ? AND uuid = ?", (RES_DAY, ts, uuid)).fetchone()
+            if existing:
+                delta = array("d", (a + b for a, b in zip(self._unpack(existing[0]), delta)))
+            self.db.execute("INSERT OR REPLACE INTO deltas (ts, res, uuid, v) VALUES (?, ?, ?, ?)",
+                            (ts, RES_DAY, uuid, self._pack(delta)))
+        self.db.commit()
+        self._load_prefix_sums()
+        self.version += 1
+        print(f"[INFO] Stats-Historie verdichtet: {len(merged)} Tageswerte, {deleted} alte Zeilen gelöscht")
+
+    # ------------------------- Abfragen -------------------------
+    def range_sum(self, since: float, current: Optional[dict[str, list[float]]] = None) -> dict[str, array]:
+        """Summe der Deltas aller Spieler mit Zeitstempel > ``since``.
+
+        Mit ``current`` (aktuelle Rohwerte) wird auch die Aktivität seit dem letzten
+        Snapshot mitgezählt.
+        """
+        result: dict[str, array] = {}
+        for uuid, ts_list in self._ts.items():
+            cum = self._cum[uuid]
+            i = bisect_right(ts_list, since)
+            if i == len(ts_list):
+                continue
+            end = cum[-1]
+            result[uuid] = array("d", (e - s for e, s in zip(end, cum[i - 1]))) if i else array("d", end)
+
+        if current:
+            for uuid, raw in current.items():
+                base = self._baseline.get(uuid)
+                if base is None:
+                    continue
+                live = [max(0.0, a - b) for a, b in zip(raw, base)]
+                if any(live):
+                    total = result.get(uuid)
+                    result[uuid] = array("d", (a + b for a, b in zip(total, live))) if total else array("d", live)
+        return result
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,102 @@
+# utils/stats_index.py
+
+import json
+import os
+import sqlite3
+import time
+from typing import Optional
+
+DATA_DIR = os.getenv("BOT_DATA_DIR", "data")
+
+
+class StatsIndex:
+    """Lokaler SQLite-Index der Minecraft Stats-Dateien.
+
+    Pro UUID werden mtime, Größe und der JSON-Inhalt gespeichert, so dass bei
+    einem Sync nur geänderte Dateien neu geholt werden müssen. Die geparsten
+    Dokumente werden zusätzlich im Speicher gehalten, damit /top und /stats
+    ohne erneutes json.loads beantwortet werden können.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(DATA_DIR, "stats_index.sqlite3")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        self.db = sqlite3.connect(self.path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS stats ("
+            "uuid TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL, data TEXT NOT NULL)"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.db.commit()
+
+        self._docs: Optional[dict[str, dict]] = None
+        # Wird bei jeder Änderung erhöht, damit abgeleitete Caches wissen, wann sie veraltet sind
+        self.generation = 0
+
+    # ------------------------- Sync helpers -------------------------
+    def diff(self, listing: dict[str, tuple[float, int]]) -> tuple[list[str], list[str]]:
+        """Vergleicht ein Remote-Listing {uuid: (mtime, size)} mit dem Index.
+
+        Gibt (geänderte/neue UUIDs, entfernte UUIDs) zurück.
+        """
+        known = {uuid: (mtime, size) for uuid, mtime, size in self.db.execute("SELECT uuid, mtime, size FROM stats")}
+        changed = [uuid for uuid, meta in listing.items() if known.get(uuid) != meta]
+        removed = [uuid for uuid in known if uuid not in listing]
+        return changed, removed
+
+    def upsert(self, uuid: str, mtime: float, size: int, data: dict):
+        self.db.execute(
+            "INSERT OR REPLACE INTO stats (uuid, mtime, size, data) VALUES (?, ?, ?, ?)",
+            (uuid, mtime, size, json.dumps(data, separators=(",", ":"))),
+        )
+        if self._docs is not None:
+            self._docs[uuid] = data
+        self.generation += 1
+
+    def remove(self, uuids: list[str]):
+        if not uuids:
+            return
+        self.db.executemany("DELETE FROM stats WHERE uuid = ?", [(u,) for u in uuids])
+        if self._docs is not None:
+            for uuid in uuids:
+                self._docs.pop(uuid, None)
+        self.generation += 1
+
+    def mark_synced(self, when: Optional[float] = None):
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_sync', ?)",
+            (str(when if when is not None else time.time()),),
+        )
+        self.db.commit()
+
+    @property
+    def last_sync(self) -> float:
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'last_sync'").fetchone()
+        return float(row[0]) if row else 0.0
+
+    def age(self) -> float:
+        return time.time() - self.last_sync
+
+    # ------------------------- Lookup -------------------------
+    def _load(self) -> dict[str, dict]:
+        if self._docs is None:
+            self._docs = {}
+            for uuid, data in self.db.execute("SELECT uuid, data FROM stats"):
+                try:
+                    self._docs[uuid] = json.loads(data)
+                except ValueError:
+                    continue
+        return self._docs
+
+    def get(self, uuid: str) -> Optional[dict]:
+        return self._load().get(uuid)
+
+    def all(self) -> dict[str, dict]:
+        return self._load()
+
+    def __len__(self):
+        return len(self._load())
+
+    def close(self):
+        self.db.close()
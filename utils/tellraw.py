@@ -0,0 +1,113 @@
+# utils/tellraw.py
+
+import asyncio
+import json
+from typing import Awaitable, Callable, Optional
+
+from utils.rcon import MAX_PAYLOAD
+
+PREFIX = "tellraw @a "
+
+
+def message_components(author: str, content: str, attachments: list[tuple[str, str]] = (),
+                       reply_to: Optional[str] = None) -> list[dict]:
+    """Baut die Text-Komponenten einer Discord-Nachricht (ohne äußeres Array).
+
+    ``attachments`` sind (Dateiname, URL)-Paare und werden als klickbare Links angehängt.
+    Escaping übernimmt ``json.dumps`` beim Zusammensetzen des Befehls.
+    """
+    parts = [{"text": "[Discord] ", "color": "blue"}]
+    if reply_to:
+        parts.append({"text": f"↪ {reply_to} ", "color": "gray", "italic": True})
+    parts.append({"text": author, "color": "aqua"})
+    parts.append({"text": ": ", "color": "white"})
+    if content:
+        parts.append({"text": content, "color": "white"})
+    for filename, url in attachments:
+        parts.append({
+            "text": f" [{filename}]",
+            "color": "gray",
+            "underlined": True,
+            "clickEvent": {"action": "open_url", "value": url},
+        })
+    return parts
+
+
+def build_command(messages: list[list[dict]]) -> str:
+    """Ein tellraw mit allen Nachrichten als Komponenten-Array, getrennt durch Zeilenumbrüche."""
+    components: list = [""]
+    for i, parts in enumerate(messages):
+        if i:
+            components.append("\n")
+        components.extend(parts)
+    return PREFIX + json.dumps(components, ensure_ascii=False, separators=(",", ":"))
+
+
+def _size(messages: list[list[dict]]) -> int:
+    return len(build_command(messages).encode("utf-8"))
+
+
+def fit_message(parts: list[dict], max_bytes: int = MAX_PAYLOAD) -> list[dict]:
+    """Kürzt den Nachrichtentext, bis die Nachricht allein in ein RCON-Paket passt."""
+    parts = [dict(p) for p in parts]
+    # Der Nachrichtentext folgt direkt auf den ": "-Trenner (falls vorhanden)
+    sep = next(i for i, p in enumerate(parts) if p["text"] == ": ")
+    text_part = parts[sep + 1] if sep + 1 < len(parts) and "clickEvent" not in parts[sep + 1] else None
+    while _size([parts]) > max_bytes:
+        if text_part is None or len(text_part["text"]) <= 1:
+            # Nur noch Anhänge zu lang: die letzten weglassen
+            if len(parts) <= sep + 1:
+                break
+            parts.pop()
+            continue
+        text = text_part["text"]
+        text_part["text"] = text[:max(1, int(len(text) * 0.9) - 1)] + "…"
+    return parts
+
+
+class TellrawBatcher:
+    """Sammelt Discord→Minecraft-Nachrichten für ``window`` Sekunden und sendet sie als ein tellraw.
+
+    Übersteigt der Batch die RCON-Paketgröße, wird er auf mehrere Befehle verteilt.
+    """
+
+    def __init__(self, send: Callable[[str], Awaitable[str]], window: float = 0.15,
+                 on_error: Optional[Callable[[Exception], Awaitable[None]]] = None, max_bytes: int = MAX_PAYLOAD):
+        self.send = send
+        self.window = window
+        self.on_error = on_error
+        self.max_bytes = max_bytes
+        self._pending: list[list[dict]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self.messages = 0
+        self.commands = 0
+
+    def add(self, parts: list[dict]):
+        self._pending.append(fit_message(parts, self.max_bytes))
+        self.messages += 1
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    def _batches(self, messages: list[list[dict]]) -> list[list[list[dict]]]:
+        batches: list[list[list[dict]]] = []
+        for parts in messages:
+            if batches and _size(batches[-1] + [parts]) <= self.max_bytes:
+                batches[-1].append(parts)
+            else:
+                batches.append([parts])
+        return batches
+
+    async def _flush_later(self):
+        # Nachrichten, die während des Sendens eintreffen, gehen im nächsten Durchlauf mit
+        while self._pending:
+            await asyncio.sleep(self.window)
+            messages, self._pending = self._pending, []
+            for batch in self._batches(messages):
+                try:
+                    await self.send(build_command(batch))
+                    self.commands += 1
+                except Exception as e:
+                    print(f"[WARN] tellraw fehlgeschlagen: {e}")
+                    if self.on_error:
+                        await self.on_error(e)
+                    break
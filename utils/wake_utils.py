@@ -1,6 +1,9 @@
 # utils/wake_utils.py
 
 from colorama import Back, Fore, Style
+import asyncio
+import os
+import socket
 import time
 
 try:
@@ -11,7 +14,16 @@ except ImportError:
     prfx = Back.BLACK + Fore.GREEN + time.strftime("%H:%M:%S", time.gmtime()) + Back.RESET + Fore.WHITE + Style.BRIGHT
     print(prfx + Fore.YELLOW + " ⚠️  RPi.GPIO nicht gefunden ⚠️  GPIO wird deaktiviert (du bist nicht auf einem Raspberry Pi)." + Fore.WHITE)
 
-import time
+WAKE_HOST = os.getenv("SERVER_IP", "192.168.188.150")
+# "gpio" (Power-Pin am Raspberry Pi) oder "wol" (Wake-on-LAN Magic Packet)
+WAKE_METHOD = os.getenv("WAKE_METHOD", "gpio").lower()
+WAKE_GPIO_PIN = int(os.getenv("WAKE_GPIO_PIN", "17"))
+WOL_MAC = os.getenv("WOL_MAC", "")
+WOL_BROADCAST = os.getenv("WOL_BROADCAST", "255.255.255.255")
+WOL_PORT = int(os.getenv("WOL_PORT", "9"))
+
+# Verhindert, dass zwei gleichzeitige Aufrufe den Power-Pin doppelt drücken (= wieder ausschalten)
+_power_lock = asyncio.Lock()
 
 
 def _log(message: str):
@@ -20,47 +32,80 @@ def _log(message: str):
     print(prfx + " " + Fore.YELLOW + message + Fore.WHITE)
 
 
-def power_on_server():
-    """Simuliert oder aktiviert den Power-Pin auf einem Raspberry Pi."""
+def magic_packet(mac: str) -> bytes:
+    digits = mac.replace(":", "").replace("-", "").replace(".", "")
+    if len(digits) != 12:
+        raise ValueError(f"Ungültige MAC-Adresse: {mac}")
+    return b"\xff" * 6 + bytes.fromhex(digits) * 16
 
-    if not IS_PI:
-        _log(" ⚠️ GPIO-Funktion übersprungen ⚠️ (nicht auf Raspberry Pi).")
-        return " ⚠️ GPIO nicht verfügbar – Testmodus aktiv. ⚠️"
 
+async def _pulse_gpio(seconds: float = 1.0):
+    """Power-Pin ``seconds`` lang setzen, ohne die Event-Loop zu blockieren."""
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(WAKE_GPIO_PIN, GPIO.OUT)
     try:
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(17, GPIO.OUT)
-
-        # Power-Pin 1 Sekunde triggern
-        GPIO.output(17, GPIO.HIGH)
-        time.sleep(1)
-        GPIO.output(17, GPIO.LOW)
-
+        GPIO.output(WAKE_GPIO_PIN, GPIO.HIGH)
+        await asyncio.sleep(seconds)
+        GPIO.output(WAKE_GPIO_PIN, GPIO.LOW)
+    finally:
         GPIO.cleanup()
 
-        _log("Server wurde über GPIO eingeschaltet. ✅")
-        return "Server wurde über GPIO eingeschaltet."
-
-    except Exception as e:
-        _log(f"GPIO Fehler: ❌ {e}")
-        return f"GPIO Fehler: {e}"
-
-
-def is_server_online():
-    """Pinge den Server."""
-    import subprocess
 
+async def _send_wol(mac: str):
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        asyncio.DatagramProtocol, family=socket.AF_INET, allow_broadcast=True
+    )
     try:
-        result = subprocess.run(
-            ["ping", "-c", "1", "192.168.188.150"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+        packet = magic_packet(mac)
+        # UDP ist verlustbehaftet: dreimal senden
+        for _ in range(3):
+            transport.sendto(packet, (WOL_BROADCAST, WOL_PORT))
+            await asyncio.sleep(0.1)
+    finally:
+        transport.close()
+
+
+async def power_on_server():
+    """Weckt den Server per Wake-on-LAN oder über den Power-Pin eines Raspberry Pi."""
+    async with _power_lock:
+        if WAKE_METHOD == "wol":
+            try:
+                await _send_wol(WOL_MAC)
+            except (OSError, ValueError) as e:
+                _log(f"Wake-on-LAN Fehler: ❌ {e}")
+                return f"Wake-on-LAN Fehler: {e}"
+            _log("Wake-on-LAN Paket gesendet. ✅")
+            return "Server wurde per Wake-on-LAN geweckt."
+
+        if not IS_PI:
+            _log(" ⚠️ GPIO-Funktion übersprungen ⚠️ (nicht auf Raspberry Pi).")
+            return " ⚠️ GPIO nicht verfügbar – Testmodus aktiv. ⚠️"
+
+        try:
+            await _pulse_gpio(1.0)
+            _log("Server wurde über GPIO eingeschaltet. ✅")
+            return "Server wurde über GPIO eingeschaltet."
+
+        except Exception as e:
+            _log(f"GPIO Fehler: ❌ {e}")
+            return f"GPIO Fehler: {e}"
+
+
+async def is_server_online(host: str = WAKE_HOST, timeout: int = 1, log: bool = True):
+    """Pinge den Server (ICMP) ohne die Event-Loop zu blockieren."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ping", "-c", "1", "-W", str(timeout), host,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
         )
-
-        online = result.returncode == 0
-        _log(f"Server online: {online}")
+        online = await proc.wait() == 0
+        if log:
+            _log(f"Server online: {online}")
         return online
 
     except Exception as e:
-        _log(f"Fehler beim Prüfen des Servers: ❌ {e}")
+        if log:
+            _log(f"Fehler beim Prüfen des Servers: ❌ {e}")
         return False